@@ -0,0 +1,114 @@
+# benchmarks/bench_bundle.py
+"""
+Loading every template of a large template set through Jinja2's
+``PackageLoader`` (what the packaged templates use) against a bundle
+written by ``scaffoldor pack`` and served by ``BundleLoader`` from a
+memory mapping. Each run starts from a fresh environment without the
+bytecode cache, and counts the files opened and stat'ed on the way:
+
+    python benchmarks/bench_bundle.py --files 5000 --runs 5
+"""
+import argparse
+import builtins
+import importlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def build_package(root: Path, files: int) -> dict:
+    """Writes an importable package holding ``files`` small templates and returns its content_files."""
+    content = root / "benchpkg" / "content"
+    (root / "benchpkg" / "__init__.py").parent.mkdir(parents=True)
+    (root / "benchpkg" / "__init__.py").write_text("")
+    content_files = {}
+    for index in range(files):
+        source = f"mod{index // 100}/file{index}.py.jinja"
+        (content / source).parent.mkdir(parents=True, exist_ok=True)
+        (content / source).write_text(f"# {{{{ project_name }}}} file {index}\n")
+        content_files[source[: -len(".jinja")]] = source
+    return content_files
+
+
+@contextmanager
+def count_calls():
+    counts = Counter()
+    original_open, original_stat = builtins.open, os.stat
+
+    def counted_open(*args, **kwargs):
+        counts["open"] += 1
+        return original_open(*args, **kwargs)
+
+    def counted_stat(*args, **kwargs):
+        counts["stat"] += 1
+        return original_stat(*args, **kwargs)
+
+    builtins.open, os.stat = counted_open, counted_stat
+    try:
+        yield counts
+    finally:
+        builtins.open, os.stat = original_open, original_stat
+
+
+def measure(make_env, names: list, runs: int) -> dict:
+    timings = []
+    for _ in range(runs):
+        with count_calls() as counts:
+            start = time.perf_counter()
+            env = make_env()
+            for name in names:
+                env.get_template(name)
+            timings.append(time.perf_counter() - start)
+        # The loader alone: what every lookup costs before the environment has the template cached
+        start = time.perf_counter()
+        with count_calls() as again:
+            for name in names:
+                env.loader.get_source(env, name)
+        source_seconds = time.perf_counter() - start
+    return {"median_seconds": statistics.median(timings), "calls": dict(counts), "source_seconds": source_seconds,
+            "source_calls": dict(again)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    os.environ["SCAFFOLDOR_NO_CACHE"] = "1"
+    sys.path.insert(0, str(REPO_ROOT))
+    from jinja2 import PackageLoader
+    from scaffoldor.bundle import Bundle, bundle_environment, write_bundle
+    from scaffoldor.scaffold import make_environment
+
+    with tempfile.TemporaryDirectory() as tmp:
+        content_files = build_package(Path(tmp), args.files)
+        sys.path.insert(0, tmp)
+        importlib.import_module("benchpkg")
+        package_env = lambda: make_environment(PackageLoader("benchpkg", "content"))
+        bundle_path = Path(tmp) / "bench.scfd"
+        write_bundle(bundle_path, "bench", {"structure": {}, "content_files": content_files},
+                     Path(tmp) / "benchpkg" / "content", package_env())
+        bundle = Bundle(bundle_path)
+        names = list(content_files.values())
+
+        results = {
+            "PackageLoader": measure(package_env, names, args.runs),
+            "BundleLoader": measure(lambda: bundle_environment(bundle), names, args.runs),
+        }
+        print(f"{len(names)} templates, bundle of {bundle_path.stat().st_size // 1024} KiB")
+        for label, result in results.items():
+            calls = ", ".join(f"{name} {count}" for name, count in sorted(result["calls"].items())) or "none"
+            print(f"{label:<14} load and compile: median {result['median_seconds'] * 1000:8.1f} ms ({calls})")
+            calls = ", ".join(f"{name} {count}" for name, count in sorted(result["source_calls"].items())) or "none"
+            print(f"{'':<14} sources only:     {result['source_seconds'] * 1000:8.1f} ms ({calls})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_discovery.py
+"""
+Time needed to find the content files of a large template: parsing a
+hand-written ``content_files`` mapping, walking the ``content_roots`` globs,
+and looking the expansion up in the content manifest (stat every directory
+below the roots, walk nothing):
+
+    python benchmarks/bench_discovery.py --files 20000 --per-dir 20 --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def build_content(content_dir: Path, files: int, per_dir: int) -> dict:
+    """Writes ``files`` templates below ``content_dir/backend``, ``per_dir`` per directory, and returns their mapping."""
+    content_files = {}
+    for index in range(files):
+        relative = f"backend/pkg{index // per_dir // per_dir}/mod{index // per_dir}/file{index}.py"
+        path = content_dir / f"{relative}.jinja"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("# {{ project_name }}\n")
+        content_files[relative] = f"{relative}.jinja"
+    return content_files
+
+
+def median_ms(function, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--per-dir", type=int, default=20, help="Files per directory and directories per package")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    sys.path.insert(0, str(REPO_ROOT))
+    from scaffoldor.discovery import ContentManifest, walk_content_root
+
+    with tempfile.TemporaryDirectory() as tmp:
+        content_dir = Path(tmp) / "content"
+        listed = build_content(content_dir, args.files, args.per_dir)
+        config_path = Path(tmp) / "listed.json"
+        config_path.write_text(json.dumps({"structure": {}, "content_files": listed}, indent=2))
+        rules = [{"root": "backend", "include": "**/*.jinja"}]
+        # Old enough for the manifest to trust the directory mtimes
+        old = time.time() - 60
+        for dirpath, _, _ in os.walk(content_dir):
+            os.utime(dirpath, (old, old))
+
+        manifest = ContentManifest(content_dir, Path(tmp) / "manifest.json")
+        assert manifest.expand(rules) == listed and manifest.walked == 1
+
+        def cached():
+            # A fresh process: the manifest is read from disk, then validated
+            ContentManifest(content_dir, Path(tmp) / "manifest.json").expand(rules)
+
+        results = {
+            "parse listed content_files": median_ms(lambda: json.loads(config_path.read_text()), args.runs),
+            "walk content_roots": median_ms(lambda: walk_content_root(content_dir, rules[0]), args.runs),
+            "content manifest lookup": median_ms(cached, args.runs),
+        }
+        directories = sum(1 for _ in os.walk(content_dir)) - 1
+        print(f"{len(listed)} content files in {directories} directories "
+              f"({config_path.stat().st_size // 1024} KiB of JSON when listed by hand)")
+        for label, milliseconds in results.items():
+            print(f"{label:<28} median {milliseconds:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_plan.py
+"""
+Cold-start comparison of ``scaffoldor create`` with and without a compiled plan.
+
+Every run is a fresh interpreter, as on an ephemeral CI container:
+
+    python benchmarks/bench_plan.py --runs 20
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RUN_CLI = "import sys; from scaffoldor.cli import main; sys.argv[0] = 'scaffoldor'; main()"
+
+
+def _cli(*args: str, cwd: Path) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", RUN_CLI, *args],
+        cwd=cwd,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        env={"PYTHONPATH": str(REPO_ROOT), "SCAFFOLDOR_CACHE_DIR": str(cwd / "cache")},
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--template", default="default")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        plan_path = workdir / "template.plan.json"
+        _cli("compile", args.template, "-o", str(plan_path), cwd=workdir)
+
+        results = {}
+        for label, extra in (("jinja", []), ("plan", ["--plan", str(plan_path)])):
+            # One warm-up run so the bytecode cache and the OS page cache are primed for both variants
+            _cli("create", f"warmup-{label}", *extra, cwd=workdir)
+            results[label] = [_cli("create", f"{label}-{i}", *extra, cwd=workdir) for i in range(args.runs)]
+
+    for label, timings in results.items():
+        print(f"{label:>5}: median {statistics.median(timings) * 1000:7.1f} ms  "
+              f"min {min(timings) * 1000:7.1f} ms  ({args.runs} runs)")
+    speedup = statistics.median(results["jinja"]) / statistics.median(results["plan"])
+    print(f"plan speed-up: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
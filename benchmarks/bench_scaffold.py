@@ -0,0 +1,410 @@
+# benchmarks/bench_scaffold.py
+"""
+Throughput, latency and memory benchmarks for scaffolding.
+
+Synthetic templates are generated at several scales (number of files), tree
+shapes (shallow or deep ``structure``) and output sizes. Each scenario runs in
+a fresh interpreter so its peak RSS is measured in isolation. The suite also
+measures CLI cold-start time and writes everything to a JSON file that can be
+compared with the results of another commit:
+
+    python benchmarks/bench_scaffold.py run -o before.json
+    git checkout my-branch
+    python benchmarks/bench_scaffold.py run -o after.json
+    python benchmarks/bench_scaffold.py compare before.json after.json
+
+``run --scales 10,100,1000,10000 --shapes shallow,deep --sizes small,large``
+selects the matrix. Scenarios whose total output would exceed ``--max-output``
+are skipped.
+
+The static-asset scenarios scaffold a template holding one large asset
+(``--static-size`` MiB, 0 to skip), once rendered as a Jinja2 template and once
+declared static. Their ``peak_python_bytes`` (tracemalloc) shows whether the
+asset's bytes went through Python strings.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RUN_CLI = "import sys; from scaffoldor.cli import main; sys.argv[0] = 'scaffoldor'; main()"
+RESULTS_VERSION = 1
+
+# Approximate size of one rendered file
+OUTPUT_SIZES = {"small": 512, "large": 256 * 1024}
+SHAPES = ("shallow", "deep")
+# A deep tree nests files DEEP_LEVELS directories below one of DEEP_FANOUT top-level folders
+DEEP_LEVELS = 8
+DEEP_FANOUT = 4
+COLD_START_COMMANDS = {
+    "version": ["--version"],
+    "list-templates": ["list-templates"],
+    "create-dry-run": ["--dry-run", "create", "cold"],
+    "create": ["create", "cold"],
+}
+
+# Static-asset scenarios: how the asset is declared in content_files
+STATIC_MODES = ("template", "static")
+
+# Higher is better for these metrics; lower is better for everything else
+HIGHER_IS_BETTER = ("projects_per_second",)
+
+
+def _scenario_name(files: int, shape: str, size: str) -> str:
+    return f"{files}-files-{shape}-{size}"
+
+
+def _template_source(index: int, size: str) -> str:
+    """Returns a template mixing literal text, substitutions and a loop, padded to the requested size."""
+    header = (
+        f"# File {index} of {{{{ project_name }}}}\n"
+        "{% for item in range(3) %}\n"
+        "- {{ project_name | upper }} item {{ item }}\n"
+        "{% endfor %}\n"
+    )
+    line = f"{{{{ project_name }}}} line for file {index}: lorem ipsum dolor sit amet\n"
+    repeats = max(1, (OUTPUT_SIZES[size] - len(header)) // len(line))
+    return header + line * repeats
+
+
+def build_template(root: Path, files: int, shape: str, size: str) -> dict:
+    """Writes ``files`` template sources under ``root`` and returns a matching template config."""
+    structure, content_files = {}, {}
+    if shape == "shallow":
+        structure = {"src": [], "docs": []}
+        directories = ["src", "docs"]
+    else:
+        directories = []
+        for top in range(DEEP_FANOUT):
+            nested = "/".join(f"level{level}" for level in range(1, DEEP_LEVELS))
+            structure[f"pkg{top}"] = [nested]
+            directories.append(f"pkg{top}/{nested}")
+
+    for index in range(files):
+        template_path = f"bench/file_{index}.txt.jinja"
+        source_path = root / template_path
+        source_path.parent.mkdir(parents=True, exist_ok=True)
+        source_path.write_text(_template_source(index, size), encoding="utf-8")
+        content_files[f"{directories[index % len(directories)]}/file_{index}.txt"] = template_path
+    return {"description": "Synthetic benchmark template", "structure": structure, "content_files": content_files}
+
+
+def _peak_rss_bytes():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_scenario(files: int, shape: str, size: str, projects: int) -> dict:
+    """Scaffolds ``projects`` projects from a synthetic template in this process and returns the measurements."""
+    from jinja2 import Environment, FileSystemLoader
+
+    from scaffoldor.scaffold import create_structure
+
+    logging.getLogger("scaffoldor").setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        template_config = build_template(workdir / "templates", files, shape, size)
+        env = Environment(loader=FileSystemLoader(str(workdir / "templates")), trim_blocks=True, lstrip_blocks=True)
+
+        timings = []
+        for index in range(projects):
+            start = time.perf_counter()
+            create_structure(workdir / "out" / f"project-{index}", template_config=template_config, env=env)
+            timings.append(time.perf_counter() - start)
+
+        # Templates are compiled by now, so this isolates rendering
+        render_us = []
+        for template_path in template_config["content_files"].values():
+            template = env.get_template(template_path)
+            start = time.perf_counter()
+            template.render(project_name="bench")
+            render_us.append((time.perf_counter() - start) * 1e6)
+
+        output_bytes = sum(
+            path.stat().st_size for path in (workdir / "out" / "project-0").rglob("*") if path.is_file()
+        )
+
+    warm = timings[1:] or timings
+    return {
+        "files": files,
+        "shape": shape,
+        "size": size,
+        "projects": projects,
+        "output_bytes_per_project": output_bytes,
+        "first_project_seconds": timings[0],
+        "project_seconds": statistics.median(warm),
+        "projects_per_second": len(warm) / sum(warm),
+        "render_us_p50": statistics.median(render_us),
+        "render_us_p95": _percentile(render_us, 0.95),
+        "render_us_max": max(render_us),
+        "peak_rss_bytes": _peak_rss_bytes(),
+    }
+
+
+def _asset_text(size: int) -> str:
+    """Returns a lockfile-like text asset of about ``size`` bytes, free of Jinja2 syntax so both modes can copy it."""
+    lines = []
+    total = 0
+    while total < size:
+        line = f"package-{len(lines)}==1.{len(lines) % 97}.0 --hash=sha256:{len(lines):064x}\n"
+        lines.append(line)
+        total += len(line)
+    return "".join(lines)
+
+
+def run_static_scenario(asset_mib: int, mode: str, projects: int) -> dict:
+    """Scaffolds ``projects`` projects from a template with one large asset, rendered or static, and returns the measurements."""
+    import tracemalloc
+
+    from jinja2 import Environment, FileSystemLoader
+
+    from scaffoldor.scaffold import create_structure
+
+    logging.getLogger("scaffoldor").setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        content = workdir / "templates"
+        (content / "bench").mkdir(parents=True)
+        asset_path = content / "bench" / "requirements.lock"
+        asset_path.write_text(_asset_text(asset_mib * 2**20), encoding="utf-8")
+        entry = {"source": "bench/requirements.lock", "static": mode == "static"}
+        template_config = {"structure": {}, "content_files": {"requirements.lock": entry}}
+        env = Environment(loader=FileSystemLoader(str(content)), trim_blocks=True, lstrip_blocks=True)
+
+        timings = []
+        tracemalloc.start()
+        for index in range(projects):
+            start = time.perf_counter()
+            create_structure(workdir / "out" / f"project-{index}", template_config=template_config, env=env, durable=False)
+            timings.append(time.perf_counter() - start)
+        _, peak_python = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        asset_bytes = asset_path.stat().st_size
+
+    warm = timings[1:] or timings
+    return {
+        "mode": mode,
+        "asset_bytes": asset_bytes,
+        "projects": projects,
+        "first_project_seconds": timings[0],
+        "project_seconds": statistics.median(warm),
+        "projects_per_second": len(warm) / sum(warm),
+        "peak_python_bytes": peak_python,
+        "peak_rss_bytes": _peak_rss_bytes(),
+    }
+
+
+def _subprocess_env(workdir: Path) -> dict:
+    return {**os.environ, "PYTHONPATH": str(REPO_ROOT), "SCAFFOLDOR_CACHE_DIR": str(workdir / "cache")}
+
+
+def measure_cold_start(runs: int) -> dict:
+    """Median and minimum wall time of fresh ``scaffoldor`` processes, per command."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for label, args in COLD_START_COMMANDS.items():
+            timings = []
+            # The first run primes the bytecode cache and the OS page cache
+            for run in range(runs + 1):
+                project_dir = workdir / f"{label}-{run}"
+                project_dir.mkdir()
+                start = time.perf_counter()
+                subprocess.run(
+                    [sys.executable, "-c", RUN_CLI, *args],
+                    cwd=project_dir,
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    env=_subprocess_env(workdir),
+                )
+                if run:
+                    timings.append(time.perf_counter() - start)
+            results[label] = {"median_seconds": statistics.median(timings), "min_seconds": min(timings)}
+    return results
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_suite(args: argparse.Namespace) -> dict:
+    sys.path.insert(0, str(REPO_ROOT))
+    from scaffoldor import __version__
+
+    results = {
+        "results_version": RESULTS_VERSION,
+        "commit": _git_commit(),
+        "scaffoldor_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "cold_start": measure_cold_start(args.runs),
+        "scenarios": {},
+    }
+    for label, timing in results["cold_start"].items():
+        print(f"cold start {label:<15} median {timing['median_seconds'] * 1000:8.1f} ms")
+
+    for files in args.scales:
+        for shape in args.shapes:
+            for size in args.sizes:
+                name = _scenario_name(files, shape, size)
+                if files * OUTPUT_SIZES[size] * args.projects > args.max_output:
+                    print(f"{name:<32} skipped (over --max-output)")
+                    continue
+                with tempfile.TemporaryDirectory() as tmp:
+                    result = subprocess.run(
+                        [sys.executable, __file__, "scenario", str(files), shape, size, "--projects", str(args.projects)],
+                        check=True,
+                        capture_output=True,
+                        text=True,
+                        env=_subprocess_env(Path(tmp)),
+                    )
+                scenario = json.loads(result.stdout)
+                results["scenarios"][name] = scenario
+                rss = scenario["peak_rss_bytes"]
+                print(
+                    f"{name:<32} {scenario['projects_per_second']:9.2f} projects/s  "
+                    f"render p50 {scenario['render_us_p50']:9.1f} us  "
+                    f"peak RSS {rss / 2**20 if rss else float('nan'):7.1f} MiB"
+                )
+
+    for mode in STATIC_MODES if args.static_size else ():
+        name = f"static-asset-{args.static_size}mib-{mode}"
+        with tempfile.TemporaryDirectory() as tmp:
+            result = subprocess.run(
+                [sys.executable, __file__, "static-scenario", str(args.static_size), mode, "--projects", str(args.projects)],
+                check=True,
+                capture_output=True,
+                text=True,
+                env=_subprocess_env(Path(tmp)),
+            )
+        scenario = json.loads(result.stdout)
+        results["scenarios"][name] = scenario
+        print(
+            f"{name:<32} {scenario['projects_per_second']:9.2f} projects/s  "
+            f"peak Python {scenario['peak_python_bytes'] / 2**20:9.1f} MiB  "
+            f"for a {scenario['asset_bytes'] / 2**20:.0f} MiB asset"
+        )
+    return results
+
+
+def _flatten(results: dict) -> dict:
+    metrics = {}
+    for label, timing in results.get("cold_start", {}).items():
+        metrics[f"cold_start/{label}"] = ("median_seconds", timing["median_seconds"])
+    for name, scenario in results.get("scenarios", {}).items():
+        for metric in ("projects_per_second", "first_project_seconds", "render_us_p50", "peak_rss_bytes", "peak_python_bytes"):
+            if scenario.get(metric) is not None:
+                metrics[f"{name}/{metric}"] = (metric, scenario[metric])
+    return metrics
+
+
+def compare(before: dict, after: dict, threshold: float) -> list:
+    """Prints the relative change of every metric present in both results and returns the regressions."""
+    old, new = _flatten(before), _flatten(after)
+    print(f"{'metric':<56} {'before':>12} {'after':>12} {'change':>8}")
+    regressions = []
+    for key in sorted(old.keys() & new.keys()):
+        metric, old_value = old[key]
+        new_value = new[key][1]
+        if not old_value:
+            continue
+        change = (new_value - old_value) / old_value
+        worse = -change if metric in HIGHER_IS_BETTER else change
+        flag = "  REGRESSION" if worse > threshold else ""
+        if flag:
+            regressions.append(key)
+        print(f"{key:<56} {old_value:12.4g} {new_value:12.4g} {change:+8.1%}{flag}")
+    return regressions
+
+
+def _int_list(value: str) -> list:
+    return [int(item) for item in value.split(",") if item]
+
+
+def _choice_list(choices):
+    def parse(value: str) -> list:
+        items = [item for item in value.split(",") if item]
+        unknown = [item for item in items if item not in choices]
+        if unknown:
+            raise argparse.ArgumentTypeError(f"unknown value(s) {', '.join(unknown)}; choose from {', '.join(choices)}")
+        return items
+    return parse
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmark suite")
+    run_parser.add_argument("--scales", type=_int_list, default=[10, 100, 1000, 10000], help="Files per template")
+    run_parser.add_argument("--shapes", type=_choice_list(SHAPES), default=list(SHAPES))
+    run_parser.add_argument("--sizes", type=_choice_list(tuple(OUTPUT_SIZES)), default=list(OUTPUT_SIZES))
+    run_parser.add_argument("--projects", type=int, default=3, help="Projects scaffolded per scenario")
+    run_parser.add_argument("--runs", type=int, default=10, help="Runs per cold-start command")
+    run_parser.add_argument("--max-output", type=int, default=512 * 2**20, help="Skip scenarios writing more bytes")
+    run_parser.add_argument("--static-size", type=int, default=64, help="Asset size in MiB for the static-asset scenarios (0 skips them)")
+    run_parser.add_argument("-o", "--output", type=Path, help="Write the results to this JSON file")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("before", type=Path)
+    compare_parser.add_argument("after", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="Relative change reported as a regression")
+
+    scenario_parser = subparsers.add_parser("scenario", help=argparse.SUPPRESS)
+    scenario_parser.add_argument("files", type=int)
+    scenario_parser.add_argument("shape", choices=SHAPES)
+    scenario_parser.add_argument("size", choices=tuple(OUTPUT_SIZES))
+    scenario_parser.add_argument("--projects", type=int, default=3)
+
+    static_parser = subparsers.add_parser("static-scenario", help=argparse.SUPPRESS)
+    static_parser.add_argument("asset_mib", type=int)
+    static_parser.add_argument("mode", choices=STATIC_MODES)
+    static_parser.add_argument("--projects", type=int, default=3)
+
+    args = parser.parse_args()
+    if args.command == "scenario":
+        print(json.dumps(run_scenario(args.files, args.shape, args.size, args.projects)))
+    elif args.command == "static-scenario":
+        print(json.dumps(run_static_scenario(args.asset_mib, args.mode, args.projects)))
+    elif args.command == "run":
+        results = run_suite(args)
+        if args.output:
+            args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+            print(f"Results written to {args.output}")
+    else:
+        before = json.loads(args.before.read_text(encoding="utf-8"))
+        after = json.loads(args.after.read_text(encoding="utf-8"))
+        regressions = compare(before, after, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
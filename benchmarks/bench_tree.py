@@ -0,0 +1,124 @@
+# benchmarks/bench_tree.py
+"""
+File-system calls and wall time needed to create a large, deeply nested
+project tree: the per-entry ``mkdir(parents=True, exist_ok=True)`` loop
+scaffoldor used before, against the planned tree created by path and
+relative to parent directory descriptors (``mkdirat``).
+
+Calls are counted by wrapping the ``os`` functions that turn into
+syscalls (``mkdir``, ``stat``, ``open``, ...), so the numbers do not
+depend on strace being available:
+
+    python benchmarks/bench_tree.py --fanout 4 --depth 6 --runs 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+COUNTED = ("mkdir", "stat", "lstat", "open", "close", "chmod")
+
+
+def build_structure(fanout: int, depth: int) -> tuple[dict, list]:
+    """
+    Returns a two-level ``structure`` listing every leaf path of a ``fanout``-ary
+    tree of ``depth`` levels under each top-level folder, as templates write
+    them ("app/api/v1"), plus one content file in every leaf directory.
+    """
+    def leaves(prefix: str, level: int) -> list:
+        if level == depth:
+            return [prefix]
+        return [leaf for index in range(fanout) for leaf in leaves(f"{prefix}/d{index}", level + 1)]
+
+    structure = {f"top{index}": [leaf.lstrip("/") for leaf in leaves("", 1)] for index in range(fanout)}
+    files = [f"{folder}/{leaf}/README.md" for folder, subfolders in structure.items() for leaf in subfolders]
+    return structure, files
+
+
+def create_before(root: Path, structure: dict, files: list) -> None:
+    """The loops create_structure and create_files ran before the tree planner."""
+    for folder, subfolders in structure.items():
+        (root / folder).mkdir(parents=True, exist_ok=True)
+        for subfolder in subfolders:
+            (root / folder / subfolder).mkdir(parents=True, exist_ok=True)
+    for parent in sorted({Path(path).parent.as_posix() for path in files}):
+        (root / parent).mkdir(parents=True, exist_ok=True)
+
+
+def create_planned(root: Path, structure: dict, files: list, by_path: bool) -> None:
+    from scaffoldor import tree
+    from scaffoldor.scaffold import project_directories
+
+    planned = tree.plan_tree(project_directories({"structure": structure, "content_files": dict.fromkeys(files, "")}))
+    tree.make_tree(root, planned, dir_fd=not by_path)
+
+
+@contextmanager
+def count_calls():
+    """Counts calls to the wrapped ``os`` functions while active."""
+    counts = Counter()
+    originals = {name: getattr(os, name) for name in COUNTED}
+
+    def wrap(name, function):
+        def counted(*args, **kwargs):
+            counts[name] += 1
+            return function(*args, **kwargs)
+        return counted
+
+    for name, function in originals.items():
+        setattr(os, name, wrap(name, function))
+    try:
+        yield counts
+    finally:
+        for name, function in originals.items():
+            setattr(os, name, function)
+
+
+def measure(method, structure: dict, files: list, runs: int) -> dict:
+    timings, calls = [], None
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "project"
+            root.mkdir()
+            with count_calls() as counts:
+                start = time.perf_counter()
+                method(root, structure, files)
+                timings.append(time.perf_counter() - start)
+            calls = dict(counts)
+            directories = sum(1 for path in root.rglob("*") if path.is_dir())
+    return {"calls": calls, "total_calls": sum(calls.values()), "median_seconds": statistics.median(timings),
+            "directories": directories}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fanout", type=int, default=4, help="Subdirectories per directory")
+    parser.add_argument("--depth", type=int, default=6, help="Levels below each top-level folder")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    sys.path.insert(0, str(REPO_ROOT))
+    # Imported before any call is counted: scaffoldor.tree checks for mkdirat support on import
+    import scaffoldor.scaffold  # noqa: F401
+
+    structure, files = build_structure(args.fanout, args.depth)
+    methods = {
+        "before": create_before,
+        "planned, by path": lambda root, s, f: create_planned(root, s, f, by_path=True),
+        "planned, mkdirat": lambda root, s, f: create_planned(root, s, f, by_path=False),
+    }
+    results = {label: measure(method, structure, files, args.runs) for label, method in methods.items()}
+
+    print(f"{results['before']['directories']} directories, {len(files)} content files")
+    for label, result in results.items():
+        calls = ", ".join(f"{name} {count}" for name, count in sorted(result["calls"].items()))
+        print(f"{label:<18} {result['total_calls']:7d} calls ({calls})  median {result['median_seconds'] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
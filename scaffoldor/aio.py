@@ -0,0 +1,236 @@
+# scaffoldor/aio.py
+import asyncio
+import itertools
+import logging
+import os
+import posixpath
+from pathlib import Path
+from typing import Optional
+
+from .backends import DIR_MODE, FILE_MODE, FilesystemBackend
+from .exceptions import GenerationError, ProjectExistsError, ScaffoldError, TemplateConfigError
+from .manifest import hash_bytes, hash_context, write_manifest
+from .profiling import span
+from .reproducible import RNG_VARIABLE, file_random, normalize_newlines
+from .scaffold import (
+    PENDING_CALLS_PER_JOB, build_render_context, check_template_config, copy_static_file, expand_content_entries,
+    file_dependencies, get_environment, project_directories, resolve_template_config, static_root,
+    template_directories, variables_hash,
+)
+from .transaction import commit_project, discard_staging, stage_project
+from .variables import TemplateVariables
+
+logger = logging.getLogger("scaffoldor")
+
+# Default number of files a single scaffold() call renders and writes at once
+DEFAULT_CONCURRENCY = 8
+
+
+def _stage_directories(project_path: Path, template_config: dict, fixed_modes: bool) -> Path:
+    """Creates the staging directory with every declared project directory inside it and returns it."""
+    if project_path.exists():
+        raise ProjectExistsError(f"Directory '{project_path}' already exists.")
+    try:
+        staging = stage_project(project_path)
+    except OSError as e:
+        raise ScaffoldError(f"Failed to create project directory '{project_path}': {e}") from e
+
+    backend = FilesystemBackend(staging, fixed_modes)
+    with span("mkdir") as timing:
+        try:
+            if fixed_modes:
+                os.chmod(staging, DIR_MODE)
+            timing.files = 1 + backend.make_tree(project_directories(template_config))
+        except OSError as e:
+            discard_staging(staging)
+            raise ScaffoldError(f"Failed to create directory in '{staging}': {e}") from e
+    return staging
+
+
+def _commit(staging: Path, project_path: Path, template_name: str, context: Optional[dict],
+            render_context: dict, records: dict, directories: list, seed: Optional[str], durable: bool) -> None:
+    with span("manifest"):
+        write_manifest(staging, template_name, context or {}, hash_context(render_context), records, directories, seed)
+    try:
+        commit_project(staging, project_path, durable)
+    except OSError as e:
+        raise ScaffoldError(f"Failed to move project into place at '{project_path}': {e}") from e
+
+
+def _next_entries(entries, count: int) -> list:
+    return list(itertools.islice(entries, count))
+
+
+def _make_parent(backend: FilesystemBackend, parent: str) -> None:
+    with span("mkdir") as timing:
+        timing.files = backend.make_tree([parent])
+
+
+def _load_template(env, template_name: str):
+    with span("compile", template=template_name):
+        return env.get_template(template_name), file_dependencies(env, template_name)
+
+
+def _write_file(file_path: Path, data: bytes, template_name: str, fixed_modes: bool) -> None:
+    with span("write", template=template_name) as timing:
+        file_path.write_bytes(data)
+        if fixed_modes:
+            os.chmod(file_path, FILE_MODE)
+        timing.files, timing.bytes = 1, len(data)
+
+
+async def _generate_file(env, template_name: str, file_path: Path, render_context: dict, limit: asyncio.Semaphore,
+                         seed: Optional[str]) -> dict:
+    async with limit:
+        # Loading may read the template from disk and compile it, so it runs off the event loop too
+        template, (source_hash, variables) = await asyncio.to_thread(_load_template, env, template_name)
+        with span("render", template=template_name) as timing:
+            text = await template.render_async(**render_context)
+            if seed is not None:
+                text = normalize_newlines(text)
+            data = text.encode('utf-8')
+            timing.bytes = len(data)
+        await asyncio.to_thread(_write_file, file_path, data, template_name, seed is not None)
+    return {"template": template_name, "source": source_hash, "context": variables_hash(variables, render_context),
+            "output": hash_bytes(data)}
+
+
+async def _copy_file(env, template_name: str, relative_path: str, backend: FilesystemBackend, limit: asyncio.Semaphore) -> dict:
+    async with limit:
+        digest = await asyncio.to_thread(copy_static_file, static_root(env), template_name, relative_path, backend, "reflink")
+    return {"template": template_name, "source": digest, "output": digest}
+
+
+async def scaffold(
+    project_path: Path,
+    template_name: str = "default",
+    context: Optional[dict] = None,
+    template_config: Optional[dict] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    limit: Optional[asyncio.Semaphore] = None,
+    durable: bool = True,
+    seed: Optional[str] = None,
+) -> dict:
+    """
+    Creates a project like :func:`scaffoldor.scaffold.create_structure`, without
+    blocking the event loop.
+
+    Templates are rendered with Jinja2's async support and all file system work
+    runs in worker threads. At most ``concurrency`` files are in flight at once;
+    pass a shared ``limit`` semaphore instead to bound the total across many
+    concurrent calls. Files are pulled from the content list (and ``for_each``
+    lists) as workers free up, so memory does not grow with the number of
+    files. Every call shares one Jinja2 environment, so each template is
+    compiled once per process.
+
+    The project is staged next to ``project_path`` and renamed into place
+    when complete (see :mod:`scaffoldor.transaction`), so concurrent requests
+    never observe a partial project and failures leave nothing behind. A
+    ``seed`` makes the output deterministic, as in ``create_structure``.
+
+    Returns a record per generated file (as written to the project manifest).
+    Raises :class:`~scaffoldor.exceptions.ScaffoldError` subclasses instead of
+    exiting: ``TemplateNotFoundError``, ``TemplateConfigError``,
+    ``VariableError``, ``ProjectExistsError`` or ``GenerationError``.
+    """
+    project_path = Path(project_path)
+    # The first call imports Jinja2 and builds the environment
+    env = await asyncio.to_thread(get_environment, True)
+    if template_config is None:
+        template_config = await asyncio.to_thread(resolve_template_config, template_name)
+    else:
+        # A config built by the caller gets the checks a registry template gets when it is loaded
+        try:
+            template_config = await asyncio.to_thread(check_template_config, template_config, static_root(env))
+        except ValueError as e:
+            raise TemplateConfigError(f"Invalid template configuration: {e}") from e
+    # Derived variables may need Jinja2 to compile their expressions first
+    render_context = await asyncio.to_thread(
+        build_render_context, project_path.name, context, TemplateVariables.from_config(template_config), seed
+    )
+
+    fixed_modes = seed is not None
+    staging = await asyncio.to_thread(_stage_directories, project_path, template_config, fixed_modes)
+    # Static files are copied without decoding (see create_files)
+    backend = FilesystemBackend(staging, fixed_modes)
+
+    def file_context(output_filename: str, item_context: dict) -> dict:
+        context = {**render_context, **item_context} if item_context else render_context
+        if seed is None:
+            return context
+        return {**context, RNG_VARIABLE: file_random(seed, project_path.name, Path(output_filename).as_posix())}
+
+    if limit is None:
+        limit = asyncio.Semaphore(concurrency)
+    # Fan-out lists and paths are evaluated synchronously: the async environment's
+    # expressions and templates return coroutines instead of values
+    sync_env = await asyncio.to_thread(get_environment)
+    entries = expand_content_entries(sync_env, template_config, render_context)
+    # Entries are pulled as workers free up, like run_in_order does, so memory
+    # stays flat however long a fan-out list is
+    queue = asyncio.Queue(maxsize=concurrency * PENDING_CALLS_PER_JOB)
+    records, failures, expand_errors = {}, {}, []
+    # Rendered paths may name directories the template does not declare; each is created once
+    fan_out_parents = {}
+
+    async def produce():
+        try:
+            while batch := await asyncio.to_thread(_next_entries, entries, concurrency):
+                for entry in batch:
+                    await queue.put(entry)
+        except (ScaffoldError, ValueError) as e:
+            expand_errors.append(e)
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def work():
+        while (entry := await queue.get()) is not None:
+            output_filename, template_relative_path, static, item_context = entry
+            relative_path = Path(output_filename).as_posix()
+            try:
+                parent = posixpath.dirname(relative_path)
+                if item_context and parent:
+                    if parent not in fan_out_parents:
+                        fan_out_parents[parent] = asyncio.ensure_future(asyncio.to_thread(_make_parent, backend, parent))
+                    await fan_out_parents[parent]
+                if static:
+                    records[output_filename] = await _copy_file(env, template_relative_path, relative_path, backend, limit)
+                else:
+                    records[output_filename] = await _generate_file(
+                        env, template_relative_path, staging / output_filename,
+                        file_context(output_filename, item_context), limit, seed,
+                    )
+            except Exception as e:
+                failures[output_filename] = e
+
+    tasks = [asyncio.create_task(produce()), *(asyncio.create_task(work()) for _ in range(concurrency))]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # Cancellation and the like are not file errors; let them propagate
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.to_thread(discard_staging, staging)
+        raise
+
+    if expand_errors or failures:
+        await asyncio.to_thread(discard_staging, staging)
+    if expand_errors:
+        error = expand_errors[0]
+        if isinstance(error, ScaffoldError):
+            raise error
+        raise TemplateConfigError(str(error)) from error
+    if failures:
+        raise GenerationError(dict(sorted(failures.items())))
+
+    try:
+        await asyncio.to_thread(
+            _commit, staging, project_path, template_name, context, render_context, records,
+            template_directories(template_config), seed, durable,
+        )
+    except BaseException:
+        await asyncio.to_thread(discard_staging, staging)
+        raise
+    logger.debug(f"Scaffolded project '{project_path.name}' at {project_path}")
+    return records
@@ -0,0 +1,320 @@
+# scaffoldor/backends.py
+import gzip
+import hashlib
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterable, Optional
+
+from .copying import copy_file
+from .tree import make_tree, plan_tree
+
+# Permissions recorded for archive members
+FILE_MODE = 0o644
+DIR_MODE = 0o755
+
+
+class OutputBackend:
+    """
+    Destination for a generated project. :func:`scaffoldor.scaffold.create_structure`
+    and :func:`~scaffoldor.scaffold.create_files` hand every directory and
+    file to a backend, using ``/``-separated paths relative to the project root.
+
+    ``write_stream`` receives the rendered output as an iterable of byte chunks
+    and returns the SHA-256 and size of what it wrote. ``copy_static`` adds a
+    file verbatim from ``source`` (static assets) and returns its size.
+    ``make_tree`` creates many directories, and any parents they imply, at once.
+    Backends must be safe to call from several threads (``create --jobs``).
+    """
+
+    def make_dir(self, relative_path: str) -> None:
+        raise NotImplementedError
+
+    def make_tree(self, relative_paths) -> int:
+        tree = plan_tree(relative_paths)
+        for relative_path in tree:
+            self.make_dir(relative_path)
+        return len(tree)
+
+    def write_file(self, relative_path: str, data: bytes) -> None:
+        raise NotImplementedError
+
+    def write_stream(self, relative_path: str, chunks: Iterable[bytes], buffer_bytes: int) -> tuple[str, int]:
+        data = b"".join(chunks)
+        self.write_file(relative_path, data)
+        return hashlib.sha256(data).hexdigest(), len(data)
+
+    def copy_static(self, relative_path: str, source: Path, link_mode: str = "copy") -> int:
+        data = Path(source).read_bytes()
+        self.write_file(relative_path, data)
+        return len(data)
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class FilesystemBackend(OutputBackend):
+    """
+    Writes the project below ``root`` on disk. With ``fixed_modes`` every file
+    gets :data:`FILE_MODE` and every directory :data:`DIR_MODE`, whatever the umask.
+    """
+
+    def __init__(self, root: Path, fixed_modes: bool = False):
+        self.root = Path(root)
+        self.fixed_modes = fixed_modes
+
+    def make_dir(self, relative_path: str) -> None:
+        if not self.fixed_modes:
+            (self.root / relative_path).mkdir(parents=True, exist_ok=True)
+            return
+        # Parents created on the way need the fixed mode as well
+        path = self.root
+        for part in PurePosixPath(relative_path).parts:
+            path = path / part
+            path.mkdir(exist_ok=True)
+            os.chmod(path, DIR_MODE)
+
+    def make_tree(self, relative_paths) -> int:
+        """Creates the whole tree with one ``mkdir`` per directory (see :func:`scaffoldor.tree.make_tree`)."""
+        return make_tree(self.root, plan_tree(relative_paths), DIR_MODE if self.fixed_modes else None, exist_ok=True)
+
+    def write_file(self, relative_path: str, data: bytes) -> None:
+        path = self.root / relative_path
+        path.write_bytes(data)
+        if self.fixed_modes:
+            os.chmod(path, FILE_MODE)
+
+    def write_stream(self, relative_path: str, chunks: Iterable[bytes], buffer_bytes: int) -> tuple[str, int]:
+        """
+        Collects chunks until ``buffer_bytes`` is reached, then flushes them to a
+        temporary file next to the target, which is renamed into place once all
+        chunks were written. A failed render never leaves a partial file behind.
+        """
+        file_path = self.root / relative_path
+        tmp_path = file_path.with_name(f".{file_path.name}.{os.urandom(4).hex()}.tmp")
+        # os.open honours the umask, so the final file gets the same mode write_bytes would give it
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        digest = hashlib.sha256()
+        written = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pending, pending_size = [], 0
+                for data in chunks:
+                    digest.update(data)
+                    pending.append(data)
+                    pending_size += len(data)
+                    written += len(data)
+                    if pending_size >= buffer_bytes:
+                        f.write(b"".join(pending))
+                        pending, pending_size = [], 0
+                f.write(b"".join(pending))
+            if self.fixed_modes:
+                os.chmod(tmp_path, FILE_MODE)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return digest.hexdigest(), written
+
+    def copy_static(self, relative_path: str, source: Path, link_mode: str = "copy") -> int:
+        """
+        Creates the file from ``source`` with :func:`~scaffoldor.copying.copy_file`,
+        so its bytes never pass through Python. With ``fixed_modes``, hardlinks
+        become reflinks: a shared inode keeps the mode of the template's file.
+        """
+        path = self.root / relative_path
+        if self.fixed_modes and link_mode == "hardlink":
+            link_mode = "reflink"
+        if copy_file(Path(source), path, link_mode) != "hardlink" and self.fixed_modes:
+            os.chmod(path, FILE_MODE)
+        return path.stat().st_size
+
+
+class MemoryBackend(OutputBackend):
+    """Keeps the project in memory: ``files`` maps each path to its bytes, ``directories`` lists every directory."""
+
+    def __init__(self):
+        self.files = {}
+        self.directories = set()
+        self._lock = threading.Lock()
+
+    def make_dir(self, relative_path: str) -> None:
+        with self._lock:
+            self.directories.add(relative_path)
+
+    def write_file(self, relative_path: str, data: bytes) -> None:
+        # A memoryview (e.g. a slice of a mapped template bundle) must not outlive its buffer
+        with self._lock:
+            self.files[relative_path] = bytes(data)
+
+
+class _ArchiveBackend(OutputBackend):
+    """
+    Shared bookkeeping for archive backends: member names, timestamps and
+    implicit parent directories. Every member is stamped with ``mtime``
+    (default: now); pass a fixed one for reproducible archives.
+    """
+
+    def __init__(self, prefix: str = "", mtime: Optional[int] = None):
+        self.prefix = prefix.strip("/")
+        self.mtime = int(time.time()) if mtime is None else mtime
+        self._directories = set()
+        self._lock = threading.Lock()
+
+    def _member_name(self, relative_path: str) -> str:
+        return f"{self.prefix}/{relative_path}" if self.prefix else relative_path
+
+    def _missing_directories(self, relative_path: str) -> list:
+        """Returns ``relative_path`` and its ancestors that have no archive entry yet, outermost first (caller holds the lock)."""
+        path = PurePosixPath(relative_path)
+        missing = [str(p) for p in reversed([path, *path.parents]) if str(p) != "." and str(p) not in self._directories]
+        self._directories.update(missing)
+        return missing
+
+    def make_dir(self, relative_path: str) -> None:
+        with self._lock:
+            for directory in self._missing_directories(relative_path):
+                self._add_directory(self._member_name(directory))
+
+    def _add_directory(self, name: str) -> None:
+        raise NotImplementedError
+
+
+class TarBackend(_ArchiveBackend):
+    """
+    Streams the project into a tar archive written to ``fileobj``, which does
+    not need to be seekable (stdout works). ``compression`` may be ``"gz"``,
+    ``"bz2"`` or ``"xz"``. With a fixed ``mtime``, gzip output is reproducible too.
+
+    Tar headers carry the member size, so streamed files are first spooled:
+    in memory up to the stream buffer size, in a temporary file beyond it.
+    """
+
+    def __init__(self, fileobj: BinaryIO, prefix: str = "", compression: str = "", mtime: Optional[int] = None):
+        super().__init__(prefix, mtime)
+        self._gzip = None
+        if compression == "gz" and mtime is not None:
+            # tarfile stamps its gzip header with the current time; GzipFile lets us choose
+            self._gzip = fileobj = gzip.GzipFile(filename="", mode="wb", fileobj=fileobj, mtime=mtime)
+            compression = ""
+        self.archive = tarfile.open(fileobj=fileobj, mode=f"w|{compression}")
+
+    def _info(self, name: str, kind: bytes, mode: int, size: int = 0) -> tarfile.TarInfo:
+        info = tarfile.TarInfo(name)
+        info.type, info.mode, info.size, info.mtime = kind, mode, size, self.mtime
+        return info
+
+    def _add_directory(self, name: str) -> None:
+        self.archive.addfile(self._info(name, tarfile.DIRTYPE, DIR_MODE))
+
+    def write_file(self, relative_path: str, data: bytes) -> None:
+        with self._lock:
+            self.archive.addfile(
+                self._info(self._member_name(relative_path), tarfile.REGTYPE, FILE_MODE, len(data)), io.BytesIO(data)
+            )
+
+    def write_stream(self, relative_path: str, chunks: Iterable[bytes], buffer_bytes: int) -> tuple[str, int]:
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.SpooledTemporaryFile(max_size=buffer_bytes) as spool:
+            for data in chunks:
+                digest.update(data)
+                spool.write(data)
+                size += len(data)
+            spool.seek(0)
+            with self._lock:
+                self.archive.addfile(self._info(self._member_name(relative_path), tarfile.REGTYPE, FILE_MODE, size), spool)
+        return digest.hexdigest(), size
+
+    def copy_static(self, relative_path: str, source: Path, link_mode: str = "copy") -> int:
+        with open(source, "rb") as f, self._lock:
+            size = os.fstat(f.fileno()).st_size
+            self.archive.addfile(self._info(self._member_name(relative_path), tarfile.REGTYPE, FILE_MODE, size), f)
+        return size
+
+    def close(self) -> None:
+        self.archive.close()
+        if self._gzip is not None:
+            self._gzip.close()
+
+
+class ZipBackend(_ArchiveBackend):
+    """
+    Writes the project into a deflate-compressed zip archive on ``fileobj``.
+    Streamed files are compressed as they are rendered; unseekable outputs such
+    as stdout are supported.
+    """
+
+    def __init__(self, fileobj: BinaryIO, prefix: str = "", mtime: Optional[int] = None):
+        super().__init__(prefix, mtime)
+        self.archive = zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED)
+
+    def _info(self, name: str, mode: int) -> zipfile.ZipInfo:
+        # UTC, so the same mtime gives the same archive in every time zone
+        info = zipfile.ZipInfo(name, date_time=time.gmtime(self.mtime)[:6])
+        info.external_attr = mode << 16
+        info.compress_type = zipfile.ZIP_DEFLATED
+        return info
+
+    def _add_directory(self, name: str) -> None:
+        info = self._info(f"{name}/", 0o40000 | DIR_MODE)
+        info.external_attr |= 0x10  # MS-DOS directory flag
+        info.compress_type = zipfile.ZIP_STORED
+        self.archive.writestr(info, b"")
+
+    def write_file(self, relative_path: str, data: bytes) -> None:
+        with self._lock:
+            self.archive.writestr(self._info(self._member_name(relative_path), FILE_MODE), data)
+
+    def write_stream(self, relative_path: str, chunks: Iterable[bytes], buffer_bytes: int) -> tuple[str, int]:
+        digest = hashlib.sha256()
+        size = 0
+        # A zip archive accepts one open member at a time, so streamed files are written one after another
+        with self._lock, self.archive.open(self._info(self._member_name(relative_path), FILE_MODE), "w") as member:
+            pending, pending_size = [], 0
+            for data in chunks:
+                digest.update(data)
+                pending.append(data)
+                pending_size += len(data)
+                size += len(data)
+                if pending_size >= buffer_bytes:
+                    member.write(b"".join(pending))
+                    pending, pending_size = [], 0
+            member.write(b"".join(pending))
+        return digest.hexdigest(), size
+
+    def copy_static(self, relative_path: str, source: Path, link_mode: str = "copy") -> int:
+        info = self._info(self._member_name(relative_path), FILE_MODE)
+        with open(source, "rb") as f:
+            # Known up front, so zipfile switches to ZIP64 for large assets by itself
+            info.file_size = os.fstat(f.fileno()).st_size
+            with self._lock, self.archive.open(info, "w") as member:
+                shutil.copyfileobj(f, member)
+        return info.file_size
+
+    def close(self) -> None:
+        self.archive.close()
+
+
+ARCHIVE_FORMATS = {
+    "tar": lambda fileobj, prefix, mtime: TarBackend(fileobj, prefix, mtime=mtime),
+    "tar.gz": lambda fileobj, prefix, mtime: TarBackend(fileobj, prefix, compression="gz", mtime=mtime),
+    "zip": lambda fileobj, prefix, mtime: ZipBackend(fileobj, prefix, mtime=mtime),
+}
+
+
+def archive_backend(archive_format: str, fileobj: BinaryIO, prefix: str = "", mtime: Optional[int] = None) -> OutputBackend:
+    """Returns the archive backend for ``archive_format`` (one of :data:`ARCHIVE_FORMATS`)."""
+    return ARCHIVE_FORMATS[archive_format](fileobj, prefix, mtime)
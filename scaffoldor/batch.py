@@ -0,0 +1,193 @@
+# scaffoldor/batch.py
+import csv
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from .exceptions import TemplateConfigError
+from .memo import RenderMemo
+from .profiling import span
+from .scaffold import STREAM_BUFFER_BYTES, create_structure, get_environment, load_template_config
+from .transaction import sync_directory, sync_tree
+from .variables import TemplateVariables
+
+logger = logging.getLogger("scaffoldor")
+
+# Manifest columns that describe the project itself; anything else in a CSV row
+# is passed to the templates as a variable.
+RESERVED_KEYS = ("name", "path", "template", "variables")
+
+
+def _normalize_entry(raw: dict, source: str) -> dict:
+    """Validates one manifest entry and fills in the optional keys."""
+    if not isinstance(raw, dict):
+        raise ValueError(f"{source}: expected an object, got {type(raw).__name__}")
+    name = raw.get("name") or raw.get("project_name")
+    if not name:
+        raise ValueError(f"{source}: entry is missing the 'name' key")
+    variables = raw.get("variables") or {}
+    if not isinstance(variables, dict):
+        raise ValueError(f"{source}: 'variables' must be an object")
+    return {
+        "name": str(name),
+        "path": raw.get("path") or None,
+        "template": raw.get("template") or None,
+        "variables": variables,
+    }
+
+
+def load_manifest(manifest_path: Path) -> list[dict]:
+    """
+    Loads batch entries from a JSON, JSONL or CSV manifest.
+
+    Every entry describes one project: a required ``name`` plus optional
+    ``path`` (parent directory), ``template`` and ``variables``. JSON manifests
+    hold a list of entries (or an object with a ``projects`` list), JSONL holds
+    one entry per line and CSV rows use extra columns as variables.
+    """
+    suffix = manifest_path.suffix.lower()
+    entries = []
+    try:
+        with manifest_path.open(encoding='utf-8', newline='') as f:
+            if suffix == ".json":
+                data = json.load(f)
+                if isinstance(data, dict):
+                    data = data.get("projects", [])
+                for index, raw in enumerate(data):
+                    entries.append(_normalize_entry(raw, f"{manifest_path.name}[{index}]"))
+            elif suffix == ".jsonl":
+                for line_no, line in enumerate(f, start=1):
+                    if line.strip():
+                        entries.append(_normalize_entry(json.loads(line), f"{manifest_path.name}:{line_no}"))
+            elif suffix == ".csv":
+                for line_no, row in enumerate(csv.DictReader(f), start=2):
+                    variables = {k: v for k, v in row.items() if k not in RESERVED_KEYS and v not in (None, "")}
+                    raw = {k: row.get(k) for k in ("name", "path", "template")}
+                    raw["variables"] = variables
+                    entries.append(_normalize_entry(raw, f"{manifest_path.name}:{line_no}"))
+            else:
+                raise ValueError(f"unsupported manifest format '{suffix}' (use .json, .jsonl or .csv)")
+    except OSError as e:
+        logger.error(f"Failed to read manifest '{manifest_path}': {e}")
+        sys.exit(1)
+    except (json.JSONDecodeError, ValueError) as e:
+        logger.error(f"Invalid manifest '{manifest_path}': {e}")
+        sys.exit(1)
+    return entries
+
+
+def create_many(
+    entries: list[dict],
+    base_path: Path = Path("."),
+    template_name: str = "default",
+    dry_run: bool = False,
+    verbose: bool = False,
+    jobs: int = 1,
+    stream: bool = False,
+    stream_buffer: int = STREAM_BUFFER_BYTES,
+    durable: bool = True,
+    variables: Optional[dict] = None,
+    seed: Optional[str] = None,
+    output_cache: bool = True,
+    cache_link: str = "reflink",
+    static_link: str = "reflink",
+) -> dict:
+    """
+    Scaffolds every project described by ``entries`` in a single process.
+
+    Template configs are loaded once per template name and all projects share
+    one Jinja2 environment, so each template is compiled only once for the
+    whole batch. Files that read no project-specific variable are rendered
+    once and reused for every project (see :class:`~scaffoldor.memo.RenderMemo`).
+    Returns a summary with the created and failed project paths, the elapsed
+    time, the throughput in projects per second and the number of
+    ``renders_reused``.
+
+    ``variables`` apply to every project, below each entry's own variables.
+    Typed values and derived variables that do not depend on the project are
+    computed once per template for the whole batch.
+
+    A ``seed`` makes every project deterministic; each project still gets
+    its own random values, derived from the seed and its name. Seeded
+    projects use the output cache (see ``create_structure``).
+
+    Each project is committed atomically; with ``durable`` the whole batch is
+    flushed to disk at the end instead of project by project.
+    """
+    env = get_environment()
+    render_memo = RenderMemo()
+    configs = {}
+    template_variables = {}
+    created, failed = [], []
+
+    start = time.perf_counter()
+    for entry in entries:
+        name = entry.get("template") or template_name
+        parent = Path(entry["path"]) if entry.get("path") else Path(".")
+        project_path = (base_path / parent / entry["name"]).resolve()
+        if name not in configs:
+            # A template that cannot be loaded fails its projects, not the batch; None remembers that
+            configs[name] = None
+            try:
+                template_config = load_template_config(name)
+                template_variables[name] = TemplateVariables.from_config(template_config, shared=variables)
+                configs[name] = template_config
+            except TemplateConfigError as e:
+                logger.error(str(e))
+            except SystemExit:
+                # load_template_config has already logged why
+                pass
+        if configs[name] is None:
+            failed.append(project_path)
+            continue
+
+        try:
+            with span("project", project=entry["name"], template=name):
+                create_structure(
+                    project_path,
+                    template_name=name,
+                    dry_run=dry_run,
+                    verbose=verbose,
+                    template_config=configs[name],
+                    env=env,
+                    context=entry.get("variables"),
+                    jobs=jobs,
+                    stream=stream,
+                    stream_buffer=stream_buffer,
+                    durable=False,
+                    template_variables=template_variables[name],
+                    seed=seed,
+                    output_cache=output_cache,
+                    cache_link=cache_link,
+                    static_link=static_link,
+                    render_memo=render_memo,
+                )
+        except SystemExit:
+            # create_structure has already logged why; keep going with the rest of the batch
+            failed.append(project_path)
+            continue
+        created.append(project_path)
+    if durable and created and not dry_run:
+        # Only the new projects are flushed, not whatever else lives below base_path
+        for project_path in created:
+            sync_tree(project_path)
+        for parent in {project_path.parent for project_path in created}:
+            sync_directory(parent)
+    elapsed = time.perf_counter() - start
+
+    rate = len(created) / elapsed if elapsed > 0 else float("inf")
+    logger.info(
+        f"Scaffolded {len(created)} project(s) in {elapsed:.2f}s ({rate:.1f} projects/s)"
+        + (f", {len(failed)} failed" if failed else "")
+    )
+    logger.debug(f"Reused {render_memo.hits} rendered file(s) across projects")
+    return {
+        "created": created,
+        "failed": failed,
+        "elapsed": elapsed,
+        "projects_per_second": rate,
+        "renders_reused": render_memo.hits,
+    }
@@ -0,0 +1,191 @@
+# scaffoldor/bundle.py
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+
+from jinja2 import BaseLoader, TemplateNotFound
+
+from . import __version__
+from .exceptions import TemplateConfigError
+from .manifest import hash_source_file
+from .memo import _parse_dependencies
+from .registry import default_templates_dir
+from .scaffold import content_entries, get_environment, make_environment, resolve_template_config
+
+logger = logging.getLogger("scaffoldor")
+
+BUNDLE_MAGIC = b"SCFDBNDL"
+BUNDLE_VERSION = 1
+
+# Magic, format version and length of the JSON header that follows
+_PREAMBLE = struct.Struct("<8sIQ")
+
+# Sources start at a multiple of this offset, so no slice straddles more pages than it needs to
+_ALIGNMENT = 8
+
+# Bytes per read when copying sources into a bundle
+_COPY_CHUNK = 1024 * 1024
+
+
+def bundle_sources(template_config: dict, env, strict: bool = False) -> list[str]:
+    """
+    Returns every file a template needs from ``templates/content``: its
+    content files plus the templates they include, import or extend,
+    followed transitively. Static files are not parsed, and each source is
+    parsed once per process (see :func:`~scaffoldor.memo.analyze_template`).
+
+    A template choosing what to load at render time is logged, or raises
+    :class:`TemplateConfigError` with ``strict``.
+    """
+    sources = []
+    pending = []
+    for _, source, static in content_entries(template_config):
+        if source not in sources:
+            sources.append(source)
+            if not static:
+                pending.append(source)
+    while pending:
+        name = pending.pop()
+        source, _, _ = env.loader.get_source(env, name)
+        for referenced in _parse_dependencies(env, name, source)[2]:
+            if referenced is None and strict:
+                raise TemplateConfigError(f"'{name}' loads a template chosen at render time.")
+            if referenced is None:
+                logger.warning(f"'{name}' loads a template chosen at render time; it may be missing from the bundle.")
+            elif referenced not in sources:
+                sources.append(referenced)
+                pending.append(referenced)
+    return sources
+
+
+def write_bundle(bundle_path: Path, template_name: str, template_config: dict, content_dir: Path, env) -> dict:
+    """
+    Writes a single-file bundle of a template to ``bundle_path``: a fixed
+    preamble, a JSON header holding the flattened config and an offset table
+    (source path to offset, length and SHA-256, relative to the end of the
+    header), then the sources back to back. The file is written next to
+    ``bundle_path`` and renamed into place. Returns the header.
+    """
+    files = {}
+    offset = 0
+    for source in bundle_sources(template_config, env):
+        size = (content_dir / source).stat().st_size
+        files[source] = [offset, size, hash_source_file(content_dir / source)]
+        offset += -(-size // _ALIGNMENT) * _ALIGNMENT
+    header = {"template": template_name, "scaffoldor": __version__, "config": template_config, "files": files}
+    encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    encoded += b" " * (-(_PREAMBLE.size + len(encoded)) % _ALIGNMENT)
+
+    tmp_path = bundle_path.with_name(f".{bundle_path.name}.{os.urandom(4).hex()}.tmp")
+    try:
+        with open(tmp_path, "xb") as out:
+            out.write(_PREAMBLE.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(encoded)))
+            out.write(encoded)
+            for source, (_, size, _) in files.items():
+                with open(content_dir / source, "rb") as f:
+                    while chunk := f.read(_COPY_CHUNK):
+                        out.write(chunk)
+                out.write(b"\0" * (-size % _ALIGNMENT))
+        os.replace(tmp_path, bundle_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return header
+
+
+def pack_template(template_name: str, bundle_path: Path) -> dict:
+    """Bundles an installed template (see :func:`write_bundle`). Raises :class:`ScaffoldError` subclasses and ``OSError``."""
+    template_config = resolve_template_config(template_name)
+    return write_bundle(bundle_path, template_name, template_config, default_templates_dir() / "content", get_environment())
+
+
+class Bundle:
+    """
+    A template bundle mapped into memory. The file is closed as soon as it is
+    mapped, so a bundle costs no open file however many sources it holds,
+    and :meth:`read` returns zero-copy slices of the mapping.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        try:
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise TemplateConfigError(f"Cannot read bundle '{self.path}': {e}") from e
+        self._view = memoryview(self._map)
+        try:
+            magic, version, header_size = _PREAMBLE.unpack_from(self._map)
+            if magic != BUNDLE_MAGIC:
+                raise ValueError("not a scaffoldor bundle")
+            if version != BUNDLE_VERSION:
+                raise ValueError(f"bundle format {version} is not supported; pack the template again")
+            self._data_start = _PREAMBLE.size + header_size
+            header = json.loads(self._view[_PREAMBLE.size:self._data_start].tobytes())
+            if any(offset + size > len(self._map) - self._data_start for offset, size, _ in header["files"].values()):
+                raise ValueError("bundle is truncated")
+        except (struct.error, ValueError, KeyError, TypeError) as e:
+            self.close()
+            raise TemplateConfigError(f"Invalid bundle '{self.path}': {e}") from e
+        self.template_name = header["template"]
+        self.config = header["config"]
+        self.files = header["files"]
+
+    def read(self, name: str) -> memoryview:
+        """Returns the bytes of source ``name`` as a slice of the mapping. Raises ``KeyError``."""
+        offset, size, _ = self.files[name]
+        start = self._data_start + offset
+        return self._view[start:start + size]
+
+    def digest(self, name: str) -> str:
+        """Returns the SHA-256 of source ``name``, recorded when the bundle was packed."""
+        return self.files[name][2]
+
+    def close(self) -> None:
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class BundleLoader(BaseLoader):
+    """
+    Jinja2 loader serving template sources from a :class:`Bundle`. Lookups
+    never touch the file system. Bundles are replaced by renaming a new file
+    over them, so a mapped bundle never changes and compiled templates stay
+    up to date for its lifetime.
+    """
+
+    def __init__(self, bundle: Bundle):
+        self.bundle = bundle
+
+    def get_source(self, environment, template: str):
+        try:
+            data = self.bundle.read(template)
+        except KeyError:
+            raise TemplateNotFound(template) from None
+        return str(data, "utf-8"), f"{self.bundle.path}:{template}", lambda: True
+
+    def list_templates(self) -> list[str]:
+        return sorted(self.bundle.files)
+
+
+def bundle_environment(bundle: Bundle):
+    """Returns a Jinja2 environment configured like the packaged one, loading templates from ``bundle``."""
+    return make_environment(BundleLoader(bundle))
+
+
+def load_bundle(bundle_path: Path) -> Bundle:
+    try:
+        return Bundle(bundle_path)
+    except TemplateConfigError as e:
+        logger.error(str(e))
+        sys.exit(1)
@@ -0,0 +1,374 @@
+# scaffoldor/cache.py
+import atexit
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from . import __version__
+from .copying import copy_tree
+
+logger = logging.getLogger("scaffoldor")
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_OUTPUT_MAX_BYTES = 256 * 1024 * 1024
+
+# Eviction triggered by a write frees space down to this fraction of
+# ``max_bytes``, so a full cache is not scanned again on the very next write
+EVICTION_LOW_WATER = 0.9
+
+# Ways a project may be recreated from the output cache. Hardlinks are not
+# among them: an edit through one would silently change every later hit.
+CACHE_LINK_MODES = ("reflink", "copy")
+
+
+def user_cache_dir() -> Path:
+    """
+    Returns the per-user cache directory for scaffoldor.
+
+    ``$SCAFFOLDOR_CACHE_DIR`` wins when set; otherwise the platform's usual
+    cache location is used (``$XDG_CACHE_HOME`` or ``~/.cache`` on Linux).
+    """
+    override = os.environ.get("SCAFFOLDOR_CACHE_DIR")
+    if override:
+        return Path(override).expanduser()
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "scaffoldor"
+
+
+def cache_enabled() -> bool:
+    """The on-disk caches can be switched off with ``SCAFFOLDOR_NO_CACHE=1``."""
+    return os.environ.get("SCAFFOLDOR_NO_CACHE", "").lower() not in ("1", "true", "yes")
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Writes ``data`` next to ``path`` and renames it into place."""
+    tmp_path = path.with_name(f".{path.name}.{os.urandom(4).hex()}.tmp")
+    # os.open honours the umask, unlike tempfile.mkstemp which always uses 0600
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class DiskCache:
+    """
+    A directory of cache entries with size-bounded LRU eviction and hit/miss
+    counters. Using an entry refreshes its mtime, which is what eviction uses
+    to find the least recently used entries once the directory grows past
+    ``max_bytes``. Counters are kept per process and merged into
+    ``stats.json`` by :meth:`flush_stats`.
+
+    The size of the cache is kept as a running total: the directory is
+    scanned on the first write of a process and whenever the total passes
+    ``max_bytes``, not on every write.
+
+    Each entry is a file ending in ``suffix``; subclasses storing more than
+    that file override :meth:`_entry_size` and :meth:`_remove_entry`.
+    """
+
+    suffix = ".cache"
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        # Unknown until the first scan
+        self._size: Optional[int] = None
+
+    @property
+    def stats_path(self) -> Path:
+        return self.directory / "stats.json"
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] += amount
+
+    def _touch(self, path: Path) -> None:
+        try:
+            os.utime(path)  # Mark as recently used for LRU eviction
+        except OSError:
+            pass
+
+    def _entry_size(self, path: Path, st: os.stat_result) -> int:
+        return st.st_size
+
+    def _remove_entry(self, path: Path) -> None:
+        path.unlink()
+
+    def entries(self) -> list:
+        """Returns ``(path, stat)`` pairs for every cached entry, oldest first."""
+        if not self.directory.is_dir():
+            return []
+        found = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.suffix):
+                try:
+                    found.append((Path(entry.path), entry.stat()))
+                except OSError:
+                    continue
+        return sorted(found, key=lambda item: item[1].st_mtime_ns)
+
+    def evict(self, target: Optional[int] = None) -> int:
+        """Removes least recently used entries until the cache fits ``target`` (default ``max_bytes``)."""
+        if target is None:
+            target = self.max_bytes
+        entries = [(path, self._entry_size(path, st)) for path, st in self.entries()]
+        total = sum(size for _, size in entries)
+        removed = 0
+        for path, size in entries:
+            if total <= target:
+                break
+            try:
+                self._remove_entry(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        with self._lock:
+            self._size = total
+        if removed:
+            self._count("evictions", removed)
+        return removed
+
+    def _record_write(self, size: int) -> None:
+        """Counts a new entry of ``size`` bytes and evicts once the running total passes ``max_bytes``."""
+        with self._lock:
+            self.counters["writes"] += 1
+            if self._size is not None:
+                self._size += size
+            full = self._size is None or self._size > self.max_bytes
+        if full:
+            self.evict(int(self.max_bytes * EVICTION_LOW_WATER))
+
+    def clear(self) -> None:
+        for path, _ in self.entries():
+            self._remove_entry(path)
+        self.stats_path.unlink(missing_ok=True)
+        with self._lock:
+            self.counters = dict.fromkeys(self.counters, 0)
+            self._size = 0
+
+    def _stored_stats(self) -> dict:
+        try:
+            with self.stats_path.open(encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            stored = {}
+        return {name: int(stored.get(name, 0)) for name in self.counters}
+
+    def flush_stats(self) -> None:
+        """Adds this process's counters to the persistent ``stats.json``."""
+        with self._lock:
+            pending = self.counters
+            self.counters = dict.fromkeys(pending, 0)
+        if not any(pending.values()):
+            return
+        stored = self._stored_stats()
+        for name, value in pending.items():
+            stored[name] += value
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            atomic_write(self.stats_path, json.dumps(stored).encode("utf-8"))
+        except OSError as e:
+            logger.debug(f"Could not update cache statistics: {e}")
+
+    def stats(self) -> dict:
+        """Returns the persistent counters together with the current size of the cache."""
+        totals = self._stored_stats()
+        for name, value in self.counters.items():
+            totals[name] += value
+        entries = self.entries()
+        lookups = totals["hits"] + totals["misses"]
+        return {
+            "directory": str(self.directory),
+            "entries": len(entries),
+            "size_bytes": sum(self._entry_size(path, st) for path, st in entries),
+            "max_bytes": self.max_bytes,
+            **totals,
+            "hit_rate": totals["hits"] / lookups if lookups else 0.0,
+        }
+
+
+class CompiledTemplateCache(DiskCache):
+    """
+    Jinja2 bytecode cache stored on disk with size-bounded LRU eviction.
+
+    It implements the interface of ``jinja2.BytecodeCache`` without inheriting
+    from it, so that this module (and the commands that only inspect the
+    cache) can be imported without loading Jinja2.
+
+    Entries are keyed by template name, source checksum and the scaffoldor and
+    Jinja2 versions, so editing a template or upgrading either package never
+    serves stale bytecode.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: Optional[int] = None):
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("SCAFFOLDOR_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        super().__init__(Path(directory) if directory else user_cache_dir() / "bytecode", max_bytes)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}.cache"
+
+    def get_source_checksum(self, source: str) -> str:
+        return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+    def get_bucket(self, environment, name, filename, source):
+        # Only reached while Jinja2 loads a template, so it is already imported
+        import jinja2
+        from jinja2.bccache import Bucket
+
+        checksum = self.get_source_checksum(source)
+        key = f"{__version__}|{jinja2.__version__}|{name}|{filename}|{checksum}"
+        if environment.is_async:
+            # Async environments compile templates to different code
+            key += "|async"
+        key = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        bucket = Bucket(environment, key, checksum)
+        self.load_bytecode(bucket)
+        return bucket
+
+    def set_bucket(self, bucket) -> None:
+        self.dump_bytecode(bucket)
+
+    def load_bytecode(self, bucket) -> None:
+        path = self._entry_path(bucket.key)
+        try:
+            with path.open("rb") as f:
+                bucket.load_bytecode(f)
+        except OSError:
+            pass
+        if bucket.code is None:
+            self._count("misses")
+            return
+        self._count("hits")
+        self._touch(path)
+
+    def dump_bytecode(self, bucket) -> None:
+        data = bucket.bytecode_to_string()
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            atomic_write(self._entry_path(bucket.key), data)
+        except OSError as e:
+            # A cache that cannot be written must never break scaffolding
+            logger.debug(f"Could not write bytecode cache entry: {e}")
+            return
+        self._record_write(len(data))
+
+
+class OutputCache(DiskCache):
+    """
+    Generated projects kept on disk and keyed by everything that determines
+    their bytes (see :meth:`key`), so a project scaffolded again with the
+    same inputs is copied or linked from here instead of being rendered.
+    Only deterministic (seeded) projects may be stored; anything else would
+    replay one run's random values.
+
+    An entry is a read-only copy of the project in ``<key>/`` plus a
+    ``<key>.entry`` file recording its size, whose mtime is used for LRU
+    eviction.
+    """
+
+    suffix = ".entry"
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: Optional[int] = None):
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("SCAFFOLDOR_OUTPUT_CACHE_MAX_BYTES", DEFAULT_OUTPUT_MAX_BYTES))
+        super().__init__(Path(directory) if directory else user_cache_dir() / "outputs", max_bytes)
+
+    @staticmethod
+    def key(inputs: dict) -> str:
+        """Hashes the inputs of a generated project (template contents, variables, seed, ...) into an entry key."""
+        encoded = json.dumps({"scaffoldor": __version__, **inputs}, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _entry_size(self, path: Path, st: os.stat_result) -> int:
+        try:
+            return int(json.loads(path.read_bytes())["bytes"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return 0
+
+    def _remove_entry(self, path: Path) -> None:
+        # The marker goes first, so lookups stop returning the tree before it disappears
+        path.unlink(missing_ok=True)
+        shutil.rmtree(path.with_suffix(""), ignore_errors=True)
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Returns the cached project tree for ``key``, or ``None``; counts a hit or a miss."""
+        entry_path = self.directory / f"{key}{self.suffix}"
+        tree = self.directory / key
+        if entry_path.exists() and tree.is_dir():
+            self._count("hits")
+            self._touch(entry_path)
+            return tree
+        self._count("misses")
+        return None
+
+    def store(self, key: str, source: Path) -> None:
+        """Adds a copy of the project below ``source``. Failures are logged and otherwise ignored."""
+        tree = self.directory / key
+        tmp_tree = self.directory / f".{key}.{os.urandom(4).hex()}.tmp"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_tree.mkdir()
+            copy_tree(source, tmp_tree, "reflink")
+            size = 0
+            for dirpath, _, filenames in os.walk(tmp_tree):
+                for name in filenames:
+                    path = os.path.join(dirpath, name)
+                    size += os.path.getsize(path)
+                    # Cached trees are only ever copied from, never edited
+                    os.chmod(path, 0o444)
+            try:
+                os.rename(tmp_tree, tree)
+            except OSError:
+                # Another process stored the same project first; renames are atomic, so its tree is complete
+                shutil.rmtree(tmp_tree, ignore_errors=True)
+                if not tree.is_dir():
+                    raise
+            atomic_write(self.directory / f"{key}{self.suffix}", json.dumps({"bytes": size}).encode("utf-8"))
+        except OSError as e:
+            shutil.rmtree(tmp_tree, ignore_errors=True)
+            logger.debug(f"Could not store project in the output cache: {e}")
+            return
+        self._record_write(size)
+
+
+@lru_cache(maxsize=None)
+def get_output_cache() -> Optional[OutputCache]:
+    """Returns the process-wide output cache, or ``None`` when caching is disabled."""
+    if not cache_enabled():
+        return None
+    output_cache = OutputCache()
+    atexit.register(output_cache.flush_stats)
+    return output_cache
+
+
+@lru_cache(maxsize=None)
+def get_bytecode_cache() -> Optional[CompiledTemplateCache]:
+    """
+    Returns the process-wide compiled-template cache, or ``None`` when caching
+    is disabled. Its counters are written to disk when the process exits.
+    """
+    if not cache_enabled():
+        return None
+    bytecode_cache = CompiledTemplateCache()
+    atexit.register(bytecode_cache.flush_stats)
+    return bytecode_cache
@@ -2,11 +2,10 @@ import argparse
 import sys
 from pathlib import Path
 import logging
-import json
-import shutil
-import os # <--- ADD THIS LINE
 
-from .scaffold import create_structure, load_template_config, list_templates_available
+# Everything else is imported inside the command that needs it, so that
+# '--version' and 'list-templates' start without loading Jinja2 or the
+# scaffolding machinery (see tests/test_cli.py for the import budget).
 from . import __version__
 
 logger = logging.getLogger("scaffoldor")
@@ -31,6 +30,16 @@ def main():
     parser.add_argument(
         "--version", action="version", version=f"scaffoldor {__version__}"
     )
+    parser.add_argument(
+        "--profile", action="store_true", help="Print a per-phase timing breakdown when the command finishes."
+    )
+    parser.add_argument(
+        "--profile-output", metavar="FILE", help="Write the timing spans to FILE (Chrome trace format by default)."
+    )
+    parser.add_argument(
+        "--profile-format", choices=["chrome", "json"], default="chrome",
+        help="Format of --profile-output: 'chrome' for chrome://tracing or Perfetto, 'json' for a plain span list."
+    )
 
     # Subparsers for different commands
     # Added required=True so that argparse will show an error if no command is given.
@@ -48,6 +57,112 @@ def main():
     scaffold_parser.add_argument(
         "-p", "--path", default=".", help="Parent directory to create the project in (default: current directory)."
     )
+    scaffold_parser.add_argument(
+        "--plan", metavar="PLAN_FILE", help="Create the project from a plan compiled with 'scaffoldor compile' (skips Jinja2)."
+    )
+    scaffold_parser.add_argument(
+        "--bundle", metavar="BUNDLE_FILE", help="Create the project from a template bundle written by 'scaffoldor pack'."
+    )
+    scaffold_parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="Number of files to render and write concurrently (default: 1)."
+    )
+    scaffold_parser.add_argument(
+        "--stream", action="store_true", help="Stream rendered output to disk through a bounded buffer (for very large generated files)."
+    )
+    scaffold_parser.add_argument(
+        "--stream-buffer", type=int, metavar="BYTES",
+        help="Per-file write buffer used with --stream (default: 65536)."
+    )
+    scaffold_parser.add_argument(
+        "--archive", choices=["tar", "tar.gz", "zip"],
+        help="Write the project into an archive instead of a directory, without touching the file system otherwise."
+    )
+    scaffold_parser.add_argument(
+        "-o", "--output", metavar="FILE",
+        help="Archive file to write with --archive, or '-' for stdout (default: <project_name>.<format>)."
+    )
+    scaffold_parser.add_argument(
+        "--no-daemon", action="store_true", help="Scaffold in this process even if a 'scaffoldor serve' daemon is running."
+    )
+    scaffold_parser.add_argument(
+        "--no-fsync", action="store_true", help="Skip flushing the new project to disk before it is moved into place (faster, not crash-safe)."
+    )
+    add_variable_arguments(scaffold_parser)
+    add_seed_argument(scaffold_parser)
+    add_static_link_argument(scaffold_parser)
+
+    # Batch scaffolding command
+    many_parser = subparsers.add_parser(
+        "create-many",
+        help="Create many projects from a manifest in one run.",
+        description="Creates every project listed in a JSON, JSONL or CSV manifest, loading each template only once."
+    )
+    many_parser.add_argument(
+        "manifest", help="Path to the manifest file (.json, .jsonl or .csv)."
+    )
+    many_parser.add_argument(
+        "-p", "--path", default=".", help="Base directory that manifest paths are relative to (default: current directory)."
+    )
+    many_parser.add_argument(
+        "-t", "--template", default="default", help="Template for entries that do not name one (default: 'default')."
+    )
+    many_parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="Number of files per project to render and write concurrently (default: 1)."
+    )
+    many_parser.add_argument(
+        "--stream", action="store_true", help="Stream rendered output to disk through a bounded buffer (for very large generated files)."
+    )
+    many_parser.add_argument(
+        "--stream-buffer", type=int, metavar="BYTES",
+        help="Per-file write buffer used with --stream (default: 65536)."
+    )
+    many_parser.add_argument(
+        "--no-fsync", action="store_true", help="Skip flushing the new project to disk before it is moved into place (faster, not crash-safe)."
+    )
+    add_variable_arguments(many_parser)
+    add_seed_argument(many_parser)
+    add_static_link_argument(many_parser)
+
+    # Update command
+    update_parser = subparsers.add_parser(
+        "update",
+        help="Update an existing project to the current version of its template.",
+        description="Re-renders only the files whose template or variables changed and never overwrites files you edited."
+    )
+    update_parser.add_argument(
+        "project_path", nargs="?", default=".", help="Project directory to update (default: current directory)."
+    )
+    update_parser.add_argument(
+        "--force", action="store_true", help="Overwrite files even if they were modified since they were generated."
+    )
+    add_variable_arguments(update_parser)
+
+    # Compile a template into a plan
+    compile_parser = subparsers.add_parser(
+        "compile",
+        help="Compile a template into a plan that can be executed without Jinja2.",
+        description="Writes a self-contained plan (directories plus precompiled file contents) for fast 'create --plan' runs."
+    )
+    compile_parser.add_argument(
+        "template_name", help="Name of the template to compile."
+    )
+    compile_parser.add_argument(
+        "-o", "--output", help="Path of the plan file to write (default: <template_name>.plan.json)."
+    )
+
+    # Pack a template into a single-file bundle
+    pack_parser = subparsers.add_parser(
+        "pack",
+        help="Pack a template into a single bundle file.",
+        description="Writes one indexed file holding a template's flattened config and every source it needs, "
+                    "for 'create --bundle' or for shipping the template as one artifact."
+    )
+    pack_parser.add_argument(
+        "template_name", help="Name of the template to pack."
+    )
+    pack_parser.add_argument(
+        "-o", "--output", help="Path of the bundle file to write (default: <template_name>.scfd)."
+    )
 
     # Init template command
     init_parser = subparsers.add_parser(
@@ -58,6 +173,41 @@ def main():
     init_parser.add_argument(
         "template_name", help="Name of the new template to initialize."
     )
+    init_parser.add_argument(
+        "--copy", action="store_true",
+        help="Copy the default template's content files for editing instead of referencing them."
+    )
+
+    # Scaffold daemon
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run a daemon that keeps templates warm and serves create requests.",
+        description="Keeps template configs and compiled templates in memory so 'create' can delegate to it and finish in milliseconds."
+    )
+    serve_parser.add_argument(
+        "--socket", metavar="PATH", help="Unix socket to listen on (default: server.sock in the user cache directory)."
+    )
+    serve_parser.add_argument(
+        "--port", type=int, help="Listen on 127.0.0.1:PORT over HTTP instead of a Unix socket."
+    )
+    serve_parser.add_argument(
+        "--root", action="append", metavar="DIR",
+        help="Only create projects below DIR (repeatable; default: your home directory)."
+    )
+    serve_parser.add_argument(
+        "--poll", type=float, default=1.0, metavar="SECONDS", help="How often to check the templates for changes (default: 1.0)."
+    )
+    serve_parser.add_argument(
+        "--status", action="store_true", help="Report whether a daemon is running instead of starting one."
+    )
+
+    # Template store maintenance
+    subparsers.add_parser(
+        "compact",
+        aliases=["gc"],
+        help="Deduplicate template content and remove unreferenced files.",
+        description="Collapses identical template content files onto one shared copy and deletes files no template references."
+    )
 
     # List templates command
     list_parser = subparsers.add_parser(
@@ -65,6 +215,19 @@ def main():
         help="List all available project templates.",
         description="Shows a list of all templates Scaffoldor can use to create new projects."
     )
+    list_parser.add_argument(
+        "-k", "--keyword", help="Only list templates tagged with this keyword."
+    )
+
+    # Compiled-template cache maintenance
+    cache_parser = subparsers.add_parser(
+        "cache",
+        help="Inspect or clear the compiled-template and output caches.",
+        description="Shows hit/miss statistics for the on-disk compiled-template and output caches, or empties them."
+    )
+    cache_parser.add_argument(
+        "action", choices=["stats", "clear"], help="'stats' prints cache statistics, 'clear' removes all entries."
+    )
 
     args = parser.parse_args()
 
@@ -77,17 +240,185 @@ def main():
     #     parser.print_help()
     #     sys.exit(1)
 
+    if args.profile or args.profile_output:
+        run_profiled(args)
+    else:
+        run_command(args)
+
+
+def add_variable_arguments(parser) -> None:
+    parser.add_argument(
+        "--var", action="append", default=[], metavar="NAME=VALUE",
+        help="Set a template variable (repeatable; converted to the type the template declares)."
+    )
+    parser.add_argument(
+        "--vars-file", metavar="FILE", help="JSON file with template variable values (--var takes precedence)."
+    )
+
+
+def add_seed_argument(parser) -> None:
+    parser.add_argument(
+        "--seed", metavar="SEED",
+        help="Deterministic mode: seed template randomness and normalize line endings and file modes, "
+             "so the same inputs give a byte-identical project."
+    )
+    parser.add_argument(
+        "--cache-link", choices=["reflink", "copy"], default="reflink",
+        help="How seeded projects are recreated from the output cache (default: reflink, falling back to copy)."
+    )
+    parser.add_argument(
+        "--no-output-cache", action="store_true", help="Always render seeded projects instead of reusing cached output."
+    )
+
+
+def add_static_link_argument(parser) -> None:
+    parser.add_argument(
+        "--static-link", choices=["hardlink", "reflink", "copy"], default="reflink",
+        help="How static template files (images, fonts, ...) are created in the project (default: reflink, "
+             "falling back to a kernel copy). Hardlinked files share their inode with the installed template."
+    )
+
+
+def parse_variables(args) -> dict:
+    """Collects template variable values from --vars-file and --var."""
+    from .variables import load_vars_file, parse_assignments
+
+    values = {}
+    try:
+        if args.vars_file:
+            values.update(load_vars_file(Path(args.vars_file)))
+        values.update(parse_assignments(args.var))
+    except (OSError, ValueError) as e:
+        logger.error(f"Invalid template variables: {e}")
+        sys.exit(1)
+    return values
+
+
+def run_profiled(args):
+    """Runs the command with a profiler attached and reports the spans it collected, even if the command fails."""
+    from .profiling import Profiler
+
+    with Profiler() as profiler:
+        try:
+            run_command(args)
+        finally:
+            if args.profile:
+                logger.info(f"\n{profiler.table()}")
+            if args.profile_output:
+                profiler.write(Path(args.profile_output), args.profile_format)
+                logger.info(f"Wrote profile to {args.profile_output}")
+
+
+def run_command(args):
     if args.command == "create":
+        from .scaffold import STREAM_BUFFER_BYTES, create_structure
+
         base_path = Path(args.path).resolve()
         project_path = base_path / args.project_name
+        variables = parse_variables(args)
+
+        if args.plan and args.bundle:
+            logger.error("--plan cannot be combined with --bundle.")
+            sys.exit(1)
+        if args.archive and not args.dry_run:
+            if args.plan:
+                logger.error("--archive cannot be combined with --plan.")
+                sys.exit(1)
+            create_archive(args, project_path, variables)
+            return
+
+        # Options the daemon cannot honour; profiles cover this process only
+        local_only = (args.plan or args.bundle or args.dry_run or args.stream or args.archive or args.no_daemon
+                      or args.static_link != "reflink" or args.profile or args.profile_output)
+        if not local_only and delegate_create(args, project_path, variables):
+            return
+
+        plan = None
+        if args.plan:
+            from .plan import load_plan
+
+            plan = load_plan(Path(args.plan))
 
         create_structure(
             project_path=project_path,
-            template_name=getattr(args, 'template', 'default'), # Safely get template, defaults to 'default' if not present for some reason
+            **template_options(args),
             dry_run=args.dry_run, # Global dry_run
             verbose=args.verbose, # Global verbose
+            jobs=args.jobs,
+            stream=args.stream,
+            stream_buffer=args.stream_buffer or STREAM_BUFFER_BYTES,
+            plan=plan,
+            durable=not args.no_fsync,
+            context=variables,
+            seed=args.seed,
+            output_cache=not args.no_output_cache,
+            cache_link=args.cache_link,
+            static_link=args.static_link,
+        )
+    elif args.command == "create-many":
+        from .batch import create_many, load_manifest
+        from .scaffold import STREAM_BUFFER_BYTES
+
+        entries = load_manifest(Path(args.manifest))
+        summary = create_many(
+            entries,
+            base_path=Path(args.path).resolve(),
+            template_name=args.template,
+            dry_run=args.dry_run,
+            verbose=args.verbose,
+            jobs=args.jobs,
+            stream=args.stream,
+            stream_buffer=args.stream_buffer or STREAM_BUFFER_BYTES,
+            durable=not args.no_fsync,
+            variables=parse_variables(args),
+            seed=args.seed,
+            output_cache=not args.no_output_cache,
+            cache_link=args.cache_link,
+            static_link=args.static_link,
+        )
+        if summary["failed"]:
+            sys.exit(1)
+    elif args.command == "update":
+        from .update import update_project
+
+        update_project(
+            Path(args.project_path).resolve(),
+            dry_run=args.dry_run,
+            verbose=args.verbose,
+            force=args.force,
+            context=parse_variables(args),
+        )
+    elif args.command == "compile":
+        from .plan import compile_plan, save_plan
+
+        plan = compile_plan(args.template_name)
+        plan_path = Path(args.output or f"{args.template_name}.plan.json")
+        save_plan(plan, plan_path)
+        fallback = sum(1 for entry in plan["files"] if "jinja_source" in entry)
+        logger.info(
+            f"Compiled template '{args.template_name}' to {plan_path}: {len(plan['directories'])} directories, "
+            f"{len(plan['files'])} files ({fallback} still rendered with Jinja2)."
+        )
+    elif args.command == "pack":
+        from .bundle import pack_template
+        from .exceptions import ScaffoldError
+
+        bundle_path = Path(args.output or f"{args.template_name}.scfd")
+        try:
+            header = pack_template(args.template_name, bundle_path)
+        except (ScaffoldError, OSError) as e:
+            logger.error(f"Failed to pack template '{args.template_name}': {e}")
+            sys.exit(1)
+        logger.info(
+            f"Packed template '{args.template_name}' into {bundle_path}: {len(header['files'])} sources, "
+            f"{bundle_path.stat().st_size} bytes."
         )
     elif args.command == "init":
+        import json
+        import shutil
+
+        from .registry import content_source, with_content_source
+
         templates_dir = Path(__file__).parent / "templates"
         new_template_json_path = templates_dir / f"{args.template_name}.json"
         new_template_content_dir = templates_dir / "content" / f"{args.template_name}_example"
@@ -107,19 +438,22 @@ def main():
             with default_template_path.open('r', encoding='utf-8') as f: # Added encoding
                 default_config = json.load(f)
 
-            new_content_files = {}
-            default_content_base = templates_dir / "content"
+            default_content_dir = templates_dir / "content"
+            base_content_files = default_config.get("content_files", {})
 
-            for filename, relative_path_in_default_content in default_config.get("content_files", {}).items():
-                # Correctly map the new template's content files
-                # Extract the base filename and the directory structure under templates/content/
-                # e.g., "backend/requirements.txt.jinja" -> Path("backend/requirements.txt.jinja")
-                # .relative_to(Path("")) will not change it if it's already relative
-                # Then prepend the new template's content directory name
-                new_content_files[filename] = str(Path(new_template_content_dir.name) / Path(relative_path_in_default_content))
+            # Structure, content files and everything else are inherited from the default
+            # template; only the entries listed here override it.
+            new_content_files = {}
+            if args.copy:
+                # Editable copies of the files the base template uses, under the new template's directory
+                new_content_files = {
+                    filename: with_content_source(entry, (Path(new_template_content_dir.name) / content_source(entry)).as_posix())
+                    for filename, entry in base_content_files.items()
+                }
 
 
             new_config = {
+                "extends": "default",
                 "name": f"{args.template_name}-template", # Provide a default name
                 "description": f"A custom template for {args.template_name}",
                 "author": default_config.get("author", "Your Name"),
@@ -127,17 +461,15 @@ def main():
                 "license": default_config.get("license", "MIT"),
                 "keywords": default_config.get("keywords", []) + [args.template_name],
 
-                "structure": default_config.get("structure", {}),
+                "structure": {},
                 "content_files": new_content_files,
-                "dependencies": default_config.get("dependencies", {}),
-                "dev_dependencies": default_config.get("dev_dependencies", {}),
-                "scripts": default_config.get("scripts", {}),
                 "post_creation_messages": [
                     "",
                     f"🎉 New template '{args.template_name}' initialized successfully!",
                     "",
-                    f"You can now customize the structure in '{new_template_json_path.name}'",
-                    f"and add/modify content files in the '{new_template_content_dir.name}' directory.",
+                    "It extends the default template: add 'structure' or 'content_files' entries",
+                    f"in '{new_template_json_path.name}' to override it (a null value removes an entry),",
+                    f"and put your own content files in the '{new_template_content_dir.name}' directory.",
                     "",
                     "Remember to re-install your 'scaffoldor' package (e.g., `pip install -e .`)",
                     "to make your new template available for use."
@@ -149,29 +481,17 @@ def main():
             logger.info(f"Created template configuration: {new_template_json_path}")
 
             new_template_content_dir.mkdir(parents=True, exist_ok=True)
-            
-            default_content_dir = templates_dir / "content"
 
-            # Use shutil.copytree for a simpler and more robust copy of the entire content directory
-            # It handles subdirectories automatically
-            # However, we only want .jinja files. os.walk is still better for filtering.
-            
-            # If the target directory already exists and is not empty, shutil.copytree will fail.
-            # We already created it with mkdir(exist_ok=True)
-            # So, we need to iterate with os.walk and copy file by file.
-
-            for root, dirs, files in os.walk(default_content_dir):
-                # Calculate the relative path from default_content_dir
-                relative_path = Path(root).relative_to(default_content_dir)
-                target_dir = new_template_content_dir / relative_path
-                target_dir.mkdir(parents=True, exist_ok=True) # Ensure target subdirectories exist
-
-                for file in files:
-                    if file.endswith(".jinja"): # Only copy Jinja templates
-                        src_file = Path(root) / file
-                        dst_file = target_dir / file
-                        shutil.copy(src_file, dst_file)
-                        logger.info(f"Copied example content file: {dst_file}")
+            if args.copy:
+                # Copy only the files the base template references. Walking the whole
+                # content directory would also copy every other template's
+                # '*_example' directory, nesting them deeper with each new template.
+                for relative_path_in_default_content in map(content_source, base_content_files.values()):
+                    src_file = default_content_dir / relative_path_in_default_content
+                    dst_file = new_template_content_dir / relative_path_in_default_content
+                    dst_file.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copy(src_file, dst_file)
+                    logger.info(f"Copied example content file: {dst_file}")
 
             # Consolidated and moved post_creation_messages into new_config
             # logger.info(f"\n🎉 Template '{args.template_name}' initialized successfully!")
@@ -192,11 +512,152 @@ def main():
                 shutil.rmtree(new_template_content_dir)
             sys.exit(1)
 
+    elif args.command == "serve":
+        from .client import default_server_address, server_status
+
+        address = f"http://127.0.0.1:{args.port}" if args.port is not None else (
+            f"unix:{args.socket}" if args.socket else default_server_address()
+        )
+        if args.status:
+            status = server_status(address)
+            if status is None:
+                logger.info(f"No scaffoldor server is running at {address}.")
+                sys.exit(1)
+            logger.info(f"scaffoldor {status['version']} server (pid {status['pid']}) at {address}: "
+                        f"{status['templates']} templates, {status['cached_configs']} cached configs")
+            return
+        if args.port is None and not (address and address.startswith("unix:")):
+            logger.error("Unix sockets are not available on this platform; use --port.")
+            sys.exit(1)
+
+        from .exceptions import ScaffoldError
+        from .server import serve
+
+        try:
+            serve(
+                socket_path=Path(address[len("unix:"):]) if args.port is None else None,
+                port=args.port,
+                poll_interval=args.poll,
+                roots=[Path(root) for root in args.root] if args.root else None,
+            )
+        except (ScaffoldError, OSError) as e:
+            logger.error(f"Could not start the server: {e}")
+            sys.exit(1)
+
+    elif args.command in ("compact", "gc"):
+        from .store import compact_templates
+
+        compact_templates(dry_run=args.dry_run)
+
+    elif args.command == "cache":
+        from .cache import CompiledTemplateCache, OutputCache
+
+        caches = {"Compiled-template cache": CompiledTemplateCache(), "Output cache": OutputCache()}
+        for title, disk_cache in caches.items():
+            if args.action == "clear":
+                disk_cache.clear()
+                logger.info(f"Cleared {title[0].lower() + title[1:]} at {disk_cache.directory}")
+                continue
+            stats = disk_cache.stats()
+            logger.info(f"{title}:")
+            logger.info(f"  Directory:     {stats['directory']}")
+            logger.info(f"  Entries:       {stats['entries']}")
+            logger.info(f"  Size:          {stats['size_bytes']} / {stats['max_bytes']} bytes")
+            logger.info(f"  Hits:          {stats['hits']}")
+            logger.info(f"  Misses:        {stats['misses']}")
+            logger.info(f"  Evictions:     {stats['evictions']}")
+            logger.info(f"  Hit rate:      {stats['hit_rate']:.1%}")
+
     elif args.command == "list-templates":
-        templates = list_templates_available()
+        from .registry import get_registry
+
+        registry = get_registry()
+        templates = registry.names(args.keyword)
         if templates:
             logger.info("\nAvailable templates:")
             for tpl in templates:
-                logger.info(f"- {tpl}")
+                description = registry.entries[tpl].get("description")
+                logger.info(f"- {tpl}: {description}" if description else f"- {tpl}")
         else:
-            logger.info("No templates found.")
\ No newline at end of file
+            logger.info("No templates found.")
+
+
+def template_options(args) -> dict:
+    """Returns the template arguments of create_structure: a template name, or everything --bundle provides."""
+    if not getattr(args, "bundle", None):
+        return {"template_name": getattr(args, 'template', 'default')} # Safely get template, defaults to 'default' if not present for some reason
+    from .bundle import bundle_environment, load_bundle
+
+    # Mapped for the rest of the process; the loader reads sources straight from the mapping
+    bundle = load_bundle(Path(args.bundle))
+    return {"template_name": bundle.template_name, "template_config": bundle.config, "env": bundle_environment(bundle)}
+
+
+def create_archive(args, project_path: Path, variables: dict) -> None:
+    """Streams the project straight into a tar or zip archive written to a file or stdout."""
+    from .backends import archive_backend
+    from .reproducible import source_date_epoch
+    from .scaffold import STREAM_BUFFER_BYTES, create_structure
+
+    output = args.output or f"{args.project_name}.{args.archive}"
+    if output == "-":
+        # The archive owns stdout, so log messages go to stderr
+        handler.setStream(sys.stderr)
+        fileobj = sys.stdout.buffer
+    else:
+        fileobj = open(output, "wb")
+    try:
+        mtime = source_date_epoch() if args.seed is not None else None
+        with archive_backend(args.archive, fileobj, prefix=project_path.name, mtime=mtime) as backend:
+            create_structure(
+                project_path=project_path,
+                **template_options(args),
+                verbose=args.verbose,
+                jobs=args.jobs,
+                stream=args.stream,
+                stream_buffer=args.stream_buffer or STREAM_BUFFER_BYTES,
+                backend=backend,
+                context=variables,
+                seed=args.seed,
+            )
+    except SystemExit:
+        if output != "-":
+            fileobj.close()
+            Path(output).unlink(missing_ok=True)
+        raise
+    if output == "-":
+        fileobj.flush()
+    else:
+        fileobj.close()
+        logger.info(f"Wrote {args.archive} archive {output}")
+
+
+def delegate_create(args, project_path: Path, variables: dict) -> bool:
+    """Hands 'create' to a running daemon. Returns False, so the caller scaffolds locally, if none answers."""
+    from .client import ServerError, ServerUnavailable, server_create
+
+    try:
+        result = server_create(
+            project_path, getattr(args, 'template', 'default'), variables, jobs=args.jobs, seed=args.seed,
+            durable=not args.no_fsync, output_cache=not args.no_output_cache, cache_link=args.cache_link,
+        )
+    except ServerUnavailable:
+        return False
+    except OSError as e:
+        # The daemon may have received the request, so creating the project here too could race with it
+        logger.error(f"Lost the connection to the scaffoldor server: {e}. It may still create '{project_path}'.")
+        sys.exit(1)
+    except ServerError as e:
+        if e.error_type == "Forbidden":
+            # The daemon may not write there, and wrote nothing
+            logger.debug(f"The scaffoldor server declined the project: {e}")
+            return False
+        logger.error(str(e))
+        sys.exit(1)
+    logger.info(f"Created project at {result['project_path']} via the scaffoldor server in {result['elapsed_ms']:.1f} ms")
+    logger.info(f"\n🎉 Project '{project_path.name}' scaffolded successfully!")
+    return True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# scaffoldor/client.py
+import http.client
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Optional
+
+from .cache import user_cache_dir
+
+# Seconds to wait for a running daemon; scaffolding itself is expected to take milliseconds
+DEFAULT_TIMEOUT = 30.0
+
+
+class ServerUnavailable(ConnectionError):
+    """No daemon is listening, so the request was never sent and the caller may do the work itself."""
+
+
+class ServerError(Exception):
+    """The daemon received the request but could not carry it out."""
+
+    def __init__(self, message: str, error_type: str = "ScaffoldError"):
+        self.error_type = error_type
+        super().__init__(message)
+
+
+def default_server_address() -> Optional[str]:
+    """
+    Returns the address of the scaffold daemon: ``$SCAFFOLDOR_SERVER`` when set
+    (``unix:/path/to.sock`` or ``http://127.0.0.1:PORT``), otherwise a Unix
+    socket in the user cache directory. ``None`` where Unix sockets are unavailable.
+    """
+    override = os.environ.get("SCAFFOLDOR_SERVER")
+    if override:
+        return override
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    return f"unix:{user_cache_dir() / 'server.sock'}"
+
+
+def server_token_path(port: int) -> Path:
+    """The owner-only file in which a daemon listening on ``port`` stores the token TCP clients must send."""
+    return user_cache_dir() / f"server-{port}.token"
+
+
+def _server_token(address: str) -> Optional[str]:
+    """Returns the token for a TCP daemon: ``$SCAFFOLDOR_SERVER_TOKEN``, or the one it wrote for its port."""
+    token = os.environ.get("SCAFFOLDOR_SERVER_TOKEN")
+    if token:
+        return token
+    port = address.split("://", 1)[-1].rstrip("/").rpartition(":")[2]
+    if not port.isdigit():
+        return None
+    try:
+        return server_token_path(int(port)).read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def _connect(address: str, timeout: float) -> http.client.HTTPConnection:
+    if address.startswith("unix:"):
+        return _UnixHTTPConnection(address[len("unix:"):], timeout)
+    host_port = address.split("://", 1)[-1].rstrip("/")
+    return http.client.HTTPConnection(host_port, timeout=timeout)
+
+
+def request(method: str, path: str, payload: Optional[dict] = None, address: Optional[str] = None,
+            timeout: float = DEFAULT_TIMEOUT) -> tuple[str, bytes]:
+    """
+    Sends one request to the daemon and returns ``(content_type, body)``.
+
+    Raises :class:`ServerUnavailable` when no daemon is listening, ``OSError``
+    when the connection fails after the request may have been received (a
+    timeout, a reset) and :class:`ServerError` when the daemon reports a failure.
+    """
+    address = address or default_server_address()
+    if address is None:
+        raise ServerUnavailable("no scaffold server address is available on this platform")
+    if address.startswith("unix:") and not Path(address[len("unix:"):]).exists():
+        # Fail fast without a connection attempt; this is the common case for 'create'
+        raise ServerUnavailable(f"no scaffold server socket at {address[len('unix:'):]}")
+
+    headers = {"Content-Type": "application/json"}
+    if not address.startswith("unix:"):
+        token = _server_token(address)
+        if token is not None:
+            headers["Authorization"] = f"Bearer {token}"
+    connection = _connect(address, timeout)
+    try:
+        try:
+            connection.connect()
+        except (ConnectionRefusedError, FileNotFoundError) as e:
+            raise ServerUnavailable(f"no scaffold server is listening at {address}: {e}") from e
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        content_type = response.getheader("Content-Type", "")
+        data = response.read()
+    finally:
+        connection.close()
+
+    if response.status >= 400:
+        try:
+            error = json.loads(data)
+        except ValueError:
+            error = {"error": data.decode("utf-8", "replace")}
+        raise ServerError(error.get("error", f"HTTP {response.status}"), error.get("type", "ScaffoldError"))
+    return content_type, data
+
+
+def server_create(project_path: Path, template_name: str = "default", context: Optional[dict] = None,
+                  jobs: int = 1, address: Optional[str] = None, seed: Optional[str] = None, durable: bool = True,
+                  output_cache: bool = True, cache_link: str = "reflink") -> dict:
+    """Asks the daemon to create a project at ``project_path`` and returns its summary."""
+    payload = {
+        "project_path": str(project_path), "template": template_name, "variables": context or {}, "jobs": jobs,
+        "durable": durable, "output_cache": output_cache, "cache_link": cache_link,
+    }
+    if seed is not None:
+        payload["seed"] = seed
+    _, data = request("POST", "/create", payload, address=address)
+    return json.loads(data)
+
+
+def server_status(address: Optional[str] = None, timeout: float = 1.0) -> Optional[dict]:
+    """Returns the daemon's health information, or ``None`` if no daemon is reachable."""
+    try:
+        _, data = request("GET", "/health", address=address, timeout=timeout)
+    except (OSError, ServerError):
+        return None
+    return json.loads(data)
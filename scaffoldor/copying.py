@@ -0,0 +1,121 @@
+# scaffoldor/copying.py
+import errno
+import os
+import shutil
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+# Ways to create a file from an existing one, cheapest first
+LINK_MODES = ("hardlink", "reflink", "copy")
+
+# Bytes moved per copy_file_range/sendfile call; the kernel may move fewer
+KERNEL_COPY_CHUNK = 64 * 1024 * 1024
+
+# ioctl request cloning a whole file on Linux file systems with copy-on-write (btrfs, XFS, ...); from linux/fs.h
+FICLONE = 0x40049409
+
+
+def reflink(src: Path, dst: Path) -> None:
+    """Makes ``dst`` a copy-on-write clone of ``src`` sharing its blocks. Raises ``OSError`` where unsupported."""
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "reflinks are only supported on Linux")
+    import fcntl
+
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+
+
+def _kernel_copy(source_fd: int, target_fd: int) -> bool:
+    """
+    Copies an open file into another without its bytes entering user space:
+    ``copy_file_range``, else ``sendfile``. Returns False, having copied
+    nothing, when neither works for these files (old kernels, some file systems).
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            while os.copy_file_range(source_fd, target_fd, KERNEL_COPY_CHUNK):
+                pass
+            return True
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF):
+                raise
+            # Start over from scratch with the next method
+            os.lseek(source_fd, 0, os.SEEK_SET)
+            os.lseek(target_fd, 0, os.SEEK_SET)
+            os.ftruncate(target_fd, 0)
+    offset = 0
+    try:
+        while True:
+            sent = os.sendfile(target_fd, source_fd, offset, KERNEL_COPY_CHUNK)
+            if not sent:
+                return True
+            offset += sent
+    except OSError as e:
+        if e.errno not in (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP) or offset:
+            raise
+        return False
+
+
+def copy_bytes(src: Path, dst: Path) -> None:
+    """
+    Copies the contents of ``src`` into a new file ``dst`` (created like
+    ``open(dst, "wb")``, so the umask applies). On Linux the copy happens in
+    the kernel with ``copy_file_range`` or ``sendfile``; elsewhere, and when
+    neither applies, ``shutil`` copies it.
+    """
+    if not sys.platform.startswith("linux"):
+        shutil.copyfile(src, dst)
+        return
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        if not _kernel_copy(source.fileno(), target.fileno()):
+            shutil.copyfileobj(source, target)
+
+
+def copy_file(src: Path, dst: Path, mode: str = "copy") -> str:
+    """
+    Creates ``dst`` from ``src`` by hardlinking, reflinking or copying.
+    Falls back to a plain copy (in the kernel where possible, see
+    :func:`copy_bytes`) when the requested mode is not possible, e.g. across
+    file systems. Returns the mode that was used.
+    """
+    if mode == "hardlink":
+        try:
+            os.link(src, dst)
+            return "hardlink"
+        except OSError:
+            pass
+    if mode == "reflink":
+        try:
+            reflink(src, dst)
+            return "reflink"
+        except OSError:
+            pass
+    copy_bytes(src, dst)
+    return "copy"
+
+
+def copy_tree(src: Path, dst: Path, mode: str = "copy", file_mode: Optional[int] = None,
+              dir_mode: Optional[int] = None) -> Counter:
+    """
+    Recreates the tree below ``src`` inside the existing directory ``dst``
+    with :func:`copy_file`. Copies get ``file_mode`` and directories
+    ``dir_mode`` when given; hardlinks keep the mode of the inode they share.
+    Returns how many files were created with each mode.
+    """
+    used = Counter()
+    for dirpath, dirnames, filenames in os.walk(src):
+        relative = Path(dirpath).relative_to(src)
+        for dirname in dirnames:
+            target = dst / relative / dirname
+            target.mkdir(exist_ok=True)
+            if dir_mode is not None:
+                os.chmod(target, dir_mode)
+        for filename in filenames:
+            target = dst / relative / filename
+            how = copy_file(Path(dirpath) / filename, target, mode)
+            if how != "hardlink" and file_mode is not None:
+                os.chmod(target, file_mode)
+            used[how] += 1
+    return used
@@ -0,0 +1,239 @@
+# scaffoldor/discovery.py
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from .cache import atomic_write, cache_enabled, user_cache_dir
+from .tree import _path_parts
+
+logger = logging.getLogger("scaffoldor")
+
+MANIFEST_VERSION = 1
+
+# Keys of a content_roots rule
+CONTENT_ROOT_KEYS = {"root", "include", "exclude", "output", "strip_suffix", "static"}
+
+# Directories modified this recently may still change within the same mtime tick,
+# so a walk that saw one is not trusted on the next lookup
+RACY_WINDOW_NS = 2_000_000_000
+
+
+@lru_cache(maxsize=None)
+def glob_regex(pattern: str) -> re.Pattern:
+    """
+    Compiles a ``/``-separated glob: ``*`` and ``?`` stay within one path
+    segment, ``**`` matches any number of segments (``**/*.jinja`` includes
+    files at the top level) and ``[...]`` is a character class.
+    """
+    regex = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            regex.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            regex.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            regex.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end]
+            body = body.replace("\\", "\\\\")
+            regex.append(f"[^{body[1:]}]" if body.startswith("!") else f"[{body}]")
+            i = end + 1
+        else:
+            regex.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(regex) + r"\Z")
+
+
+def _patterns(rule: dict, key: str, default: list) -> list:
+    patterns = rule.get(key, default)
+    return [patterns] if isinstance(patterns, str) else patterns
+
+
+def _directory(path: str) -> str:
+    """Normalizes a rule's directory path; ``""`` and ``"."`` stand for the top level."""
+    return "" if path in ("", ".") else "/".join(_path_parts(path))
+
+
+def validate_content_roots(rules) -> None:
+    """Raises ``ValueError`` if a template's ``content_roots`` are malformed."""
+    if not isinstance(rules, list):
+        raise ValueError("'content_roots' must be a list of rules.")
+    for rule in rules:
+        if not isinstance(rule, dict) or not isinstance(rule.get("root"), str):
+            raise ValueError(f"Content root {rule!r} must be an object with a 'root' directory.")
+        unknown = set(rule) - CONTENT_ROOT_KEYS
+        if unknown:
+            raise ValueError(f"Content root '{rule['root']}' has unknown keys: {', '.join(sorted(unknown))}.")
+        _directory(rule["root"])
+        if not isinstance(rule.get("output", ""), str) or not isinstance(rule.get("strip_suffix", ""), str):
+            raise ValueError(f"Content root '{rule['root']}' needs 'output' and 'strip_suffix' to be strings.")
+        _directory(rule.get("output", ""))
+        for key in ("include", "exclude"):
+            patterns = _patterns(rule, key, [])
+            if not isinstance(patterns, list) or not all(isinstance(pattern, str) for pattern in patterns):
+                raise ValueError(f"'{key}' of content root '{rule['root']}' must be a glob or a list of globs.")
+
+
+def walk_content_root(content_dir: Path, rule: dict) -> tuple[dict, dict]:
+    """
+    Expands one ``content_roots`` rule against the files below ``content_dir``.
+
+    Every file under ``root`` matching an ``include`` glob (default ``**/*``)
+    and no ``exclude`` glob becomes a ``content_files`` entry. Its output path
+    is its path relative to ``root`` below ``output`` (default: ``root``),
+    minus ``strip_suffix`` (default ``.jinja``). With ``static`` set, entries
+    are objects carrying it.
+
+    Returns the entries, output path to entry, and the mtime of every
+    directory walked, which changes whenever a file is added, removed or renamed.
+    """
+    root = _directory(rule["root"])
+    output = _directory(rule.get("output", root))
+    include = [glob_regex(pattern) for pattern in _patterns(rule, "include", ["**/*"])]
+    exclude = [glob_regex(pattern) for pattern in _patterns(rule, "exclude", [])]
+    suffix = rule.get("strip_suffix", ".jinja")
+
+    top = content_dir / root if root else content_dir
+    if not top.is_dir():
+        raise ValueError(f"Content root '{rule['root']}' is not a directory below '{content_dir}'.")
+    files = {}
+    directories = {}
+    pending = [""]
+    while pending:
+        relative_dir = pending.pop()
+        path = top / relative_dir if relative_dir else top
+        directories[relative_dir] = path.stat().st_mtime_ns
+        with os.scandir(path) as scan:
+            for dir_entry in scan:
+                relative = f"{relative_dir}/{dir_entry.name}" if relative_dir else dir_entry.name
+                if dir_entry.is_dir():
+                    pending.append(relative)
+                elif (any(regex.match(relative) for regex in include)
+                      and not any(regex.match(relative) for regex in exclude)):
+                    target = relative[: -len(suffix)] if suffix and relative.endswith(suffix) else relative
+                    source = f"{root}/{relative}" if root else relative
+                    entry = {"source": source, "static": bool(rule["static"])} if "static" in rule else source
+                    files[f"{output}/{target}" if output else target] = entry
+    return dict(sorted(files.items())), directories
+
+
+class ContentManifest:
+    """
+    Cache of ``content_roots`` expansions for one content directory.
+
+    Each rule is walked once and its entries are stored, together with the
+    mtime of every directory walked, in a JSON manifest under the user cache
+    directory. Later lookups only stat those directories and walk the rule
+    again when one of them changed, so large templates neither list every
+    file by hand nor re-walk their tree on every run. Edits to a file's
+    contents do not change the expansion and need no walk.
+    """
+
+    def __init__(self, content_dir: Path, manifest_path: Optional[Path] = None):
+        self.content_dir = Path(content_dir)
+        if manifest_path is None and cache_enabled():
+            digest = hashlib.sha1(str(self.content_dir.resolve()).encode("utf-8")).hexdigest()[:16]
+            manifest_path = user_cache_dir() / "content" / f"{digest}.json"
+        self.manifest_path = Path(manifest_path) if manifest_path else None
+        self.entries = None
+        self.walked = 0  # Number of rules walked by the last expand
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        if self.manifest_path is None:
+            return {}
+        try:
+            with self.manifest_path.open(encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION or manifest.get("content_dir") != str(self.content_dir):
+            return {}
+        return manifest.get("roots", {})
+
+    def _write(self) -> None:
+        if self.manifest_path is None:
+            return
+        manifest = {"version": MANIFEST_VERSION, "content_dir": str(self.content_dir), "roots": self.entries}
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(self.manifest_path, json.dumps(manifest, separators=(",", ":")).encode("utf-8"))
+        except OSError as e:
+            logger.debug(f"Could not write content manifest '{self.manifest_path}': {e}")
+
+    def _is_current(self, entry: dict) -> bool:
+        if entry.get("racy"):
+            return False
+        top = self.content_dir / entry["root"] if entry["root"] else self.content_dir
+        for relative_dir, mtime_ns in entry["directories"].items():
+            try:
+                if (top / relative_dir).stat().st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def expand(self, rules: list) -> dict:
+        """
+        Returns the ``content_files`` entries ``rules`` expand to, in rule order.
+        Raises ``ValueError`` for missing roots and for two rules producing the same output path.
+        """
+        with self._lock:
+            if self.entries is None:
+                self.entries = self._read()
+            walked = 0
+            content_files = {}
+            for rule in rules:
+                key = hashlib.sha1(json.dumps(rule, sort_keys=True).encode("utf-8")).hexdigest()
+                entry = self.entries.get(key)
+                if entry is None or not self._is_current(entry):
+                    started_ns = time.time_ns()
+                    files, directories = walk_content_root(self.content_dir, rule)
+                    racy = any(mtime_ns >= started_ns - RACY_WINDOW_NS for mtime_ns in directories.values())
+                    entry = {"root": _directory(rule["root"]), "directories": directories, "files": files, "racy": racy}
+                    self.entries[key] = entry
+                    walked += 1
+                for output, source in entry["files"].items():
+                    if output in content_files:
+                        raise ValueError(f"Content roots produce '{output}' twice.")
+                    content_files[output] = source
+            self.walked = walked
+            if walked:
+                self._write()
+            return content_files
+
+
+@lru_cache(maxsize=None)
+def get_content_manifest(content_dir: Path) -> ContentManifest:
+    """Returns the process-wide content manifest for ``content_dir``."""
+    return ContentManifest(content_dir)
+
+
+def expand_content_roots(template_config: dict, content_dir: Path) -> dict:
+    """
+    Returns a template config with its ``content_roots`` expanded into
+    ``content_files`` (and removed), through the content manifest of
+    ``content_dir``. Entries listed in ``content_files`` win over discovered
+    ones with the same output path, e.g. to mark one discovered file static.
+    """
+    rules = template_config.get("content_roots")
+    expanded = {key: value for key, value in template_config.items() if key != "content_roots"}
+    if rules:
+        discovered = get_content_manifest(Path(content_dir)).expand(rules)
+        expanded["content_files"] = {**discovered, **template_config.get("content_files", {})}
+    return expanded
@@ -0,0 +1,38 @@
+# scaffoldor/exceptions.py
+
+
+class ScaffoldError(Exception):
+    """Base class for errors raised by scaffoldor's library APIs."""
+
+
+class TemplateNotFoundError(ScaffoldError):
+    """The requested template does not exist. ``available`` lists the templates that do."""
+
+    def __init__(self, template_name: str, available: list[str]):
+        self.template_name = template_name
+        self.available = available
+        super().__init__(f"Template '{template_name}' not found.")
+
+
+class TemplateConfigError(ScaffoldError):
+    """A template JSON file could not be parsed, or its configuration is invalid."""
+
+
+class ProjectExistsError(ScaffoldError):
+    """The target project directory already exists."""
+
+
+class GenerationError(ScaffoldError):
+    """
+    One or more files could not be generated. ``failures`` maps each output
+    file to the exception that prevented it from being written.
+    """
+
+    def __init__(self, failures: dict):
+        self.failures = failures
+        details = "; ".join(f"'{name}': {error}" for name, error in failures.items())
+        super().__init__(f"Failed to generate {len(failures)} file(s): {details}")
+
+
+class VariableError(ScaffoldError):
+    """A template variable is missing, has a value of the wrong type, or could not be derived."""
@@ -0,0 +1,123 @@
+# scaffoldor/manifest.py
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+
+from . import __version__
+
+# Written into the root of every generated project
+MANIFEST_NAME = ".scaffoldor.json"
+MANIFEST_VERSION = 1
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: Path) -> Optional[str]:
+    """Returns the SHA-256 of a file's contents, or ``None`` if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with path.open("rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=4096)
+def _hash_file_version(path: str, mtime_ns: int, size: int) -> Optional[str]:
+    return hash_file(Path(path))
+
+
+def hash_source_file(path: Path) -> Optional[str]:
+    """
+    :func:`hash_file` for template content files, which are read for every
+    project: the hash is remembered for the rest of the process until the
+    file's mtime or size changes.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return _hash_file_version(str(path), st.st_mtime_ns, st.st_size)
+
+
+def hash_context(render_context: dict) -> str:
+    """Hashes the variables a project was rendered with, independent of key order."""
+    encoded = json.dumps(render_context, sort_keys=True, separators=(",", ":"), default=str)
+    return hash_bytes(encoded.encode("utf-8"))
+
+
+def tree_hash(files: dict, directories: Iterable[str] = ()) -> str:
+    """
+    Hashes a generated tree: its directories and the path and output hash of
+    every file. Projects generated from the same inputs in deterministic mode
+    have the same tree hash, so downstream caches can key on it.
+    """
+    digest = hashlib.sha256()
+    for directory in sorted(set(directories)):
+        digest.update(f"d {directory}\n".encode("utf-8"))
+    for path, record in sorted(files.items()):
+        digest.update(f"f {path} {record.get('output')}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def read_manifest(project_root: Path) -> Optional[dict]:
+    """Returns the project's manifest, or ``None`` if it has none (or it is unreadable)."""
+    try:
+        with (project_root / MANIFEST_NAME).open(encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("manifest_version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def build_manifest(
+    template_name: str,
+    variables: dict,
+    context_hash: str,
+    files: dict,
+    directories: Iterable[str] = (),
+    seed: Optional[str] = None,
+) -> bytes:
+    """
+    Records how a project was generated: the template, the variables, and for
+    every rendered file the hashes of its template source and of its output.
+    ``scaffoldor update`` uses this to re-render only what changed and to spot
+    files edited by hand. Also records the :func:`tree_hash` and, for
+    deterministic projects, the ``seed``. Returns the encoded manifest file.
+    """
+    manifest = {
+        "manifest_version": MANIFEST_VERSION,
+        "scaffoldor_version": __version__,
+        "template": template_name,
+        "variables": variables,
+        "context_hash": context_hash,
+        "files": dict(sorted(files.items())),
+        "tree_hash": tree_hash(files, directories),
+    }
+    if seed is not None:
+        manifest["seed"] = seed
+    return (json.dumps(manifest, indent=2, sort_keys=True, default=str) + "\n").encode("utf-8")
+
+
+def write_manifest(
+    project_root: Path,
+    template_name: str,
+    variables: dict,
+    context_hash: str,
+    files: dict,
+    directories: Iterable[str] = (),
+    seed: Optional[str] = None,
+) -> Path:
+    """Writes the project's manifest (see :func:`build_manifest`) into ``project_root``."""
+    manifest_path = project_root / MANIFEST_NAME
+    manifest_path.write_bytes(build_manifest(template_name, variables, context_hash, files, directories, seed))
+    return manifest_path
@@ -0,0 +1,137 @@
+# scaffoldor/memo.py
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from .manifest import hash_bytes
+
+# Default cap on the rendered output a RenderMemo keeps in memory
+MEMO_MAX_BYTES = 64 * 1024 * 1024
+
+# Filters and globals that return something different on every call
+RANDOM_FILTERS = frozenset({"random"})
+RANDOM_GLOBALS = frozenset({"lipsum"})
+
+
+class TemplateDependencies(NamedTuple):
+    """The render-context variables a template reads, and whether it draws random values."""
+
+    variables: frozenset
+    random: bool
+    # The template itself plus those it includes, imports or extends, followed transitively
+    templates: tuple = ()
+
+
+@lru_cache(maxsize=4096)
+def _parse_dependencies(env, template_name: str, source: str) -> tuple[frozenset, bool, tuple]:
+    """Returns the names one template source reads, whether it is random, and the templates it references."""
+    from jinja2 import meta, nodes
+
+    ast = env.parse(source, template_name)
+    names = frozenset(meta.find_undeclared_variables(ast))
+    random = bool(names & RANDOM_GLOBALS) or any(node.name in RANDOM_FILTERS for node in ast.find_all(nodes.Filter))
+    return names, random, tuple(meta.find_referenced_templates(ast))
+
+
+def analyze_template(env, template_name: str, follow_references: bool = False) -> Optional[TemplateDependencies]:
+    """
+    Finds the context variables a template reads from its AST. Templates that
+    include, import or extend others give ``None``, unless
+    ``follow_references`` is set: then the templates they load are analyzed
+    too, and ``None`` only means one of them is chosen at render time.
+    Analyses are remembered per source, so each template is parsed once.
+    """
+    source, _, _ = env.loader.get_source(env, template_name)
+    names, random, referenced = _parse_dependencies(env, template_name, source)
+    if referenced and not follow_references:
+        return None
+    templates = [template_name]
+    variables = set(names)
+    pending = list(referenced)
+    while pending:
+        name = pending.pop()
+        if name is None:
+            return None
+        if name in templates:
+            continue
+        templates.append(name)
+        source, _, _ = env.loader.get_source(env, name)
+        names, is_random, referenced = _parse_dependencies(env, name, source)
+        variables |= names
+        random = random or is_random
+        pending.extend(referenced)
+    return TemplateDependencies(frozenset(variables - env.globals.keys()), random, tuple(templates))
+
+
+class RenderMemo:
+    """
+    Shares rendered files between projects. Each template is analyzed once
+    (see :func:`analyze_template`). Projects that give the variables it reads
+    the same values then get the same output, so it is rendered once and
+    reused. Templates that do not read any variable are rendered once for a
+    whole batch.
+
+    Templates reading ``project_name`` or using randomness are rendered
+    once per project. Their outputs are not kept. The outputs that are kept
+    are evicted least recently used first beyond ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int = MEMO_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._dependencies = {}
+        self._outputs = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def key(self, env, template, template_name: str, render_context: dict, seed: Optional[str]) -> Optional[tuple]:
+        """
+        Returns the key of ``template``'s output for ``render_context``, or
+        ``None`` if that output is specific to the project and not worth keeping.
+        ``template`` is the compiled template, so an edited template gets new keys.
+        """
+        with self._lock:
+            known = template in self._dependencies
+            dependencies = self._dependencies.get(template)
+        if not known:
+            dependencies = analyze_template(env, template_name)
+            with self._lock:
+                self._dependencies[template] = dependencies
+        if dependencies is None or dependencies.random or "project_name" in dependencies.variables:
+            return None
+        values = {name: render_context[name] for name in dependencies.variables if name in render_context}
+        encoded = json.dumps(values, sort_keys=True, separators=(",", ":"), default=str)
+        # Seeded output has its line endings normalized
+        return template, seed is not None, hash_bytes(encoded.encode("utf-8"))
+
+    def get(self, key: tuple) -> Optional[tuple[bytes, str]]:
+        """Returns the output stored under ``key`` and its SHA-256, or ``None``."""
+        with self._lock:
+            output = self._outputs.get(key)
+            if output is None:
+                self.misses += 1
+                return None
+            self._outputs.move_to_end(key)
+            self.hits += 1
+            return output
+
+    def put(self, key: tuple, data: bytes, digest: str) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._outputs:
+                return
+            self._outputs[key] = (data, digest)
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, (evicted, _) = self._outputs.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._dependencies.clear()
+            self._outputs.clear()
+            self._size = 0
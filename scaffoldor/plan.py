@@ -0,0 +1,497 @@
+# scaffoldor/plan.py
+import base64
+import inspect
+import json
+import logging
+import os
+import posixpath
+import random
+import sys
+from pathlib import Path
+from typing import Optional
+
+from . import __version__
+from .backends import DIR_MODE, FilesystemBackend
+from .cache import get_bytecode_cache
+from .exceptions import ProjectExistsError, ScaffoldError
+from .manifest import hash_bytes, hash_context, tree_hash, write_manifest
+from .memo import analyze_template
+from .profiling import span
+from .reproducible import RNG_VARIABLE, file_random, normalize_newlines, random_filter
+from .registry import default_templates_dir
+from .scaffold import (
+    build_render_context, content_entries, fan_out, file_dependencies, get_environment, load_template_config,
+    template_directories, variables_hash,
+)
+from .tree import _path_parts
+from .transaction import staged_project
+from .variables import Derived, TemplateVariables, compile_derived
+
+logger = logging.getLogger("scaffoldor")
+
+PLAN_VERSION = 5
+
+# Jinja2 options the packaged environment uses; recorded in the plan for the fallback renderer
+JINJA_OPTIONS = {"trim_blocks": True, "lstrip_blocks": True}
+
+
+class _Undefined:
+    """Stands in for a variable the project does not define; renders as an empty string like Jinja2's Undefined."""
+
+    def __str__(self) -> str:
+        return ""
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self) -> int:
+        return 0
+
+
+UNDEFINED = _Undefined()
+
+
+def _filter_default(value, default_value="", boolean=False):
+    if value is UNDEFINED or (boolean and not value):
+        return default_value
+    return value
+
+
+def _attribute(value, attribute):
+    """Looks up a dotted ``attribute`` path the way Jinja2's ``attribute=`` filter arguments do."""
+    for part in str(attribute).split("."):
+        key = int(part) if part.isdigit() else part
+        try:
+            value = value[key]
+        except (TypeError, LookupError, AttributeError):
+            value = getattr(value, part, UNDEFINED)
+    return value
+
+
+def _filter_join(value, d="", attribute=None):
+    if attribute is not None:
+        value = (_attribute(item, attribute) for item in value)
+    return str(d).join(str(item) for item in value)
+
+
+# Filters and globals the plan format can evaluate without Jinja2. Each one
+# mirrors the behaviour of the Jinja2 builtin of the same name.
+FILTERS = {
+    "lower": lambda value: str(value).lower(),
+    "upper": lambda value: str(value).upper(),
+    "capitalize": lambda value: str(value).capitalize(),
+    "trim": lambda value, chars=None: str(value).strip(chars),
+    "replace": lambda value, old, new, count=None: str(value).replace(str(old), str(new), -1 if count is None else count),
+    "string": str,
+    "length": len,
+    "join": _filter_join,
+    "default": _filter_default,
+    "d": _filter_default,
+    "random": lambda value: random.choice(value),
+}
+CALLS = {"range": range}
+
+
+class UnsupportedTemplate(Exception):
+    """Raised when a template uses features the plan format cannot express."""
+
+
+def _compile_expr(node) -> dict:
+    """Translates a Jinja2 expression node into the plan's JSON expression format."""
+    from jinja2 import nodes
+
+    if isinstance(node, nodes.Name) and node.ctx == "load":
+        return {"var": node.name}
+    if isinstance(node, nodes.Const) and isinstance(node.value, (str, int, float, bool, type(None))):
+        return {"const": node.value}
+    if isinstance(node, nodes.Getattr):
+        return {"attr": node.attr, "value": _compile_expr(node.node)}
+    if isinstance(node, nodes.Concat):
+        return {"concat": [_compile_expr(item) for item in node.nodes]}
+    if isinstance(node, (nodes.Filter, nodes.Call)) and (node.kwargs or node.dyn_args or node.dyn_kwargs):
+        raise UnsupportedTemplate("keyword or dynamic arguments")
+    if isinstance(node, nodes.Filter) and node.node is not None and node.name in FILTERS:
+        _check_arguments(node.name, FILTERS[node.name], 1 + len(node.args))
+        return {"filter": node.name, "value": _compile_expr(node.node), "args": [_compile_expr(a) for a in node.args]}
+    if isinstance(node, nodes.Call) and isinstance(node.node, nodes.Name) and node.node.name in CALLS:
+        return {"call": node.node.name, "args": [_compile_expr(a) for a in node.args]}
+    raise UnsupportedTemplate(f"unsupported expression '{type(node).__name__}'")
+
+
+def _check_arguments(name: str, function, count: int) -> None:
+    """Raises :class:`UnsupportedTemplate` unless ``function`` takes ``count`` positional arguments."""
+    try:
+        inspect.signature(function).bind(*range(count))
+    except ValueError:
+        # Builtins without a signature; Jinja2's own checks are no stricter
+        return
+    except TypeError as e:
+        raise UnsupportedTemplate(f"'{name}' with {count - 1} argument(s): {e}") from e
+
+
+def compile_segments(env, source: str) -> list:
+    """
+    Compiles template source into a list of literal strings and expressions.
+
+    Only templates made of plain text and ``{{ ... }}`` expressions built from
+    variables, constants and the filters in :data:`FILTERS` can be compiled;
+    anything else raises :class:`UnsupportedTemplate`.
+    """
+    from jinja2 import nodes
+
+    segments = []
+    for statement in env.parse(source).body:
+        if not isinstance(statement, nodes.Output):
+            raise UnsupportedTemplate(f"unsupported statement '{type(statement).__name__}'")
+        for item in statement.nodes:
+            if isinstance(item, nodes.TemplateData):
+                if segments and isinstance(segments[-1], str):
+                    segments[-1] += item.data
+                else:
+                    segments.append(item.data)
+            else:
+                segments.append(_compile_expr(item))
+    return segments
+
+
+def _compile_expression(env, expression: str) -> dict:
+    segments = compile_segments(env, f"{{{{ {expression} }}}}")
+    if len(segments) != 1 or isinstance(segments[0], str):
+        raise UnsupportedTemplate("not a single expression")
+    return segments[0]
+
+
+def _expression_variables(expr: dict) -> set:
+    """Returns the variables a plan expression reads (plus ``project_name`` if it is random, like compile_derived)."""
+    if "var" in expr:
+        return {expr["var"]}
+    names = {"project_name"} if expr.get("filter") == "random" else set()
+    for key in ("value", "args", "concat"):
+        value = expr.get(key)
+        for item in value if isinstance(value, list) else [value] if value else []:
+            names |= _expression_variables(item)
+    return names
+
+
+def plan_variables(plan: dict) -> TemplateVariables:
+    """Returns the plan's variable declarations, evaluating derived variables without Jinja2 where they were compiled."""
+    compiled = plan.get("derived", {})
+
+    def compiler(expression: str) -> Derived:
+        if expression not in compiled:
+            return compile_derived(expression)
+        expr = compiled[expression]
+        return Derived(lambda context: _evaluate(expr, context), frozenset(_expression_variables(expr)))
+
+    return TemplateVariables(plan.get("variables"), compiler=compiler)
+
+
+def compile_plan(template_name: str) -> dict:
+    """
+    Compiles a template into a self-contained plan that :func:`execute_plan`
+    can run without Jinja2: the directory list plus, per output file, either
+    literal text with simple substitutions or (for templates using loops,
+    conditionals or other unsupported features) the Jinja2 source to render,
+    together with the sources of the templates it includes, imports or
+    extends. Static files are embedded as base64, so executing a plan never
+    reads the installed template content.
+    """
+    template_config = load_template_config(template_name)
+    env = get_environment()
+
+    directories = template_directories(template_config)
+
+    files = []
+    # Sources that fallback templates load, served to them by a DictLoader at runtime
+    templates = {}
+    content_dir = default_templates_dir() / "content"
+    raw_entries = template_config.get("content_files", {}).values()
+    for (output_filename, template_relative_path, static), raw_entry in zip(content_entries(template_config), raw_entries):
+        repeat = fan_out(raw_entry)
+        fan_out_keys = _compile_fan_out(env, output_filename, *repeat) if repeat else {}
+        if static:
+            data = (content_dir / template_relative_path).read_bytes()
+            files.append({
+                "path": output_filename,
+                "template": template_relative_path,
+                "source_hash": hash_bytes(data),
+                "static": True,
+                "data": base64.b64encode(data).decode("ascii"),
+                **fan_out_keys,
+            })
+            continue
+        source, _, _ = env.loader.get_source(env, template_relative_path)
+        # Recorded in the manifest like create_files does, so update can tell which files to re-render
+        source_hash, variables = file_dependencies(env, template_relative_path)
+        entry = {
+            "path": output_filename,
+            "template": template_relative_path,
+            "source_hash": source_hash,
+            "variables": None if variables is None else sorted(variables),
+            **fan_out_keys,
+        }
+        try:
+            if env.autoescape(template_relative_path) if callable(env.autoescape) else env.autoescape:
+                raise UnsupportedTemplate("autoescaping is enabled")
+            entry["segments"] = compile_segments(env, source)
+        except UnsupportedTemplate as e:
+            logger.debug(f"'{template_relative_path}' needs Jinja2 at runtime: {e}")
+            entry["jinja_source"] = source
+            dependencies = analyze_template(env, template_relative_path, follow_references=True)
+            if dependencies is None:
+                logger.error(f"Cannot compile '{template_relative_path}': it loads a template chosen at render time.")
+                sys.exit(1)
+            for name in dependencies.templates[1:]:
+                templates[name] = env.loader.get_source(env, name)[0]
+        files.append(entry)
+
+    # Derived variables are compiled to plan expressions too, where possible
+    derived = {}
+    for name, declaration in template_config.get("variables", {}).items():
+        if isinstance(declaration, dict) and "derived" in declaration:
+            try:
+                derived[declaration["derived"]] = _compile_expression(env, declaration["derived"])
+            except UnsupportedTemplate as e:
+                logger.debug(f"Derived variable '{name}' needs Jinja2 at runtime: {e}")
+
+    return {
+        "plan_version": PLAN_VERSION,
+        "scaffoldor_version": __version__,
+        "template": template_name,
+        "jinja_options": JINJA_OPTIONS,
+        "directories": directories,
+        "files": files,
+        "templates": templates,
+        "variables": template_config.get("variables", {}),
+        "derived": derived,
+    }
+
+
+def _compile_fan_out(env, output_filename: str, for_each: str, name: str) -> dict:
+    """
+    Plan keys of a fan-out entry: the list expression and the output path,
+    each compiled to plan expressions where possible and kept as Jinja2 source otherwise.
+    """
+    keys = {"for_each": for_each, "as": name}
+    try:
+        keys["for_each_expr"] = _compile_expression(env, for_each)
+    except UnsupportedTemplate as e:
+        logger.debug(f"'for_each' of '{output_filename}' needs Jinja2 at runtime: {e}")
+    try:
+        keys["path_segments"] = compile_segments(env, output_filename)
+    except UnsupportedTemplate as e:
+        logger.debug(f"Path '{output_filename}' needs Jinja2 at runtime: {e}")
+    return keys
+
+
+def _plan_files(plan: dict, render_context: dict, jinja_env):
+    """
+    Yields ``(path, entry, item context)`` for every file of a plan, one per
+    list item for fan-out entries (see :func:`~scaffoldor.scaffold.expand_content_entries`).
+    ``jinja_env`` returns a Jinja2 environment for parts that were not compiled.
+    """
+    seen = set()
+    for entry in plan["files"]:
+        if "for_each" not in entry:
+            seen.add(entry["path"])
+            yield entry["path"], entry, {}
+            continue
+        if "for_each_expr" in entry:
+            items = _evaluate(entry["for_each_expr"], render_context)
+        else:
+            items = jinja_env().compile_expression(entry["for_each"])(**render_context)
+        if isinstance(items, (str, bytes, dict)) or not hasattr(items, "__iter__"):
+            raise ValueError(f"'for_each' of content file '{entry['path']}' must give a list, got {items!r}.")
+        # Compiled once per entry, not once per item
+        path_template = None if "path_segments" in entry else jinja_env().from_string(entry["path"])
+        for item in items:
+            item_context = {entry["as"]: item}
+            if path_template is None:
+                path = render_segments(entry["path_segments"], {**render_context, **item_context})
+            else:
+                path = path_template.render(**render_context, **item_context)
+            path = "/".join(_path_parts(path))
+            if path in seen:
+                raise ValueError(f"Content file '{entry['path']}' produces '{path}' more than once.")
+            seen.add(path)
+            yield path, entry, item_context
+
+
+def _evaluate(expr: dict, context: dict):
+    if "var" in expr:
+        return context.get(expr["var"], UNDEFINED)
+    if "const" in expr:
+        return expr["const"]
+    if "attr" in expr:
+        value = _evaluate(expr["value"], context)
+        if isinstance(value, dict):
+            return value.get(expr["attr"], UNDEFINED)
+        return getattr(value, expr["attr"], UNDEFINED)
+    if "concat" in expr:
+        return "".join(str(_evaluate(item, context)) for item in expr["concat"])
+    args = [_evaluate(arg, context) for arg in expr["args"]]
+    if expr.get("filter") == "random":
+        # Drawn from the file's seeded generator in deterministic mode, like the Jinja2 filter
+        return (context.get(RNG_VARIABLE) or random).choice(_evaluate(expr["value"], context))
+    if "filter" in expr:
+        return FILTERS[expr["filter"]](_evaluate(expr["value"], context), *args)
+    return CALLS[expr["call"]](*args)
+
+
+def render_segments(segments: list, context: dict) -> str:
+    return "".join(part if isinstance(part, str) else str(_evaluate(part, context)) for part in segments)
+
+
+def save_plan(plan: dict, plan_path: Path) -> None:
+    with plan_path.open("w", encoding="utf-8") as f:
+        json.dump(plan, f, separators=(",", ":"))
+
+
+def load_plan(plan_path: Path) -> dict:
+    try:
+        with plan_path.open(encoding="utf-8") as f:
+            plan = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to read plan '{plan_path}': {e}")
+        sys.exit(1)
+    if plan.get("plan_version") != PLAN_VERSION:
+        logger.error(f"Plan '{plan_path}' was compiled for an incompatible scaffoldor version; recompile it.")
+        sys.exit(1)
+    return plan
+
+
+def _write_plan(plan: dict, root: Path, render_context: dict, context: Optional[dict], verbose: bool,
+                seed: Optional[str] = None) -> str:
+    """Writes the directories, files and manifest of a plan below ``root`` and returns the tree hash."""
+    backend = FilesystemBackend(root, fixed_modes=seed is not None)
+    parents = {Path(entry["path"]).parent.as_posix() for entry in plan["files"] if "for_each" not in entry} - {"."}
+    try:
+        with span("mkdir") as timing:
+            timing.files = backend.make_tree(plan["directories"] + sorted(parents))
+    except OSError as e:
+        logger.error(f"Failed to create project directories in '{root}': {e}")
+        sys.exit(1)
+
+    jinja_envs = []
+
+    def jinja_env():
+        # Only plans with parts that could not be compiled import Jinja2
+        if not jinja_envs:
+            from jinja2 import DictLoader, Environment, pass_context
+
+            # Fallback files are served by name too, so each is compiled once (or read from the bytecode cache)
+            sources = {**plan.get("templates", {}),
+                       **{entry["template"]: entry["jinja_source"] for entry in plan["files"] if "jinja_source" in entry}}
+            jinja_envs.append(Environment(loader=DictLoader(sources), bytecode_cache=get_bytecode_cache(), cache_size=-1,
+                                          **plan.get("jinja_options", JINJA_OPTIONS)))
+            jinja_envs[0].filters["random"] = pass_context(random_filter)
+        return jinja_envs[0]
+
+    records = {}
+    fan_out_parents = set()
+    try:
+        files = list(_plan_files(plan, render_context, jinja_env))
+    except Exception as e:
+        logger.error(f"Error expanding the content files of the plan: {e}")
+        sys.exit(1)
+    for path, entry, item_context in files:
+        file_path = root / path
+        parent = posixpath.dirname(path)
+        if item_context and parent and parent not in fan_out_parents:
+            backend.make_tree([parent])
+            fan_out_parents.add(parent)
+        if entry.get("static"):
+            try:
+                with span("write", template=entry["template"]) as timing:
+                    data = base64.b64decode(entry["data"])
+                    backend.write_file(path, data)
+                    timing.files, timing.bytes = 1, len(data)
+            except OSError as e:
+                logger.error(f"Error writing static file '{path}' from plan: {e}")
+                sys.exit(1)
+            records[path] = {"template": entry["template"], "source": entry["source_hash"], "output": entry["source_hash"]}
+            continue
+        file_context = {**render_context, **item_context} if item_context else render_context
+        variables = entry.get("variables")
+        context_hash = variables_hash(None if variables is None else frozenset(variables), file_context)
+        if seed is not None:
+            file_context = {**file_context, RNG_VARIABLE: file_random(seed, render_context["project_name"], path)}
+        try:
+            with span("render", template=entry["template"]) as timing:
+                if "segments" in entry:
+                    content = render_segments(entry["segments"], file_context)
+                else:
+                    content = jinja_env().get_template(entry["template"]).render(**file_context)
+                if seed is not None:
+                    content = normalize_newlines(content)
+                data = content.encode('utf-8')
+                timing.bytes = len(data)
+            with span("write", template=entry["template"]) as timing:
+                backend.write_file(path, data)
+                timing.files, timing.bytes = 1, len(data)
+        except Exception as e:
+            logger.error(f"Error generating file '{path}' from plan: {e}")
+            sys.exit(1)
+        records[path] = {"template": entry["template"], "source": entry["source_hash"], "context": context_hash,
+                         "output": hash_bytes(data)}
+        if verbose:
+            logger.debug(f"Created file: {file_path}")
+
+    with span("manifest"):
+        write_manifest(root, plan["template"], context or {}, hash_context(render_context), records, plan["directories"], seed)
+    return tree_hash(records, plan["directories"])
+
+
+def execute_plan(
+    plan: dict,
+    project_path: Path,
+    dry_run: bool = False,
+    verbose: bool = False,
+    context: Optional[dict] = None,
+    durable: bool = True,
+    seed: Optional[str] = None,
+) -> None:
+    """
+    Creates a project from a compiled plan. Jinja2 is only imported if the plan
+    contains files that could not be compiled to plain substitutions.
+
+    Like :func:`~scaffoldor.scaffold.create_structure`, the project is staged
+    next to ``project_path`` and renamed into place once complete, and a
+    ``seed`` makes the output deterministic.
+    """
+    if project_path.exists():
+        logger.error(f"Directory '{project_path}' already exists. Choose a different name or path.")
+        sys.exit(1)
+
+    project_name = project_path.name
+    try:
+        render_context = build_render_context(project_name, context, plan_variables(plan), seed)
+    except ScaffoldError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    if dry_run:
+        logger.info(f"[Dry-run] Would create project at {project_path} from plan for template '{plan['template']}'")
+        for directory in plan["directories"]:
+            logger.info(f"  - {project_name}/{directory}/")
+        for entry in plan["files"]:
+            logger.info(f"  - {project_name}/{entry['path']}{' (static)' if entry.get('static') else ''}")
+        logger.info("[Dry-run] No files or directories were actually created.")
+        return
+
+    logger.info(f"Creating project at {project_path}")
+    try:
+        with staged_project(project_path, durable=durable) as staging:
+            if seed is not None:
+                os.chmod(staging, DIR_MODE)
+            digest = _write_plan(plan, staging, render_context, context, verbose, seed)
+    except ProjectExistsError:
+        logger.error(f"Directory '{project_path}' was created by someone else while scaffolding; nothing was written.")
+        sys.exit(1)
+    except OSError as e:
+        logger.error(f"Failed to create project '{project_path}': {e}")
+        sys.exit(1)
+    if seed is not None:
+        logger.info(f"Tree hash: {digest}")
+    logger.info(f"\n🎉 Project '{project_name}' scaffolded successfully!")
+    logger.info(f"Next steps:\n  cd {project_name}\n  # Start building your secure app!\n")
@@ -0,0 +1,191 @@
+# scaffoldor/profiling.py
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Optional
+
+# Phases recorded by the scaffolding pipeline, in the order the breakdown table lists them
+PHASES = (
+    "config_load", "env_setup", "mkdir", "materialize", "compile", "render", "write", "manifest", "cache_store", "project",
+)
+
+_hooks: list = []
+_hooks_lock = threading.Lock()
+
+
+class Span:
+    """
+    One timed phase of the pipeline. Code inside the span can set ``files``
+    and ``bytes``; ``attrs`` holds the labels it was opened with (e.g. the
+    template name).
+    """
+
+    __slots__ = ("name", "attrs", "files", "bytes", "start_ns", "duration_ns", "thread_id")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.files = 0
+        self.bytes = 0
+        self.start_ns = 0
+        self.duration_ns = 0
+        self.thread_id = threading.get_ident()
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ns": self.duration_ns,
+            "files": self.files,
+            "bytes": self.bytes,
+            "thread_id": self.thread_id,
+            **self.attrs,
+        }
+
+
+class _NullSpan:
+    """Handed out when nobody is listening, so instrumented code costs next to nothing."""
+
+    __slots__ = ()
+    files = 0
+    bytes = 0
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def add_hook(hook: Callable[[Span], None]) -> None:
+    """Registers ``hook`` to be called with every :class:`Span` once it has finished."""
+    with _hooks_lock:
+        _hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[Span], None]) -> None:
+    with _hooks_lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """
+    Times the enclosed block as phase ``name`` and reports it to every
+    registered hook. Without hooks this is a no-op.
+    """
+    if not _hooks:
+        yield _NULL_SPAN
+        return
+    current = Span(name, attrs)
+    current.start_ns = time.perf_counter_ns()
+    try:
+        yield current
+    finally:
+        current.duration_ns = time.perf_counter_ns() - current.start_ns
+        for hook in list(_hooks):
+            hook(current)
+
+
+class Profiler:
+    """
+    Collects spans while it is active and summarises them.
+
+        with Profiler() as profiler:
+            create_structure(...)
+        print(profiler.table())
+        profiler.write(Path("trace.json"))
+    """
+
+    def __init__(self):
+        self.spans: list = []
+        self.origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def __call__(self, finished: Span) -> None:
+        with self._lock:
+            self.spans.append(finished)
+
+    def __enter__(self) -> "Profiler":
+        self.origin_ns = time.perf_counter_ns()
+        add_hook(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        remove_hook(self)
+
+    def phases(self) -> dict:
+        """Returns ``{phase: {"count", "seconds", "files", "bytes"}}`` totals."""
+        totals = {}
+        for item in self.spans:
+            total = totals.setdefault(item.name, {"count": 0, "seconds": 0.0, "files": 0, "bytes": 0})
+            total["count"] += 1
+            total["seconds"] += item.duration_ns / 1e9
+            total["files"] += item.files
+            total["bytes"] += item.bytes
+        order = {name: index for index, name in enumerate(PHASES)}
+        return dict(sorted(totals.items(), key=lambda item: order.get(item[0], len(order))))
+
+    def templates(self, limit: Optional[int] = None) -> list:
+        """Returns ``(template, seconds)`` pairs, slowest first, summing compile, render and write time."""
+        totals = {}
+        for item in self.spans:
+            template = item.attrs.get("template")
+            if template and item.name in ("compile", "render", "write"):
+                totals[template] = totals.get(template, 0.0) + item.duration_ns / 1e9
+        ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit] if limit else ranked
+
+    def table(self, top: int = 10) -> str:
+        """Formats the per-phase breakdown and the slowest templates as a text table."""
+        phases = self.phases()
+        # 'project' spans enclose the others, so they are not part of the total
+        total = sum(phase["seconds"] for name, phase in phases.items() if name != "project") or 1.0
+        lines = [f"{'phase':<12} {'count':>7} {'time (ms)':>11} {'share':>7} {'files':>7} {'bytes':>12}"]
+        for name, phase in phases.items():
+            share = "" if name == "project" else f"{phase['seconds'] / total:.1%}"
+            lines.append(
+                f"{name:<12} {phase['count']:>7} {phase['seconds'] * 1000:>11.2f} {share:>7} "
+                f"{phase['files']:>7} {phase['bytes']:>12}"
+            )
+        slowest = self.templates(top)
+        if slowest:
+            lines.append("")
+            lines.append(f"{'slowest templates':<48} {'time (ms)':>11}")
+            for template, seconds in slowest:
+                lines.append(f"{template:<48} {seconds * 1000:>11.2f}")
+        return "\n".join(lines)
+
+    def to_json(self) -> dict:
+        return {
+            "phases": self.phases(),
+            "spans": [{**item.to_dict(), "start_ns": item.start_ns - self.origin_ns} for item in self.spans],
+        }
+
+    def to_chrome_trace(self) -> dict:
+        """Returns the spans in the Chrome trace event format (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": item.attrs.get("project") or item.attrs.get("template") or item.name,
+                "cat": item.name,
+                "ph": "X",
+                "ts": (item.start_ns - self.origin_ns) / 1000,
+                "dur": item.duration_ns / 1000,
+                "pid": pid,
+                "tid": item.thread_id,
+                "args": {"files": item.files, "bytes": item.bytes, **item.attrs},
+            }
+            for item in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path, output_format: str = "chrome") -> None:
+        """Writes a Chrome trace (``output_format="chrome"``) or the plain JSON span list (``"json"``)."""
+        data = self.to_chrome_trace() if output_format == "chrome" else self.to_json()
+        with Path(path).open("w", encoding="utf-8") as f:
+            json.dump(data, f)
@@ -0,0 +1,237 @@
+# scaffoldor/registry.py
+import hashlib
+import json
+import logging
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from .cache import atomic_write, cache_enabled, user_cache_dir
+
+logger = logging.getLogger("scaffoldor")
+
+INDEX_VERSION = 3
+
+# Keys merged entry by entry when a template extends another; everything else is replaced
+MERGED_KEYS = ("structure", "content_files", "variables")
+
+
+def merge_configs(base: dict, override: dict) -> dict:
+    """
+    Layers a child template config over its (already resolved) parent.
+
+    ``structure``, ``content_files`` and ``variables`` are merged key by key, and a ``null``
+    value removes the parent's entry. Every other key replaces the parent's
+    value. The ``extends`` key itself is dropped from the result.
+    """
+    merged = {key: value for key, value in base.items() if key != "extends"}
+    for key, value in override.items():
+        if key == "extends":
+            continue
+        if key in MERGED_KEYS and isinstance(value, dict):
+            layered = dict(base.get(key) or {})
+            for name, item in value.items():
+                if item is None:
+                    layered.pop(name, None)
+                else:
+                    layered[name] = item
+            merged[key] = layered
+        else:
+            merged[key] = value
+    return merged
+
+
+def content_source(entry) -> Optional[str]:
+    """
+    Returns the path below ``templates/content`` a ``content_files`` entry
+    reads: the entry itself, or the ``source`` of an object entry such as
+    ``{"source": "assets/logo.png", "static": true}``.
+    """
+    if isinstance(entry, dict):
+        entry = entry.get("source")
+    return entry if isinstance(entry, str) else None
+
+
+def with_content_source(entry, source: str):
+    """Returns ``entry`` reading ``source`` instead, keeping the options of an object entry."""
+    return {**entry, "source": source} if isinstance(entry, dict) else source
+
+
+def default_templates_dir() -> Path:
+    """Returns the directory holding the packaged template JSON files."""
+    return Path(__file__).parent / "templates"
+
+
+class TemplateRegistry:
+    """
+    Index of the template JSON files in a templates directory.
+
+    Each template is parsed once and stored with its name, description,
+    keywords, version, mtime and content-file list (plus the full config) in a
+    compact JSON index under the user cache directory. :meth:`refresh` only
+    stats the template files and re-parses the ones whose mtime or size
+    changed, so listing and loading templates does not glob-and-parse every
+    JSON file on every command.
+
+    Templates may ``extends`` another template. :meth:`resolve` flattens the
+    inheritance chain once and stores the result in the index together with
+    the mtime of every template in the chain, so later lookups reuse it until
+    one of those templates changes.
+    """
+
+    def __init__(self, templates_dir: Optional[Path] = None, index_path: Optional[Path] = None):
+        self.templates_dir = Path(templates_dir) if templates_dir else default_templates_dir()
+        if index_path is None and cache_enabled():
+            # One index per templates directory, so several installs never share entries
+            digest = hashlib.sha1(str(self.templates_dir.resolve()).encode("utf-8")).hexdigest()[:16]
+            index_path = user_cache_dir() / "registry" / f"{digest}.json"
+        self.index_path = Path(index_path) if index_path else None
+        self.entries = None
+        self.parsed = 0  # Number of template files parsed by the last refresh
+        self.resolved = 0  # Number of inheritance chains flattened since the last refresh
+        self._lock = threading.Lock()
+
+    def _read_index(self) -> dict:
+        if self.index_path is None:
+            return {}
+        try:
+            with self.index_path.open(encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if index.get("version") != INDEX_VERSION or index.get("templates_dir") != str(self.templates_dir):
+            return {}
+        return index.get("templates", {})
+
+    def _write_index(self) -> None:
+        if self.index_path is None:
+            return
+        index = {"version": INDEX_VERSION, "templates_dir": str(self.templates_dir), "templates": self.entries}
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(self.index_path, json.dumps(index, separators=(",", ":")).encode("utf-8"))
+        except OSError as e:
+            logger.debug(f"Could not write template index '{self.index_path}': {e}")
+
+    @staticmethod
+    def _parse(name: str, path: Path, st: os.stat_result) -> dict:
+        entry = {"name": name, "path": str(path), "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+        try:
+            with path.open(encoding="utf-8") as f:
+                config = json.load(f)
+            if not isinstance(config, dict):
+                raise ValueError("expected a JSON object at the top level")
+            keywords = config.get("keywords", [])
+            if not isinstance(keywords, list) or not all(isinstance(keyword, str) for keyword in keywords):
+                raise ValueError("'keywords' must be a list of strings")
+        except (OSError, ValueError) as e:
+            # Remember the failure so it is reported when the template is used
+            entry["error"] = str(e)
+            return entry
+        entry.update(
+            description=config.get("description", ""),
+            keywords=keywords,
+            version=config.get("version"),
+            content_files=list(config.get("content_files", {})),
+            config=config,
+        )
+        return entry
+
+    def refresh(self) -> dict:
+        """Brings the index up to date with the templates directory and returns it."""
+        with self._lock:
+            known = self.entries if self.entries is not None else self._read_index()
+            current = {}
+            parsed = 0
+            try:
+                scan = list(os.scandir(self.templates_dir))
+            except OSError:
+                scan = []
+            for dir_entry in scan:
+                if not dir_entry.name.endswith(".json") or not dir_entry.is_file():
+                    continue
+                name = dir_entry.name[: -len(".json")]
+                st = dir_entry.stat()
+                entry = known.get(name)
+                if entry is None or entry["mtime_ns"] != st.st_mtime_ns or entry["size"] != st.st_size:
+                    entry = self._parse(name, Path(dir_entry.path), st)
+                    parsed += 1
+                current[name] = entry
+
+            # Drop flattened configs whose inheritance chain changed since they were computed
+            invalidated = 0
+            for entry in current.values():
+                chain = entry.get("resolved", {}).get("chain", {})
+                if any(current.get(name, {}).get("mtime_ns") != mtime for name, mtime in chain.items()):
+                    del entry["resolved"]
+                    invalidated += 1
+
+            changed = parsed > 0 or invalidated > 0 or current.keys() != known.keys()
+            self.entries = current
+            self.parsed = parsed
+            self.resolved = 0
+            if changed:
+                self._write_index()
+            return self.entries
+
+    def get(self, name: str) -> Optional[dict]:
+        """Returns the index entry for ``name``, or ``None`` if there is no such template."""
+        return self.refresh().get(name)
+
+    def resolve(self, name: str) -> Optional[dict]:
+        """
+        Returns the flattened config of template ``name`` with every template it
+        extends merged in, or ``None`` if there is no such template.
+
+        Raises ``ValueError`` for unparsable templates, unknown parents and
+        inheritance cycles.
+        """
+        entries = self.refresh()
+        if name not in entries:
+            return None
+        with self._lock:
+            config = self._resolve(name, entries, ())
+            if self.resolved:
+                self._write_index()
+            return config
+
+    def _resolve(self, name: str, entries: dict, seen: tuple) -> dict:
+        entry = entries.get(name)
+        if entry is None:
+            raise ValueError(f"Template '{seen[-1]}' extends unknown template '{name}'.")
+        if "error" in entry:
+            raise ValueError(f"Template '{name}.json' could not be parsed: {entry['error']}")
+        if "resolved" in entry:
+            return entry["resolved"]["config"]
+        if name in seen:
+            raise ValueError(f"Template inheritance cycle: {' -> '.join(seen + (name,))}")
+
+        config = entry["config"]
+        chain = {name: entry["mtime_ns"]}
+        parent_name = config.get("extends")
+        if parent_name:
+            parent = self._resolve(parent_name, entries, seen + (name,))
+            config = merge_configs(parent, config)
+            chain.update(entries[parent_name]["resolved"]["chain"])
+        entry["resolved"] = {"config": config, "chain": chain}
+        self.resolved += 1
+        return config
+
+    def names(self, keyword: Optional[str] = None) -> list[str]:
+        """Returns sorted template names, optionally only those tagged with ``keyword``."""
+        entries = self.refresh()
+        if keyword is None:
+            return sorted(entries)
+        keyword = keyword.lower()
+        return sorted(
+            name for name, entry in entries.items()
+            if keyword in (k.lower() for k in entry.get("keywords", []))
+        )
+
+
+@lru_cache(maxsize=None)
+def get_registry(templates_dir: Optional[Path] = None) -> TemplateRegistry:
+    """Returns the process-wide registry for ``templates_dir`` (the packaged templates by default)."""
+    return TemplateRegistry(templates_dir)
@@ -0,0 +1,55 @@
+# scaffoldor/reproducible.py
+import os
+import random
+from typing import Iterable, Iterator
+
+# Render-time variable holding the random generator of the file being rendered (deterministic mode only)
+RNG_VARIABLE = "_scaffoldor_random"
+
+# Timestamp recorded in deterministic archives unless $SOURCE_DATE_EPOCH is set; zip cannot store earlier dates
+DEFAULT_EPOCH = 315532800  # 1980-01-01T00:00:00Z
+
+
+def file_random(seed: str, project_name: str, relative_path: str) -> random.Random:
+    """
+    Returns the random generator for one output of a project. Each file gets
+    its own stream derived from the seed, the project and the file, so the
+    output does not depend on render order or ``--jobs``.
+    """
+    # String seeds are hashed with SHA-512, so this is stable across processes and platforms
+    return random.Random(f"{seed}\0{project_name}\0{relative_path}")
+
+
+def random_filter(context, seq):
+    """Jinja2's ``random`` filter, drawing from the file's seeded generator when there is one."""
+    rng = context.get(RNG_VARIABLE) or random
+    try:
+        return rng.choice(seq)
+    except IndexError:
+        return context.environment.undefined("No random item, sequence was empty.")
+
+
+def normalize_newlines(text: str) -> str:
+    return text.replace("\r\n", "\n")
+
+
+def normalize_chunks(chunks: Iterable[str]) -> Iterator[str]:
+    """Like :func:`normalize_newlines` for streamed output, including ``\\r\\n`` split across chunks."""
+    pending = ""
+    for chunk in chunks:
+        text = normalize_newlines(pending + chunk)
+        pending = "\r" if text.endswith("\r") else ""
+        if pending:
+            text = text[:-1]
+        if text:
+            yield text
+    if pending:
+        yield pending
+
+
+def source_date_epoch() -> int:
+    """The timestamp to record in reproducible archives (``$SOURCE_DATE_EPOCH``, as in reproducible-builds.org)."""
+    try:
+        return max(int(os.environ["SOURCE_DATE_EPOCH"]), DEFAULT_EPOCH)
+    except (KeyError, ValueError):
+        return DEFAULT_EPOCH
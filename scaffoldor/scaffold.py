@@ -1,48 +1,465 @@
 # scaffoldor/scaffold.py
+from __future__ import annotations
+
+import fnmatch
+import os
+import posixpath
+import shutil
 import sys
 from pathlib import Path
-import json
+import copy
 import logging
-from jinja2 import Environment, FileSystemLoader, select_autoescape, PackageLoader
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Optional
+
+from .backends import DIR_MODE, FILE_MODE, FilesystemBackend, OutputBackend
+from .cache import CACHE_LINK_MODES, OutputCache, get_bytecode_cache, get_output_cache
+from .copying import copy_tree
+from .discovery import expand_content_roots, validate_content_roots
+from .exceptions import ProjectExistsError, TemplateConfigError, TemplateNotFoundError, VariableError
+from .manifest import MANIFEST_NAME, build_manifest, hash_bytes, hash_context, hash_source_file, read_manifest, tree_hash
+from .memo import RenderMemo, analyze_template
+from .profiling import span
+from .registry import content_source, default_templates_dir, get_registry
+from .reproducible import RNG_VARIABLE, file_random, normalize_chunks, normalize_newlines, random_filter
+from .transaction import staged_project
+from .tree import _path_parts, structure_paths
+from .variables import TemplateVariables, validate_declarations
+
+if TYPE_CHECKING:
+    # Jinja2 is imported lazily (see get_environment) so that commands which never
+    # render anything, or that execute a precompiled plan, start up quickly.
+    from jinja2 import Environment
 
 logger = logging.getLogger("scaffoldor")
 
-def load_template_config(template_name: str) -> dict:
-    """Load project structure template from JSON file."""
-    # Use PackageLoader to load templates from within the installed package
-    template_path = Path(__file__).parent / "templates" / f"{template_name}.json"
+# Default per-file write buffer for streaming rendering
+STREAM_BUFFER_BYTES = 64 * 1024
 
-    if not template_path.exists():
-        logger.error(f"Template '{template_name}' not found at {template_path}.")
-        available_templates = list_templates_available()
-        if available_templates:
-            logger.info(f"Available templates: {', '.join(available_templates)}")
+# Keys of an object entry in content_files
+CONTENT_ENTRY_KEYS = {"source", "static", "for_each", "as"}
+
+# Name a fan-out entry gives the current list item unless it sets "as"
+DEFAULT_ITEM_NAME = "item"
+
+# Rendering calls a thread pool holds at once per worker, so fanned-out files never pile up in memory
+PENDING_CALLS_PER_JOB = 4
+
+
+def validate_content_files(template_config: dict) -> None:
+    """Raises ``ValueError`` if a template's ``content_files`` or ``static_files`` are malformed."""
+    for output_filename, entry in template_config.get("content_files", {}).items():
+        if content_source(entry) is None:
+            raise ValueError(f"Content file '{output_filename}' must be a source path or an object with a 'source' path.")
+        unknown = set(entry) - CONTENT_ENTRY_KEYS if isinstance(entry, dict) else set()
+        if unknown:
+            raise ValueError(f"Content file '{output_filename}' has unknown keys: {', '.join(sorted(unknown))}.")
+        if isinstance(entry, dict) and ("for_each" in entry or "as" in entry):
+            if not isinstance(entry.get("for_each"), str) or not entry["for_each"].strip():
+                raise ValueError(f"Content file '{output_filename}' needs 'for_each' to be an expression naming a list.")
+            if not str(entry.get("as", DEFAULT_ITEM_NAME)).isidentifier():
+                raise ValueError(f"Content file '{output_filename}' needs 'as' to be a variable name.")
+    patterns = template_config.get("static_files", [])
+    if not isinstance(patterns, list) or not all(isinstance(pattern, str) for pattern in patterns):
+        raise ValueError("'static_files' must be a list of glob patterns.")
+
+
+def content_entries(template_config: dict) -> list[tuple[str, str, bool]]:
+    """
+    Returns ``(output path, source path, static)`` for every entry of a
+    template's ``content_files``. Static entries are copied byte for byte
+    instead of being rendered: those marked ``"static": true`` and those whose
+    source matches one of the template's ``static_files`` globs (e.g.
+    ``"*.png"``), unless marked ``"static": false``.
+    """
+    patterns = template_config.get("static_files", [])
+    entries = []
+    for output_filename, entry in template_config.get("content_files", {}).items():
+        source = content_source(entry)
+        if isinstance(entry, dict) and "static" in entry:
+            static = bool(entry["static"])
         else:
-            logger.info("No templates found. Use 'scaffoldor init <name>' to create one.")
-        sys.exit(1)
+            static = any(fnmatch.fnmatchcase(source, pattern) for pattern in patterns)
+        entries.append((output_filename, source, static))
+    return entries
 
-    try:
-        with template_path.open(encoding='utf-8') as f:
-            template_config = json.load(f)
-        
-        # Basic validation for template config
-        if "structure" not in template_config:
-            raise ValueError(f"Template '{template_name}.json' is missing the 'structure' key.")
-        
+def fan_out(entry) -> Optional[tuple[str, str]]:
+    """
+    Returns ``(for_each expression, item variable name)`` for a ``content_files``
+    entry generating one file per list item, such as
+    ``"app/models/{{ entity.name }}.py": {"source": "model.py.jinja", "for_each": "entities", "as": "entity"}``,
+    or ``None`` for an entry generating a single file.
+    """
+    if isinstance(entry, dict) and "for_each" in entry:
+        return entry["for_each"], entry.get("as", DEFAULT_ITEM_NAME)
+    return None
+
+
+def resolve_template_config(template_name: str) -> dict:
+    """
+    Returns the flattened config of a template (with any templates it extends).
+
+    Raises :class:`TemplateNotFoundError` or :class:`TemplateConfigError`
+    instead of exiting, for callers embedding scaffoldor in a long-running process.
+    """
+    with span("config_load", template=template_name) as timing:
+        registry = get_registry()
+        entry = registry.get(template_name)
+
+        if entry is None:
+            raise TemplateNotFoundError(template_name, registry.names())
+
+        if "error" in entry:
+            raise TemplateConfigError(f"Error parsing template JSON '{template_name}.json': {entry['error']}")
+
+        try:
+            # Flattened once (including any templates it extends) and cached in the index.
+            # The cached config is shared, so hand out a copy callers are free to modify.
+            template_config = copy.deepcopy(registry.resolve(template_name))
+
+            # Basic validation for template config
+            if "structure" not in template_config:
+                raise ValueError(f"Template '{template_name}.json' is missing the 'structure' key.")
+            template_config = check_template_config(template_config, registry.templates_dir / "content")
+        except ValueError as e:
+            raise TemplateConfigError(f"Invalid template configuration in '{template_name}.json': {e}") from e
+
+        timing.files = len(template_config.get("content_files", {}))
         return template_config
-    except json.JSONDecodeError as e:
-        logger.error(f"Error parsing template JSON '{template_name}.json': {e}")
+
+
+def check_template_config(template_config: dict, content_dir: Path) -> dict:
+    """
+    Validates a flattened template config and returns it with its
+    ``content_roots`` expanded into content files (see :mod:`scaffoldor.discovery`).
+    Raises ``ValueError`` if anything is malformed.
+    """
+    validate_declarations(template_config.get("variables", {}))
+    structure_paths(template_config.get("structure", {}))
+    if "content_roots" in template_config:
+        validate_content_roots(template_config["content_roots"])
+        # Discovered once and kept in the content manifest until a directory below a root changes
+        template_config = expand_content_roots(template_config, content_dir)
+    validate_content_files(template_config)
+    return template_config
+
+
+def load_template_config(template_name: str) -> dict:
+    """Load project structure template (with any templates it extends) from the template registry index."""
+    try:
+        return resolve_template_config(template_name)
+    except TemplateNotFoundError as e:
+        template_path = get_registry().templates_dir / f"{template_name}.json"
+        logger.error(f"Template '{template_name}' not found at {template_path}.")
+        if e.available:
+            logger.info(f"Available templates: {', '.join(e.available)}")
+        else:
+            logger.info("No templates found. Use 'scaffoldor init <name>' to create one.")
         sys.exit(1)
-    except ValueError as e:
-        logger.error(f"Invalid template configuration in '{template_name}.json': {e}")
+    except TemplateConfigError as e:
+        logger.error(str(e))
         sys.exit(1)
 
 
-def list_templates_available() -> list[str]:
-    """Lists all available project templates."""
-    templates_dir = Path(__file__).parent / "templates"
-    template_files = [f.stem for f in templates_dir.glob("*.json") if f.is_file()]
-    return sorted(template_files)
+def list_templates_available(keyword: Optional[str] = None) -> list[str]:
+    """Lists all available project templates, optionally only those tagged with ``keyword``."""
+    return get_registry().names(keyword)
+
+
+@lru_cache(maxsize=None)
+def get_environment(enable_async: bool = False) -> Environment:
+    """
+    Returns the shared Jinja2 environment for the packaged templates.
+
+    The environment keeps compiled templates in memory, so reusing it across
+    projects in the same process compiles each template only once. Compiled
+    bytecode is also persisted in the user cache directory so later runs can
+    skip compiling altogether. ``enable_async`` returns the (separately
+    cached) environment used by :mod:`scaffoldor.aio`. The ``random`` filter
+    is seeded per file when a project is rendered with a seed.
+    """
+    with span("env_setup"):
+        from jinja2 import PackageLoader
+
+        # Set up Jinja2 environment to load templates from the package's templates/content directory
+        # The first argument is the package name, the second is the subdirectory within the package
+        return make_environment(PackageLoader("scaffoldor", "templates/content"), enable_async)
+
+
+def make_environment(loader, enable_async: bool = False) -> Environment:
+    """Returns a Jinja2 environment with scaffoldor's options and filters, loading templates through ``loader``."""
+    from jinja2 import Environment, pass_context, select_autoescape
+
+    env = Environment(
+        loader=loader,
+        autoescape=select_autoescape(["html", "xml"]),
+        trim_blocks=True, # Remove extra newlines for control structures
+        lstrip_blocks=True, # Remove leading whitespace from the start of a block
+        bytecode_cache=get_bytecode_cache(),
+        enable_async=enable_async,
+        # Jinja2 keeps 400 compiled templates by default, so larger templates were recompiled for every project
+        cache_size=-1,
+    )
+    # Same as the builtin, but draws from the file's seeded generator in deterministic mode
+    env.filters["random"] = pass_context(random_filter)
+    return env
+
+
+def build_render_context(
+    project_name: str,
+    context: Optional[dict] = None,
+    variables: Optional[TemplateVariables] = None,
+    seed: Optional[str] = None,
+) -> dict:
+    """
+    Returns the variables passed to every template of a project. With the
+    template's declared ``variables``, values are typed, defaults filled in
+    and derived variables computed (raises :class:`VariableError`); with a
+    ``seed``, derived variables using ``random`` are reproducible.
+    """
+    if variables is not None:
+        rng = file_random(seed, project_name, "") if seed is not None else None
+        return variables.resolve(project_name, context, rng)
+    # Extra template variables (e.g. from a batch manifest); project_name always wins
+    return {**(context or {}), "project_name": project_name}
+
+
+def _render_file(
+    env: Environment,
+    template_name: str,
+    relative_path: str,
+    render_context: dict,
+    backend: OutputBackend,
+    stream_buffer: Optional[int] = None,
+    seed: Optional[str] = None,
+    render_memo: Optional[RenderMemo] = None,
+) -> str:
+    """
+    Renders a single template, hands the result to ``backend`` as
+    ``relative_path`` and returns the SHA-256 of the written bytes.
+
+    With ``stream_buffer`` set, the output of ``template.generate()`` is passed
+    on chunk by chunk instead of being rendered into one string first. With a
+    ``seed``, randomness is drawn from the file's own generator and line
+    endings are normalized to ``\n``. With a ``render_memo``, an output
+    rendered before for the same values of the variables the template reads
+    is written again without rendering (streamed files are always rendered).
+    """
+    if seed is not None:
+        render_context = {**render_context, RNG_VARIABLE: file_random(seed, render_context["project_name"], relative_path)}
+    # Compiles the template, or fetches it from the environment's (or bytecode) cache
+    with span("compile", template=template_name):
+        template = env.get_template(template_name)
+    memo_key = None
+    if render_memo is not None and stream_buffer is None:
+        memo_key = render_memo.key(env, template, template_name, render_context, seed)
+        memoized = render_memo.get(memo_key) if memo_key is not None else None
+        if memoized is not None:
+            data, digest = memoized
+            with span("write", template=template_name) as timing:
+                backend.write_file(relative_path, data)
+                timing.files, timing.bytes = 1, len(data)
+            return digest
+    if stream_buffer is not None:
+        # Rendering and writing are interleaved when streaming, so they are timed together
+        with span("render", template=template_name) as timing:
+            text_chunks = template.generate(**render_context)
+            if seed is not None:
+                text_chunks = normalize_chunks(text_chunks)
+            chunks = (chunk.encode('utf-8') for chunk in text_chunks)
+            digest, timing.bytes = backend.write_stream(relative_path, chunks, stream_buffer)
+            timing.files = 1
+        return digest
+    with span("render", template=template_name) as timing:
+        text = template.render(**render_context)
+        if seed is not None:
+            text = normalize_newlines(text)
+        data = text.encode('utf-8')
+        timing.bytes = len(data)
+    with span("write", template=template_name) as timing:
+        backend.write_file(relative_path, data)
+        timing.files, timing.bytes = 1, len(data)
+    digest = hash_bytes(data)
+    if memo_key is not None:
+        render_memo.put(memo_key, data, digest)
+    return digest
+
+
+def template_directories(template_config: dict) -> list[str]:
+    """
+    Returns every directory a template's ``structure`` declares, however
+    deeply nested, as ``/``-separated paths (see :func:`~scaffoldor.tree.structure_paths`).
+    """
+    return structure_paths(template_config.get("structure", {}))
+
+
+def project_directories(template_config: dict) -> list[str]:
+    """
+    Returns the declared directories plus those holding content files; parents
+    are implied (see ``make_tree``). Directories of fanned-out files are only
+    known once their paths are rendered (see :func:`expand_content_entries`).
+    """
+    parents = {
+        posixpath.dirname(output_filename)
+        for output_filename, entry in template_config.get("content_files", {}).items()
+        if fan_out(entry) is None
+    }
+    return template_directories(template_config) + sorted(parents - {""})
+
+
+@lru_cache(maxsize=256)
+def _fan_out_templates(env: Environment, for_each: str, output_filename: str) -> tuple:
+    """Compiles a fan-out entry's list expression and output path once per environment."""
+    # Paths are not markup, whatever the environment's autoescaping says
+    path_source = f"{{% autoescape false %}}{output_filename}{{% endautoescape %}}"
+    return env.compile_expression(for_each), env.from_string(path_source)
+
+
+def expand_content_entries(env: Environment, template_config: dict, render_context: dict):
+    """
+    Yields ``(output path, source path, static, item context)`` for every file
+    a project gets. Entries with ``for_each`` (see :func:`fan_out`) yield one
+    file per item of their list, with the item in the context under the
+    entry's ``as`` name and the output path rendered from it. Other entries
+    yield themselves with an empty item context.
+
+    Items are produced lazily, so callers rendering as they go keep memory flat
+    however long the list is. Raises :class:`VariableError` when a list is
+    missing, :class:`TemplateConfigError` when a list expression or path is not
+    valid Jinja2, and ``ValueError`` for rendered paths that leave the project or collide.
+    """
+    from jinja2 import TemplateError
+
+    seen = set()
+    entries = zip(content_entries(template_config), template_config.get("content_files", {}).values())
+    for (output_filename, source, static), entry in entries:
+        repeat = fan_out(entry)
+        if repeat is None:
+            seen.add(output_filename)
+            yield output_filename, source, static, {}
+            continue
+        for_each, name = repeat
+        try:
+            items_expression, path_template = _fan_out_templates(env, for_each, output_filename)
+            items = items_expression(**render_context)
+        except TemplateError as e:
+            raise TemplateConfigError(f"Content file '{output_filename}' has an invalid 'for_each' or path: {e}") from e
+        if isinstance(items, (str, bytes, dict)) or not isinstance(items, Iterable):
+            raise VariableError(f"'for_each' of content file '{output_filename}' must give a list, got {items!r}.")
+        for item in items:
+            item_context = {name: item}
+            try:
+                path = "/".join(_path_parts(path_template.render(**render_context, **item_context)))
+            except TemplateError as e:
+                raise TemplateConfigError(f"Content file '{output_filename}' has an invalid path: {e}") from e
+            if path in seen:
+                raise ValueError(f"Content file '{output_filename}' produces '{path}' more than once.")
+            seen.add(path)
+            yield path, source, static, item_context
+
+
+def static_root(env: Environment) -> Path:
+    """Returns the directory static content files are copied from: where ``env`` loads templates from."""
+    searchpath = getattr(env.loader, "searchpath", None)
+    return Path(searchpath[0]) if searchpath else default_templates_dir() / "content"
+
+
+def copy_static_file(content_dir: Path, template_name: str, relative_path: str, backend: OutputBackend, link_mode: str) -> str:
+    """
+    Copies the static content file ``template_name`` to ``backend`` as
+    ``relative_path`` without decoding it and returns its SHA-256, which is
+    also its source hash.
+    """
+    source_path = content_dir / template_name
+    with span("write", template=template_name) as timing:
+        timing.bytes = backend.copy_static(relative_path, source_path, link_mode)
+        timing.files = 1
+    digest = hash_source_file(source_path)
+    if digest is None:
+        raise OSError(f"Cannot read static file '{source_path}'")
+    return digest
+
+
+def copy_bundled_file(bundle, template_name: str, relative_path: str, backend: OutputBackend) -> str:
+    """
+    Writes the static content file ``template_name`` of a template bundle to
+    ``backend`` as ``relative_path``, straight from the bundle's mapping, and
+    returns its SHA-256 recorded when the bundle was packed.
+    """
+    with span("write", template=template_name) as timing:
+        data = bundle.read(template_name)
+        backend.write_file(relative_path, data)
+        timing.files, timing.bytes = 1, len(data)
+    return bundle.digest(template_name)
+
+
+def template_source_hash(env: Environment, template_name: str) -> str:
+    """Returns the SHA-256 of a template's source as seen by the environment's loader."""
+    source, _, _ = env.loader.get_source(env, template_name)
+    return hash_bytes(source.encode('utf-8'))
+
+
+def file_dependencies(env: Environment, template_name: str) -> tuple[str, Optional[frozenset]]:
+    """
+    Returns what a file rendered from a template depends on: a hash of the
+    template's source together with every template it includes, imports or
+    extends, and the variables they read. The variables are ``None`` when
+    they cannot be known, i.e. when a template to load is chosen at render time.
+    """
+    dependencies = analyze_template(env, template_name, follow_references=True)
+    if dependencies is None:
+        return template_source_hash(env, template_name), None
+    if len(dependencies.templates) == 1:
+        source_hash = template_source_hash(env, template_name)
+    else:
+        sources = "".join(f"{name} {template_source_hash(env, name)}\n" for name in dependencies.templates)
+        source_hash = hash_bytes(sources.encode("utf-8"))
+    # Random values are drawn per project (and file)
+    variables = dependencies.variables | {"project_name"} if dependencies.random else dependencies.variables
+    return source_hash, variables
+
+
+def variables_hash(variables: Optional[frozenset], file_context: dict) -> Optional[str]:
+    """Hashes the values ``file_context`` gives ``variables`` (see :func:`file_dependencies`); ``None`` if unknown."""
+    if variables is None:
+        return None
+    return hash_context({name: file_context[name] for name in variables if name in file_context})
+
+
+def run_in_order(calls: Iterable, jobs: int = 1) -> list:
+    """
+    Runs ``(function, *args)`` calls, on a thread pool when ``jobs`` is greater
+    than one, and returns a ``(result, error)`` pair per call in the order the
+    calls were given, so callers can report outcomes deterministically.
+
+    ``calls`` may be a generator: it is consumed as the pool makes progress,
+    with at most :data:`PENDING_CALLS_PER_JOB` calls per worker submitted ahead.
+    """
+    if jobs > 1:
+        outcomes = []
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            for function, *args in calls:
+                pending.append(pool.submit(function, *args))
+                if len(pending) >= jobs * PENDING_CALLS_PER_JOB:
+                    outcomes.append(_outcome(pending.popleft()))
+            outcomes.extend(_outcome(future) for future in pending)
+        return outcomes
+    outcomes = []
+    for function, *args in calls:
+        try:
+            outcomes.append((function(*args), None))
+        except Exception as e:
+            outcomes.append((None, e))
+    return outcomes
+
+
+def _outcome(future) -> tuple:
+    error = future.exception()
+    return (None, error) if error else (future.result(), None)
 
 
 def create_files(
@@ -51,53 +468,276 @@ def create_files(
     template_config: dict,
     dry_run: bool = False,
     verbose: bool = False,
-) -> None:
-    """Creates boilerplate files using Jinja2 templates."""
-    
-    # Set up Jinja2 environment to load templates from the package's templates/content directory
-    # The first argument is the package name, the second is the subdirectory within the package
-    env = Environment(
-        loader=PackageLoader("scaffoldor", "templates/content"),
-        autoescape=select_autoescape(["html", "xml"]),
-        trim_blocks=True, # Remove extra newlines for control structures
-        lstrip_blocks=True # Remove leading whitespace from the start of a block
-    )
+    env: Optional[Environment] = None,
+    context: Optional[dict] = None,
+    jobs: int = 1,
+    stream: bool = False,
+    stream_buffer: int = STREAM_BUFFER_BYTES,
+    backend: Optional[OutputBackend] = None,
+    render_context: Optional[dict] = None,
+    seed: Optional[str] = None,
+    static_link: str = "reflink",
+    render_memo: Optional[RenderMemo] = None,
+    make_parents: bool = True,
+) -> dict:
+    """
+    Creates boilerplate files using Jinja2 templates.
+
+    Returns a record per created file with the template it came from and the
+    hashes of the template source and of the rendered output.
+
+    With ``jobs`` greater than one, files are rendered and written concurrently
+    by a thread pool. Results are still reported in ``content_files`` order and
+    every failure is collected into a single error report.
+
+    With ``stream`` enabled, each file is rendered chunk by chunk and written
+    through a buffer of at most ``stream_buffer`` bytes into a temporary file
+    that is atomically renamed into place, so memory use stays flat however
+    large the generated files are.
+
+    Files go to ``backend`` (see :mod:`scaffoldor.backends`), by default the
+    file system below ``project_root``. A ``render_context`` built once by
+    the caller is shared by every file; otherwise one is built from ``context``.
+    A ``seed`` makes the output reproducible (see :func:`_render_file`).
+
+    Static entries (see :func:`content_entries`) are never decoded or
+    rendered: they are copied from the directory ``env`` loads templates from,
+    in the kernel where possible, or created as ``static_link``
+    (``"hardlink"``, ``"reflink"`` or ``"copy"``, see :mod:`scaffoldor.copying`).
+
+    Entries with ``for_each`` generate one file per list item (see
+    :func:`expand_content_entries`). The list is expanded while files are
+    rendered, each template is compiled once for all its items and only file
+    hashes are kept, so memory stays flat however many items there are.
+
+    Batch callers pass one ``render_memo`` for all their projects, so files
+    whose variables have the same values are rendered once (see :class:`RenderMemo`).
+    Callers that already created every declared parent directory pass
+    ``make_parents=False``; those of fanned-out files are created as their paths are rendered.
+    """
+    if env is None:
+        env = get_environment()
+    if backend is None:
+        backend = FilesystemBackend(project_root)
 
-    content_files = template_config.get("content_files", {})
-    
     if dry_run and verbose:
         logger.info("[Dry-run] Would create the following files:")
 
-    for output_filename, template_relative_path in content_files.items():
-        file_path = project_root / output_filename
-        
-        # Determine the correct template path for Jinja2 loader
-        # If template_relative_path is like "content/README.md.jinja", Jinja2 loader expects "README.md.jinja"
-        # because the loader's base is already "scaffoldor/templates/content"
-        # However, if template_relative_path is "my_template_example/README.md.jinja"
-        # the loader expects "my_template_example/README.md.jinja"
-        
-        template_name_in_loader = template_relative_path # By default, assume the path as given is relative to the loader's base
-
-        if dry_run:
-            if verbose:
-                logger.info(f"  - {file_path} (from template: {template_name_in_loader})")
+    # Determine the correct template path for Jinja2 loader
+    # If template_relative_path is like "content/README.md.jinja", Jinja2 loader expects "README.md.jinja"
+    # because the loader's base is already "scaffoldor/templates/content"
+    # However, if template_relative_path is "my_template_example/README.md.jinja"
+    # the loader expects "my_template_example/README.md.jinja"
+    # By default, assume the path as given is relative to the loader's base
+    entries = content_entries(template_config)
+    repeated = [fan_out(entry) for entry in template_config.get("content_files", {}).values()]
+
+    if dry_run:
+        if verbose:
+            for (output_filename, template_name_in_loader, static), repeat in zip(entries, repeated):
+                each = f", one per item of '{repeat[0]}'" if repeat else ""
+                logger.info(f"  - {project_root / output_filename} ({'static copy of' if static else 'from template'}: "
+                            f"{template_name_in_loader}{each})")
+        return {}
+
+    if render_context is None:
+        render_context = build_render_context(project_name, context, TemplateVariables.from_config(template_config), seed)
+
+    # Every parent directory has to exist before the first file is written
+    if make_parents:
+        with span("mkdir") as timing:
+            parents = {posixpath.dirname(output) for (output, _, _), repeat in zip(entries, repeated) if repeat is None}
+            timing.files = backend.make_tree(parents - {""})
+
+    buffer_bytes = stream_buffer if stream else None
+    content_dir = static_root(env)
+    # Templates packed with 'scaffoldor pack' carry their static files too (see scaffoldor.bundle)
+    bundle = getattr(env.loader, "bundle", None)
+    # Files in the order they were handed to run_in_order, filled in as fan-out lists are expanded
+    tasks = []
+    fan_out_parents = set()
+
+    def calls():
+        for output_filename, template_name_in_loader, static, item_context in expand_content_entries(
+                env, template_config, render_context):
+            tasks.append((output_filename, template_name_in_loader, static, item_context))
+            relative_path = Path(output_filename).as_posix()
+            parent = posixpath.dirname(relative_path)
+            if item_context and parent and parent not in fan_out_parents:
+                # Rendered paths may name directories the template does not declare
+                with span("mkdir") as timing:
+                    timing.files = backend.make_tree([parent])
+                fan_out_parents.add(parent)
+            if static and bundle is not None:
+                yield copy_bundled_file, bundle, template_name_in_loader, relative_path, backend
+            elif static:
+                yield copy_static_file, content_dir, template_name_in_loader, relative_path, backend, static_link
+            else:
+                file_context = {**render_context, **item_context} if item_context else render_context
+                yield (_render_file, env, template_name_in_loader, relative_path, file_context, backend, buffer_bytes, seed,
+                       render_memo)
+
+    try:
+        outcomes = run_in_order(calls(), jobs)
+    except (VariableError, TemplateConfigError, ValueError) as e:
+        logger.error(f"Failed to expand the content files: {e}")
+        sys.exit(1)
+
+    errors = []
+    records = {}
+    # Fanned-out files share their template, so each one is analyzed once
+    dependencies = {}
+    for (output_filename, template_name_in_loader, static, item_context), (digest, error) in zip(tasks, outcomes):
+        if error is not None:
+            errors.append(f"'{output_filename}' from template '{template_name_in_loader}': {error}")
             continue
+        if static:
+            records[output_filename] = {"template": template_name_in_loader, "source": digest, "output": digest}
+        else:
+            if template_name_in_loader not in dependencies:
+                dependencies[template_name_in_loader] = file_dependencies(env, template_name_in_loader)
+            source_hash, variables = dependencies[template_name_in_loader]
+            file_context = {**render_context, **item_context} if item_context else render_context
+            records[output_filename] = {
+                "template": template_name_in_loader,
+                "source": source_hash,
+                "context": variables_hash(variables, file_context),
+                "output": digest,
+            }
+        if verbose:
+            logger.debug(f"Created file: {project_root / output_filename}")
 
-        try:
-            template = env.get_template(template_name_in_loader)
-            content = template.render(project_name=project_name)
+    if errors:
+        logger.error(f"Failed to generate {len(errors)} file(s):")
+        for error in errors:
+            logger.error(f"  - {error}")
+        sys.exit(1)
 
-            if verbose:
-                logger.debug(f"Creating file: {file_path}")
-            file_path.write_text(content, encoding='utf-8')
-        except Exception as e:
-            logger.error(f"Error generating file '{output_filename}' from template '{template_name_in_loader}': {e}")
+    _report_success(project_name)
+    return records
+
+
+def _report_success(project_name: str) -> None:
+    logger.info(f"\n🎉 Project '{project_name}' scaffolded successfully!")
+    logger.info(f"Next steps:\n  cd {project_name}\n  # Start building your secure app!\n")
+
+
+def output_cache_inputs(project_name: str, template_name: str, template_config: dict, variables: dict, seed: str,
+                        env: Optional[Environment] = None) -> Optional[dict]:
+    """
+    Everything a seeded project's bytes depend on, for :meth:`OutputCache.key`:
+    the flattened config, the variables, the seed and the content of every
+    file the template uses, as seen by ``env``'s loader. That includes the
+    templates its content files include, import or extend (see
+    :func:`~scaffoldor.bundle.bundle_sources`). Sources of a template bundle
+    have their hashes recorded in it.
+
+    Returns ``None`` when the inputs cannot be known, because a template
+    chooses what to load at render time. Such projects are never cached.
+    """
+    from .bundle import bundle_sources
+
+    if env is None:
+        env = get_environment()
+    try:
+        sources = bundle_sources(template_config, env, strict=True)
+    except TemplateConfigError as e:
+        logger.debug(f"Not using the output cache: {e}")
+        return None
+    bundle = getattr(env.loader, "bundle", None)
+    static = {path for _, path, is_static in content_entries(template_config) if is_static}
+    if bundle is not None:
+        hashes = {path: bundle.digest(path) for path in sources}
+    else:
+        content_dir = static_root(env)
+        hashes = {
+            path: hash_source_file(content_dir / path) if path in static else template_source_hash(env, path)
+            for path in sources
+        }
+    return {
+        "template": template_name,
+        "config": template_config,
+        "sources": hashes,
+        "project_name": project_name,
+        "variables": variables,
+        "seed": seed,
+    }
+
+
+def _materialize_cached(output_cache: OutputCache, key: str, staging: Path, cache_link: str) -> bool:
+    """Fills ``staging`` from the output cache; returns False (leaving it empty) if there is no usable entry."""
+    tree = output_cache.lookup(key)
+    if tree is None:
+        return False
+    try:
+        with span("materialize") as timing:
+            used = copy_tree(tree, staging, cache_link, FILE_MODE, DIR_MODE)
+            timing.files = sum(used.values())
+    except OSError as e:
+        # Most likely evicted by another process while we were copying
+        logger.debug(f"Could not use the cached project, rendering it instead: {e}")
+        shutil.rmtree(staging)
+        staging.mkdir()
+        os.chmod(staging, DIR_MODE)
+        return False
+    logger.info(f"Materialized project from the output cache ({', '.join(f'{count} {how}' for how, count in used.items())})")
+    return True
+
+
+def _write_project(
+    project_path: Path,
+    template_name: str,
+    template_config: dict,
+    backend: OutputBackend,
+    verbose: bool,
+    env: Optional[Environment],
+    variables: dict,
+    render_context: dict,
+    jobs: int,
+    stream: bool,
+    stream_buffer: int,
+    seed: Optional[str],
+    static_link: str,
+    render_memo: Optional[RenderMemo],
+) -> str:
+    """
+    Writes the directories, files and manifest of a project to ``backend``.
+    The manifest records the input ``variables`` so ``update`` can rebuild
+    the context. Returns the project's tree hash.
+    """
+    # The whole tree, including the directories of content files, in one pass
+    with span("mkdir") as timing:
+        directories = project_directories(template_config)
+        if verbose:
+            for directory in directories:
+                logger.debug(f"Creating folder: {project_path / directory}")
+        try:
+            timing.files = backend.make_tree(directories)
+        except OSError as e:
+            logger.error(f"Failed to create the directories of '{project_path}': {e}")
             sys.exit(1)
 
-    if not dry_run:
-        logger.info(f"\n🎉 Project '{project_name}' scaffolded successfully!")
-        logger.info(f"Next steps:\n  cd {project_name}\n  # Start building your secure app!\n")
+    records = create_files(
+        project_path,
+        project_path.name,
+        template_config,
+        verbose=verbose,
+        env=env,
+        jobs=jobs,
+        stream=stream,
+        stream_buffer=stream_buffer,
+        backend=backend,
+        render_context=render_context,
+        seed=seed,
+        static_link=static_link,
+        render_memo=render_memo,
+        make_parents=False,
+    )
+    directories = template_directories(template_config)
+    with span("manifest"):
+        manifest = build_manifest(template_name, variables, hash_context(render_context), records, directories, seed)
+        backend.write_file(MANIFEST_NAME, manifest)
+    return tree_hash(records, directories)
 
 
 def create_structure(
@@ -105,51 +745,141 @@ def create_structure(
     template_name: str = "default",
     dry_run: bool = False,
     verbose: bool = False,
+    template_config: Optional[dict] = None,
+    env: Optional[Environment] = None,
+    context: Optional[dict] = None,
+    jobs: int = 1,
+    stream: bool = False,
+    stream_buffer: int = STREAM_BUFFER_BYTES,
+    plan: Optional[dict] = None,
+    backend: Optional[OutputBackend] = None,
+    durable: bool = True,
+    template_variables: Optional[TemplateVariables] = None,
+    seed: Optional[str] = None,
+    output_cache: bool = True,
+    cache_link: str = "reflink",
+    static_link: str = "reflink",
+    render_memo: Optional[RenderMemo] = None,
 ) -> None:
     """
     Creates the project directory structure and files based on a template.
+
+    Callers scaffolding many projects can pass an already loaded
+    ``template_config`` and Jinja2 ``env`` to skip re-reading them, and extra
+    template variables through ``context``. ``jobs``, ``stream`` and
+    ``stream_buffer`` are passed on to :func:`create_files`.
+
+    The render context is built once per project from the template's declared
+    variables; batch callers pass one ``template_variables`` per template so
+    that values shared by every project are only computed once, and one
+    ``render_memo`` so that files not specific to a project are rendered once.
+
+    With a ``seed`` the output is deterministic: template randomness is seeded
+    per project and file, line endings are normalized and file modes fixed,
+    so the same inputs give a byte-identical project with the same tree hash.
+    Seeded projects written to disk also go through the output cache (unless
+    ``output_cache`` is false): a project generated before from the same
+    inputs is recreated from the cache by ``cache_link`` (``"reflink"`` or
+    ``"copy"``, see :data:`~scaffoldor.cache.CACHE_LINK_MODES`) without rendering.
+    ``static_link`` is how static content files are created (see :func:`create_files`).
+
+    The project is written into a staging directory next to ``project_path``
+    and renamed into place once complete, so nobody ever sees a partial
+    project and a failure leaves nothing behind. With ``durable`` the staged
+    files are flushed to disk once, right before the rename.
+
+    When a precompiled ``plan`` (see ``scaffoldor compile``) is given, the
+    project is created from it instead, usually without importing Jinja2.
+
+    ``backend`` receives the directories and files instead of the file system,
+    e.g. a :class:`~scaffoldor.backends.TarBackend` streaming an archive; only
+    ``project_path.name`` is used then.
     """
-    if project_path.exists():
+    if cache_link not in CACHE_LINK_MODES:
+        raise ValueError(f"'cache_link' must be one of {', '.join(CACHE_LINK_MODES)}")
+
+    if plan is not None:
+        from .plan import execute_plan
+
+        execute_plan(
+            plan, project_path, dry_run=dry_run, verbose=verbose, context=context, durable=durable, seed=seed,
+        )
+        return
+
+    on_disk = backend is None
+    if on_disk and project_path.exists():
         logger.error(f"Directory '{project_path}' already exists. Choose a different name or path.")
         sys.exit(1)
 
-    template_config = load_template_config(template_name)
-    structure = template_config.get("structure", {})
+    if template_config is None:
+        template_config = load_template_config(template_name)
+    elif "content_roots" in template_config:
+        # A config built by the caller rather than loaded (and expanded) from the registry
+        try:
+            validate_content_roots(template_config["content_roots"])
+            template_config = expand_content_roots(template_config, static_root(env or get_environment()))
+        except ValueError as e:
+            logger.error(f"Invalid template configuration: {e}")
+            sys.exit(1)
 
     if dry_run:
         logger.info(f"[Dry-run] Would create project at {project_path}")
         logger.info("[Dry-run] Directory structure:")
-        for folder, subfolders in structure.items():
-            logger.info(f"  - {project_path.name}/{folder}/")
-            for subfolder in subfolders:
-                logger.info(f"    - {project_path.name}/{folder}/{subfolder}/")
-        create_files(project_path, project_path.name, template_config, dry_run=True, verbose=True)
+        for directory in template_directories(template_config):
+            indent = "  " if "/" not in directory else "    "
+            logger.info(f"{indent}- {project_path.name}/{directory}/")
+        create_files(project_path, project_path.name, template_config, dry_run=True, verbose=True, env=env, context=context)
         logger.info("[Dry-run] No files or directories were actually created.")
         return
 
-    logger.info(f"Creating project at {project_path}")
     try:
-        project_path.mkdir(parents=True)
-        logger.debug(f"Created root project directory: {project_path}")
-    except OSError as e:
-        logger.error(f"Failed to create project directory '{project_path}': {e}")
+        if template_variables is None:
+            template_variables = TemplateVariables.from_config(template_config)
+        render_context = build_render_context(project_path.name, context, template_variables, seed)
+    except (VariableError, TemplateConfigError) as e:
+        logger.error(str(e))
         sys.exit(1)
+    variables = {**template_variables.shared, **(context or {})}
 
-    for folder, subfolders in structure.items():
-        folder_path = project_path / folder
-        try:
-            if verbose:
-                logger.debug(f"Creating folder: {folder_path}")
-            folder_path.mkdir(exist_ok=True)
-            for subfolder in subfolders:
-                subfolder_path = folder_path / subfolder
-                if verbose:
-                    logger.debug(f"Creating subfolder: {subfolder_path}")
-                subfolder_path.mkdir(parents=True, exist_ok=True)
-        except OSError as e:
-            logger.error(f"Failed to create directory '{folder_path}' or its subfolders: {e}")
-            # Attempt to clean up partially created project
-            shutil.rmtree(project_path, ignore_errors=True)
-            sys.exit(1)
+    if seed is not None and not on_disk:
+        # Archive members are written in completion order, which threads would make vary
+        jobs = 1
+    options = (verbose, env, variables, render_context, jobs, stream, stream_buffer, seed, static_link, render_memo)
+    if not on_disk:
+        logger.info(f"Writing project '{project_path.name}' to {type(backend).__name__}")
+        digest = _write_project(project_path, template_name, template_config, backend, *options)
+        if seed is not None:
+            logger.info(f"Tree hash: {digest}")
+        return
+
+    cache = get_output_cache() if seed is not None and output_cache else None
+    if cache is not None:
+        inputs = output_cache_inputs(project_path.name, template_name, template_config, variables, seed, env)
+        if inputs is None:
+            cache = None
+        else:
+            cache_key = cache.key(inputs)
 
-    create_files(project_path, project_path.name, template_config, dry_run=dry_run, verbose=verbose)
\ No newline at end of file
+    logger.info(f"Creating project at {project_path}")
+    try:
+        with staged_project(project_path, durable=durable) as staging:
+            logger.debug(f"Staging project in {staging}")
+            if seed is not None:
+                os.chmod(staging, DIR_MODE)
+            if cache is not None and _materialize_cached(cache, cache_key, staging, cache_link):
+                digest = read_manifest(staging)["tree_hash"]
+                _report_success(project_path.name)
+            else:
+                staging_backend = FilesystemBackend(staging, fixed_modes=seed is not None)
+                digest = _write_project(project_path, template_name, template_config, staging_backend, *options)
+                if cache is not None:
+                    with span("cache_store"):
+                        cache.store(cache_key, staging)
+    except ProjectExistsError:
+        logger.error(f"Directory '{project_path}' was created by someone else while scaffolding; nothing was written.")
+        sys.exit(1)
+    except OSError as e:
+        logger.error(f"Failed to create project '{project_path}': {e}")
+        sys.exit(1)
+    if seed is not None:
+        logger.info(f"Tree hash: {digest}")
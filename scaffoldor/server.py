@@ -0,0 +1,358 @@
+# scaffoldor/server.py
+import io
+import json
+import logging
+import hmac
+import os
+import secrets
+import signal
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from typing import Optional
+
+from . import __version__
+from .backends import OutputBackend, archive_backend
+from .cache import CACHE_LINK_MODES
+from .client import server_token_path
+from .exceptions import ScaffoldError
+from .memo import RenderMemo
+from .registry import get_registry
+from .reproducible import source_date_epoch
+from .scaffold import create_structure, get_environment, resolve_template_config
+from .variables import TemplateVariables
+
+logger = logging.getLogger("scaffoldor")
+
+ARCHIVE_CONTENT_TYPES = {"tar": "application/x-tar", "tar.gz": "application/gzip", "zip": "application/zip"}
+
+# Seconds between checks of the templates directory for changed template configs
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Host headers accepted over TCP, so pages on other origins cannot reach the daemon by DNS rebinding
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost")
+
+
+class _ErrorCollector(logging.Handler):
+    """Collects the error messages the current thread logs while a request is handled."""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.thread = threading.get_ident()
+        self.messages = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.thread == self.thread:
+            self.messages.append(record.getMessage())
+
+
+@contextmanager
+def _collect_errors():
+    collector = _ErrorCollector()
+    logger.addHandler(collector)
+    try:
+        yield collector.messages
+    finally:
+        logger.removeHandler(collector)
+
+
+class ScaffoldService:
+    """
+    The state a daemon keeps warm between requests: flattened template configs,
+    the shared Jinja2 environment (whose compiled templates stay in memory)
+    and a :class:`~scaffoldor.memo.RenderMemo` of outputs shared between projects.
+
+    :meth:`poll` re-checks the templates directory and drops cached configs when
+    any template JSON file changed. Edited content files are picked up by
+    Jinja2 itself, which checks each template's mtime before reusing it.
+    """
+
+    def __init__(self, roots: Optional[list] = None):
+        # Projects may only be created below these directories
+        self.roots = [Path(root).resolve() for root in (roots or [Path.home()])]
+        self.registry = get_registry()
+        self.configs = {}
+        self._lock = threading.Lock()
+        self._stamp = self._templates_stamp()
+        self.env = get_environment()
+        # Outputs that do not depend on the project are shared between requests
+        self.render_memo = RenderMemo()
+
+    def _templates_stamp(self) -> dict:
+        return {name: (entry["mtime_ns"], entry["size"]) for name, entry in self.registry.refresh().items()}
+
+    def poll(self) -> bool:
+        """Invalidates cached configs if the templates changed; returns whether they did."""
+        stamp = self._templates_stamp()
+        if stamp == self._stamp:
+            return False
+        with self._lock:
+            self.configs.clear()
+            self.render_memo.clear()
+            self._stamp = stamp
+        logger.info("Templates changed; cleared cached template configs.")
+        return True
+
+    def config(self, template_name: str) -> tuple[dict, TemplateVariables]:
+        """Returns a template's config and its variables, whose defaults and shared derived values stay computed."""
+        with self._lock:
+            cached = self.configs.get(template_name)
+        if cached is None:
+            config = resolve_template_config(template_name)
+            cached = (config, TemplateVariables.from_config(config))
+            with self._lock:
+                self.configs[template_name] = cached
+        return cached
+
+    def allows(self, project_path: Path) -> bool:
+        """Whether ``project_path`` (with symlinks resolved) lies below one of the daemon's roots."""
+        resolved = project_path.resolve()
+        return any(resolved.is_relative_to(root) for root in self.roots)
+
+    def create(self, project_path: Path, template_name: str, context: dict, jobs: int = 1,
+               backend: Optional[OutputBackend] = None, seed: Optional[str] = None, **options) -> dict:
+        """
+        Creates a project; raises ScaffoldError with whatever the pipeline logged if it fails.
+        ``options`` are passed on to :func:`~scaffoldor.scaffold.create_structure` (``durable``,
+        ``output_cache``, ``cache_link``).
+        """
+        config, variables = self.config(template_name)
+        with _collect_errors() as errors:
+            try:
+                create_structure(
+                    project_path, template_name=template_name, template_config=config,
+                    env=self.env, context=context, jobs=jobs, backend=backend, template_variables=variables,
+                    seed=seed, render_memo=self.render_memo, **options,
+                )
+            except SystemExit:
+                raise ScaffoldError("\n".join(errors) or f"Failed to create project '{project_path}'.") from None
+        return {"project_path": str(project_path), "files": len(config.get("content_files", {}))}
+
+    def archive(self, project_name: str, template_name: str, context: dict, archive_format: str = "tar",
+                seed: Optional[str] = None) -> bytes:
+        """Renders a project straight into an in-memory archive and returns its bytes (reproducible with a ``seed``)."""
+        buffer = io.BytesIO()
+        mtime = source_date_epoch() if seed is not None else None
+        with archive_backend(archive_format, buffer, prefix=project_name, mtime=mtime) as backend:
+            self.create(Path(project_name), template_name, context, backend=backend, seed=seed)
+        return buffer.getvalue()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server_version = f"scaffoldor/{__version__}"
+
+    def log_message(self, format, *args) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "local"
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        self._send(status, json.dumps(payload).encode("utf-8"))
+
+    def _authorized(self) -> bool:
+        """
+        Checks a TCP request's Host header and bearer token; sends 403 or 401
+        and returns False when they are wrong. Unix socket requests are
+        authorized by the socket's permissions.
+        """
+        token = self.server.token
+        if token is None:
+            return True
+        host = (self.headers.get("Host") or "").rsplit(":", 1)
+        if host[0] not in LOOPBACK_HOSTS or (len(host) == 2 and host[1] != str(self.server.server_address[1])):
+            self._send_json(403, {"error": "Requests must be addressed to the loopback interface.", "type": "Forbidden"})
+            return False
+        supplied = self.headers.get("Authorization", "")
+        if not hmac.compare_digest(supplied.encode("utf-8"), f"Bearer {token}".encode("utf-8")):
+            self._send_json(401, {"error": "Missing or invalid server token.", "type": "Unauthorized"})
+            return False
+        return True
+
+    def do_GET(self) -> None:
+        if not self._authorized():
+            return
+        if self.path != "/health":
+            self._send_json(404, {"error": f"Unknown endpoint '{self.path}'.", "type": "NotFound"})
+            return
+        service = self.server.service
+        self._send_json(200, {
+            "version": __version__,
+            "pid": os.getpid(),
+            "templates": len(service.registry.entries or {}),
+            "cached_configs": len(service.configs),
+        })
+
+    def do_POST(self) -> None:
+        if not self._authorized():
+            return
+        # Browsers may send text/plain cross-origin without a preflight, but never application/json
+        if self.headers.get_content_type() != "application/json":
+            self._send_json(415, {"error": "Requests must be sent as application/json.", "type": "UnsupportedMediaType"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            self._send_json(400, {"error": f"Invalid request body: {e}", "type": "BadRequest"})
+            return
+
+        service = self.server.service
+        template_name = request.get("template") or "default"
+        context = request.get("variables") or {}
+        seed = None if request.get("seed") is None else str(request["seed"])
+        start = time.perf_counter()
+        try:
+            if self.path == "/create":
+                if not request.get("project_path") or not Path(request["project_path"]).is_absolute():
+                    raise ValueError("'project_path' must be an absolute path")
+                if not service.allows(Path(request["project_path"])):
+                    roots = ", ".join(map(str, service.roots))
+                    self._send_json(403, {"error": f"'project_path' must be below {roots}.", "type": "Forbidden"})
+                    return
+                options = {"durable": bool(request.get("durable", True)),
+                           "output_cache": bool(request.get("output_cache", True))}
+                if request.get("cache_link") is not None:
+                    if request["cache_link"] not in CACHE_LINK_MODES:
+                        raise ValueError(f"'cache_link' must be one of {', '.join(CACHE_LINK_MODES)}")
+                    options["cache_link"] = request["cache_link"]
+                result = service.create(
+                    Path(request["project_path"]), template_name, context, int(request.get("jobs", 1)), seed=seed,
+                    **options,
+                )
+                result["elapsed_ms"] = (time.perf_counter() - start) * 1000
+                self._send_json(200, result)
+            elif self.path == "/archive":
+                if not request.get("project_name"):
+                    raise ValueError("'project_name' is required")
+                archive_format = request.get("format") or "tar"
+                if archive_format not in ARCHIVE_CONTENT_TYPES:
+                    raise ValueError(f"'format' must be one of {', '.join(ARCHIVE_CONTENT_TYPES)}")
+                data = service.archive(Path(request["project_name"]).name, template_name, context, archive_format, seed)
+                self._send(200, data, ARCHIVE_CONTENT_TYPES[archive_format])
+            else:
+                self._send_json(404, {"error": f"Unknown endpoint '{self.path}'.", "type": "NotFound"})
+        except ValueError as e:
+            self._send_json(400, {"error": str(e), "type": "BadRequest"})
+        except ScaffoldError as e:
+            self._send_json(422, {"error": str(e), "type": type(e).__name__})
+        except Exception as e:
+            # The daemon keeps serving, and the client learns what happened instead of seeing a dropped connection
+            logger.exception(f"Unexpected error handling {self.path}")
+            self._send_json(500, {"error": f"Internal server error: {e}", "type": type(e).__name__})
+
+
+class ScaffoldHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service: ScaffoldService, token: Optional[str] = None):
+        self.service = service
+        # Required from TCP clients as "Authorization: Bearer <token>"
+        self.token = token
+        super().__init__(address, _RequestHandler)
+
+
+class ScaffoldUnixServer(ScaffoldHTTPServer):
+    address_family = getattr(socket, "AF_UNIX", None)
+
+    def server_bind(self) -> None:
+        # HTTPServer.server_bind expects a (host, port) address. The socket is
+        # created owner-only, as only the owner may ask the daemon to write files.
+        previous = os.umask(0o177)
+        try:
+            self.socket.bind(self.server_address)
+        finally:
+            os.umask(previous)
+        self.server_name, self.server_port = "localhost", 0
+
+
+def _clear_stale_socket(socket_path: Path) -> None:
+    if not socket_path.exists():
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(socket_path))
+    except OSError:
+        socket_path.unlink()  # Left behind by a daemon that did not shut down cleanly
+        return
+    finally:
+        probe.close()
+    raise ScaffoldError(f"A scaffoldor server is already listening on {socket_path}.")
+
+
+def _write_token(server: ScaffoldHTTPServer) -> Path:
+    """Writes the server's token to an owner-only file that local clients read (see :func:`~scaffoldor.client.server_token_path`)."""
+    token_path = server_token_path(server.server_address[1])
+    token_path.parent.mkdir(parents=True, exist_ok=True)
+    token_path.unlink(missing_ok=True)
+    fd = os.open(token_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(server.token)
+    return token_path
+
+
+def make_server(socket_path: Optional[Path] = None, port: Optional[int] = None,
+                roots: Optional[list] = None) -> ScaffoldHTTPServer:
+    """
+    Builds (but does not start) a daemon on a Unix socket, or on
+    ``127.0.0.1:port`` if ``port`` is given. Over TCP every request needs the
+    token the daemon writes to an owner-only file. Projects can only be
+    created below ``roots`` (default: the home directory).
+    """
+    service = ScaffoldService(roots)
+    if port is not None:
+        server = ScaffoldHTTPServer(("127.0.0.1", port), service, token=secrets.token_urlsafe(32))
+        _write_token(server)
+        return server
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    _clear_stale_socket(socket_path)
+    return ScaffoldUnixServer(str(socket_path), service)
+
+
+def serve(socket_path: Optional[Path] = None, port: Optional[int] = None,
+          poll_interval: float = DEFAULT_POLL_INTERVAL, roots: Optional[list] = None) -> None:
+    """Runs the daemon until interrupted, re-checking the templates every ``poll_interval`` seconds."""
+    server = make_server(socket_path, port, roots)
+    stop = threading.Event()
+
+    def watch() -> None:
+        while not stop.wait(poll_interval):
+            try:
+                server.service.poll()
+            except Exception as e:
+                logger.warning(f"Could not check templates for changes: {e}")
+
+    def terminate(signum, frame):
+        raise KeyboardInterrupt
+
+    # Shut down (and remove the socket) on SIGTERM as on Ctrl+C
+    signal.signal(signal.SIGTERM, terminate)
+    threading.Thread(target=watch, name="scaffoldor-template-watcher", daemon=True).start()
+    where = f"http://127.0.0.1:{server.server_address[1]}" if port is not None else f"unix:{socket_path}"
+    logger.info(f"scaffoldor server listening on {where} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        if port is None:
+            socket_path.unlink(missing_ok=True)
+        else:
+            server_token_path(server.server_address[1]).unlink(missing_ok=True)
+        logger.info("scaffoldor server stopped.")
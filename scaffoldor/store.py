@@ -0,0 +1,163 @@
+# scaffoldor/store.py
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+from .discovery import walk_content_root
+from .manifest import hash_file
+from .registry import content_source, default_templates_dir, with_content_source
+
+logger = logging.getLogger("scaffoldor")
+
+
+def _content_files_of(config: dict) -> dict:
+    return config.get("content_files", {}) if isinstance(config, dict) else {}
+
+
+def _loaded_templates(content_dir: Path, sources: set) -> Optional[set]:
+    """
+    Returns the files the templates ``sources`` include, import or extend,
+    followed transitively, or ``None`` when that cannot be known: a template
+    does not parse, or chooses the template to load at render time.
+    """
+    from jinja2 import FileSystemLoader, TemplateError, TemplateNotFound
+
+    from .memo import analyze_template
+    from .scaffold import make_environment
+
+    env = make_environment(FileSystemLoader(str(content_dir)))
+    loaded = set()
+    for source in sorted(sources):
+        try:
+            dependencies = analyze_template(env, source, follow_references=True)
+        except TemplateNotFound:
+            # A missing file (or include target) keeps nothing alive
+            continue
+        except (TemplateError, UnicodeDecodeError, OSError) as e:
+            logger.error(f"Cannot compact templates: failed to analyze '{source}': {e}")
+            return None
+        if dependencies is None:
+            logger.error(f"Cannot compact templates: '{source}' loads a template chosen at render time.")
+            return None
+        loaded.update(dependencies.templates[1:])
+    return loaded
+
+
+def compact_templates(templates_dir: Optional[Path] = None, dry_run: bool = False) -> dict:
+    """
+    Deduplicates the template content tree by content address.
+
+    Every file under ``templates/content`` is hashed. Files no template
+    references are garbage-collected, and files referenced by several
+    templates under different paths but with identical content collapse onto
+    one shared copy: the shortest path with that hash (the base template's file
+    when there is one), with every template JSON rewritten to reference it.
+    Templates included, imported or extended by a referenced template count
+    as referenced too. Neither they nor files discovered through
+    ``content_roots`` can be rewritten, so they are always kept and preferred
+    as the shared copy. Directories left empty are removed.
+
+    Returns the removed files, the rewritten template configs and the number
+    of bytes reclaimed.
+    """
+    templates_dir = Path(templates_dir) if templates_dir else default_templates_dir()
+    content_dir = templates_dir / "content"
+
+    configs = {}
+    for config_path in sorted(templates_dir.glob("*.json")):
+        try:
+            with config_path.open(encoding="utf-8") as f:
+                configs[config_path] = json.load(f)
+        except (OSError, ValueError) as e:
+            # Without knowing what a broken template references, nothing can be deleted safely
+            logger.error(f"Cannot compact templates: failed to read '{config_path.name}': {e}")
+            return {"removed": [], "rewritten": [], "bytes_reclaimed": 0}
+
+    from .scaffold import content_entries
+
+    # Static assets are referenced like templates, by their "source"
+    referenced = set()
+    rendered = set()
+    for config in configs.values():
+        if not isinstance(config, dict):
+            continue
+        valid = {output: entry for output, entry in _content_files_of(config).items() if content_source(entry) is not None}
+        for _, relative, static in content_entries({**config, "content_files": valid}):
+            referenced.add(Path(relative).as_posix())
+            if not static:
+                rendered.add(Path(relative).as_posix())
+    # Files matched by content_roots globs (walked afresh rather than from the content manifest) and
+    # templates loaded by other templates are referenced by paths that cannot be rewritten
+    pinned = set()
+    for config_path, config in configs.items():
+        for rule in (config.get("content_roots") or []) if isinstance(config, dict) else []:
+            try:
+                root_files, _ = walk_content_root(content_dir, rule)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.error(f"Cannot compact templates: failed to expand the content roots of '{config_path.name}': {e}")
+                return {"removed": [], "rewritten": [], "bytes_reclaimed": 0}
+            for entry in root_files.values():
+                pinned.add(content_source(entry))
+                if not (isinstance(entry, dict) and entry.get("static")):
+                    rendered.add(content_source(entry))
+    loaded = _loaded_templates(content_dir, rendered)
+    if loaded is None:
+        return {"removed": [], "rewritten": [], "bytes_reclaimed": 0}
+    pinned |= loaded
+    referenced |= pinned
+
+    by_digest = {}
+    sizes = {}
+    for root, _, files in os.walk(content_dir):
+        for name in files:
+            path = Path(root) / name
+            relative = path.relative_to(content_dir).as_posix()
+            sizes[relative] = path.stat().st_size
+            by_digest.setdefault(hash_file(path), []).append(relative)
+
+    # Map each referenced duplicate onto the canonical copy of its content
+    canonical = {}
+    for paths in by_digest.values():
+        used = sorted((p for p in paths if p in referenced), key=lambda p: (p not in pinned, p.count("/"), len(p), p))
+        for relative in used[1:]:
+            if relative not in pinned:
+                canonical[relative] = used[0]
+
+    keep = (referenced - canonical.keys())
+    removed = sorted(relative for relative in sizes if relative not in keep)
+
+    rewritten = []
+    for config_path, config in configs.items():
+        content_files = _content_files_of(config)
+        changed = False
+        for output, entry in content_files.items():
+            relative = content_source(entry)
+            if relative is not None and Path(relative).as_posix() in canonical:
+                content_files[output] = with_content_source(entry, canonical[Path(relative).as_posix()])
+                changed = True
+        if changed:
+            rewritten.append(config_path.name)
+            if not dry_run:
+                with config_path.open("w", encoding="utf-8") as f:
+                    json.dump(config, f, indent=2)
+                    f.write("\n")
+
+    if not dry_run:
+        for relative in removed:
+            (content_dir / relative).unlink()
+        # Remove directories emptied by the clean-up, deepest first
+        emptied = {(content_dir / relative).parent for relative in removed}
+        for directory in sorted(emptied, key=lambda p: len(p.parts), reverse=True):
+            while directory != content_dir and directory.is_dir() and not any(directory.iterdir()):
+                directory.rmdir()
+                directory = directory.parent
+
+    bytes_reclaimed = sum(sizes[relative] for relative in removed)
+    prefix = "[Dry-run] Would remove" if dry_run else "Removed"
+    logger.info(
+        f"{prefix} {len(removed)} file(s) ({bytes_reclaimed} bytes) and rewrote "
+        f"{len(rewritten)} template config(s); {len(keep)} unique content file(s) remain."
+    )
+    return {"removed": removed, "rewritten": rewritten, "bytes_reclaimed": bytes_reclaimed}
@@ -0,0 +1,161 @@
+# scaffoldor/transaction.py
+import errno
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Optional
+
+from .exceptions import ProjectExistsError
+
+# Files flushed at once by sync_tree; concurrent fsyncs share journal commits
+SYNC_WORKERS = 8
+
+# renameat2(2) flag (Linux) and renamex_np(2) flag (macOS): fail instead of replacing the destination
+RENAME_NOREPLACE = 1
+RENAME_EXCL = 0x4
+AT_FDCWD = -100
+
+
+def stage_project(project_path: Path) -> Path:
+    """
+    Creates an empty staging directory next to ``project_path`` and returns it.
+    Being a sibling, it lives on the same file system, so it can later be
+    renamed into place atomically.
+    """
+    project_path.parent.mkdir(parents=True, exist_ok=True)
+    staging = project_path.with_name(f".{project_path.name}.{os.urandom(4).hex()}.staging")
+    staging.mkdir()
+    return staging
+
+
+def _fsync(path: str) -> None:
+    """Flushes one file or directory. Directories cannot be opened for fsync on Windows, nor files read-only."""
+    if os.name != "posix" and os.path.isdir(path):
+        return
+    fd = os.open(path, os.O_RDONLY if os.name == "posix" else os.O_RDWR)
+    try:
+        if sys.platform == "darwin":
+            import fcntl
+
+            # fsync on macOS does not make the drive flush its cache
+            fcntl.fcntl(fd, fcntl.F_FULLFSYNC)
+        else:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def sync_tree(root: Path) -> None:
+    """
+    Flushes every file and directory below ``root`` (and ``root`` itself) to
+    stable storage. Only this tree is flushed, never the rest of the system,
+    and files are flushed a few at a time so the file system can batch them.
+    """
+    paths = []
+    for dirpath, _, filenames in os.walk(root):
+        paths.append(dirpath)
+        paths.extend(os.path.join(dirpath, name) for name in filenames)
+    if len(paths) == 1:
+        _fsync(paths[0])
+        return
+    with ThreadPoolExecutor(max_workers=min(SYNC_WORKERS, len(paths))) as pool:
+        for _ in pool.map(_fsync, paths):
+            pass
+
+
+def sync_directory(path: Path) -> None:
+    """Makes a rename inside ``path`` durable."""
+    _fsync(str(path))
+
+
+@lru_cache(maxsize=None)
+def _exclusive_rename() -> Optional[Callable[[bytes, bytes], int]]:
+    """Returns the C function renaming without replacing the destination where the platform has one (0 on success)."""
+    if not (sys.platform.startswith("linux") or sys.platform == "darwin"):
+        return None
+    import ctypes
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    if sys.platform == "darwin":
+        renamex_np = getattr(libc, "renamex_np", None)
+        return (lambda source, destination: renamex_np(source, destination, RENAME_EXCL)) if renamex_np else None
+    renameat2 = getattr(libc, "renameat2", None)
+    if renameat2 is None:
+        return None
+    return lambda source, destination: renameat2(AT_FDCWD, source, AT_FDCWD, destination, RENAME_NOREPLACE)
+
+
+def rename_no_replace(source: Path, destination: Path) -> None:
+    """
+    Renames ``source`` to ``destination``, failing with ``FileExistsError``
+    if ``destination`` exists, even if it is an empty directory that plain
+    POSIX ``rename`` would replace. Uses ``renameat2(RENAME_NOREPLACE)`` or
+    ``renamex_np(RENAME_EXCL)``. Where neither works, the name is claimed
+    with ``mkdir`` first, so two processes can never both succeed.
+    """
+    rename = _exclusive_rename()
+    if rename is not None:
+        if rename(os.fsencode(source), os.fsencode(destination)) == 0:
+            return
+        import ctypes
+
+        error = ctypes.get_errno()
+        # Not supported by this file system (or kernel); fall back below
+        if error not in (errno.EINVAL, errno.ENOSYS, errno.ENOTSUP):
+            raise OSError(error, os.strerror(error), str(source), None, str(destination))
+    if os.name != "posix":
+        # Windows never replaces an existing destination
+        os.rename(source, destination)
+        return
+    os.mkdir(destination)
+    try:
+        # Replaces the empty directory just claimed
+        os.rename(source, destination)
+    except BaseException:
+        os.rmdir(destination)
+        raise
+
+
+def commit_project(staging: Path, project_path: Path, durable: bool = True) -> None:
+    """
+    Moves a fully written staging directory to ``project_path`` with one
+    rename, so other processes see either no project or the complete one.
+
+    With ``durable`` the staged files are flushed once before the rename and
+    the parent directory once after it. Raises :class:`ProjectExistsError` if
+    something else created ``project_path`` in the meantime.
+    """
+    if durable:
+        sync_tree(staging)
+    try:
+        rename_no_replace(staging, project_path)
+    except OSError as e:
+        if e.errno in (errno.EEXIST, errno.ENOTEMPTY):
+            raise ProjectExistsError(f"Directory '{project_path}' already exists.") from e
+        raise
+    if durable:
+        sync_directory(project_path.parent)
+
+
+def discard_staging(staging: Path) -> None:
+    shutil.rmtree(staging, ignore_errors=True)
+
+
+@contextmanager
+def staged_project(project_path: Path, durable: bool = True):
+    """
+    Yields a staging directory to write the project into. It is committed to
+    ``project_path`` when the block finishes, and removed if the block raises
+    (including ``SystemExit``) or the commit fails.
+    """
+    staging = stage_project(project_path)
+    try:
+        yield staging
+        commit_project(staging, project_path, durable)
+    except BaseException:
+        discard_staging(staging)
+        raise
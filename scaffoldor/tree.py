@@ -0,0 +1,118 @@
+# scaffoldor/tree.py
+import os
+from pathlib import Path
+from typing import Iterable, Optional
+
+# Opening a directory just to create entries in it needs no read permission where O_PATH exists (Linux)
+_DIR_FLAGS = getattr(os, "O_PATH", os.O_RDONLY) | getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_CLOEXEC", 0)
+_MKDIRAT = os.mkdir in os.supports_dir_fd and os.chmod in os.supports_dir_fd
+
+
+def _path_parts(path: str) -> tuple:
+    """Splits a ``/``-separated relative path like ``PurePosixPath(path).parts``, rejecting paths that leave the project."""
+    parts = tuple(part for part in path.split("/") if part and part != ".")
+    if not parts or path.startswith("/") or ".." in parts or "\\" in path:
+        raise ValueError(f"'{path}' is not a relative directory path inside the project.")
+    return parts
+
+
+def structure_paths(structure: dict, prefix: str = "") -> list[str]:
+    """
+    Flattens a template's ``structure`` into the directories it declares, as
+    ``/``-separated paths in declaration order. A folder maps to a list of
+    subfolder paths (``"backend": ["app/api/v1", "app/core"]``), to a nested
+    structure of the same kind (``"backend": {"app": {"api": ["v1"]}}``) or
+    to nothing (``[]``, ``{}`` or ``null``). Raises ``ValueError``.
+    """
+    if not isinstance(structure, dict):
+        raise ValueError(f"'structure' must map folder names to subfolders, got {type(structure).__name__}.")
+    paths = []
+    for folder, children in structure.items():
+        path = prefix + "/".join(_path_parts(folder))
+        paths.append(path)
+        if isinstance(children, dict):
+            paths.extend(structure_paths(children, f"{path}/"))
+        elif isinstance(children, list):
+            for child in children:
+                if not isinstance(child, str):
+                    raise ValueError(f"Subfolders of '{path}' must be paths, got {child!r}.")
+                paths.append(f"{path}/{'/'.join(_path_parts(child))}")
+        elif children is not None:
+            raise ValueError(f"Subfolders of '{path}' must be a list or an object, got {children!r}.")
+    return paths
+
+
+def plan_tree(paths: Iterable[str]) -> list[str]:
+    """
+    Returns every directory needed to hold ``paths``, including the parents
+    they imply, once each and sorted so that a directory always comes right
+    before its own subtree. Creating them in this order never needs
+    ``parents=True`` or an existence check.
+    """
+    directories = set()
+    for path in paths:
+        parts = _path_parts(path)
+        # Ancestors already planned through an earlier path end the walk early
+        for depth in range(len(parts), 0, -1):
+            if parts[:depth] in directories:
+                break
+            directories.add(parts[:depth])
+    return ["/".join(parts) for parts in sorted(directories)]
+
+
+def make_tree(root: Path, tree: list[str], mode: Optional[int] = None, exist_ok: bool = False,
+              dir_fd: bool = False) -> int:
+    """
+    Creates the directories of ``tree`` (as returned by :func:`plan_tree`)
+    below the existing directory ``root`` with exactly one ``mkdir`` each,
+    plus a ``chmod`` when ``mode`` must be applied exactly, whatever the
+    umask. With ``exist_ok``, directories that are already there are kept.
+    Returns the number of directories created.
+
+    With ``dir_fd``, each directory is created relative to an open
+    descriptor of its parent (``mkdirat``), so the kernel never resolves a
+    long path again and trees deeper than ``PATH_MAX`` work. That costs an
+    ``open`` and a ``close`` per directory that has subdirectories.
+    """
+    if dir_fd and _MKDIRAT:
+        return _make_tree_at(root, tree, mode, exist_ok)
+    root = Path(root)
+    created = 0
+    for path in tree:
+        target = root / path
+        try:
+            os.mkdir(target, 0o777 if mode is None else mode)
+            created += 1
+            if mode is not None:
+                os.chmod(target, mode)
+        except FileExistsError:
+            if not exist_ok:
+                raise
+    return created
+
+
+def _make_tree_at(root: Path, tree: list[str], mode: Optional[int], exist_ok: bool) -> int:
+    created = 0
+    # Open ancestors of the current directory, outermost first: (parts, fd)
+    stack = [((), os.open(root, _DIR_FLAGS))]
+    try:
+        for index, path in enumerate(tree):
+            parts = tuple(path.split("/"))
+            while stack[-1][0] != parts[:-1]:
+                os.close(stack.pop()[1])
+            parent_fd = stack[-1][1]
+            try:
+                os.mkdir(parts[-1], 0o777 if mode is None else mode, dir_fd=parent_fd)
+                created += 1
+                if mode is not None:
+                    os.chmod(parts[-1], mode, dir_fd=parent_fd)
+            except FileExistsError:
+                if not exist_ok:
+                    raise
+            following = tree[index + 1] if index + 1 < len(tree) else ""
+            if following.startswith(f"{path}/"):
+                stack.append((parts, os.open(parts[-1], _DIR_FLAGS, dir_fd=parent_fd)))
+    finally:
+        for _, fd in stack:
+            os.close(fd)
+    return created
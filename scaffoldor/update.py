@@ -0,0 +1,177 @@
+# scaffoldor/update.py
+import logging
+import os
+import posixpath
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from .cache import atomic_write
+from .copying import copy_bytes
+from .exceptions import ScaffoldError
+from .manifest import MANIFEST_NAME, hash_bytes, hash_context, hash_file, hash_source_file, read_manifest, write_manifest
+from .reproducible import RNG_VARIABLE, file_random, normalize_newlines
+from .scaffold import (
+    build_render_context, expand_content_entries, file_dependencies, get_environment, load_template_config,
+    project_directories, static_root, template_directories, variables_hash,
+)
+from .tree import make_tree, plan_tree
+from .variables import TemplateVariables
+
+if TYPE_CHECKING:
+    # Jinja2 is only loaded once an update actually renders (see scaffold.get_environment)
+    from jinja2 import Environment
+
+logger = logging.getLogger("scaffoldor")
+
+
+def _atomic_copy(path: Path, source: Path) -> None:
+    """Like :func:`~scaffoldor.cache.atomic_write`, with the bytes copied from ``source`` in the kernel."""
+    tmp_path = path.with_name(f".{path.name}.{os.urandom(4).hex()}.tmp")
+    try:
+        copy_bytes(source, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def update_project(
+    project_path: Path,
+    dry_run: bool = False,
+    verbose: bool = False,
+    force: bool = False,
+    context: Optional[dict] = None,
+    env: Optional["Environment"] = None,
+) -> dict:
+    """
+    Brings an existing project up to date with its (possibly changed) template.
+
+    Uses the manifest written at creation time to decide, per file:
+
+    - nothing the file depends on changed: it is skipped without rendering. A
+      rendered file depends on its template, the templates that one includes,
+      imports or extends, and the variables they read (see
+      :func:`~scaffoldor.scaffold.file_dependencies`); a static file only on its source;
+    - re-rendered output identical to what is on disk: nothing is written;
+    - file edited since it was generated: it is left alone and reported as a
+      conflict (unless ``force`` is set);
+    - otherwise the new output is written atomically.
+
+    ``context`` overrides variables recorded in the manifest. Files the template
+    no longer produces are left in place and reported. Returns the lists of
+    ``created``, ``updated``, ``unchanged``, ``conflicts`` and ``removed`` files.
+    """
+    manifest = read_manifest(project_path)
+    if manifest is None:
+        logger.error(f"'{project_path}' has no readable {MANIFEST_NAME}; only projects created by scaffoldor can be updated.")
+        sys.exit(1)
+
+    template_name = manifest["template"]
+    template_config = load_template_config(template_name)
+    if env is None:
+        env = get_environment()
+
+    variables = {**manifest.get("variables", {}), **(context or {})}
+    # Deterministic projects stay deterministic
+    seed = manifest.get("seed")
+    try:
+        render_context = build_render_context(project_path.name, variables, TemplateVariables.from_config(template_config), seed)
+        # Fan-out entries follow their list as it is now: new items create files, dropped ones are reported as removed
+        entries = list(expand_content_entries(env, template_config, render_context))
+    except (ScaffoldError, ValueError) as e:
+        logger.error(str(e))
+        sys.exit(1)
+    context_hash = hash_context(render_context)
+    old_files = manifest.get("files", {})
+    content_dir = static_root(env)
+
+    if not dry_run:
+        fan_out_parents = {posixpath.dirname(output) for output, _, _, item_context in entries if item_context}
+        make_tree(project_path, plan_tree(project_directories(template_config) + sorted(fan_out_parents - {""})), exist_ok=True)
+
+    summary = {"created": [], "updated": [], "unchanged": [], "conflicts": [], "removed": []}
+    new_files = {}
+    # Fanned-out files share their template, so each one is analyzed once
+    dependencies = {}
+    for output_filename, template_relative_path, static, item_context in entries:
+        file_path = project_path / output_filename
+        record = old_files.get(output_filename)
+        file_context = {**render_context, **item_context} if item_context else render_context
+        if static:
+            source_hash = hash_source_file(content_dir / template_relative_path)
+            file_variables_hash = None
+        else:
+            if template_relative_path not in dependencies:
+                dependencies[template_relative_path] = file_dependencies(env, template_relative_path)
+            source_hash, read_variables = dependencies[template_relative_path]
+            file_variables_hash = variables_hash(read_variables, file_context)
+
+        if (
+            record is not None
+            and record.get("template") == template_relative_path
+            and record.get("source") == source_hash
+            # Files whose variables cannot be known are always rendered again
+            and (static or (file_variables_hash is not None and record.get("context") == file_variables_hash))
+        ):
+            # Nothing this file depends on changed, so there is no need to render it
+            summary["unchanged"].append(output_filename)
+            new_files[output_filename] = record
+            continue
+
+        if static:
+            # Copied as is, so the output is the source
+            data = None
+            new_record = {"template": template_relative_path, "source": source_hash, "output": source_hash}
+        else:
+            if seed is not None:
+                file_context = {**file_context, RNG_VARIABLE: file_random(seed, project_path.name, Path(output_filename).as_posix())}
+            text = env.get_template(template_relative_path).render(**file_context)
+            data = (normalize_newlines(text) if seed is not None else text).encode('utf-8')
+            new_record = {"template": template_relative_path, "source": source_hash, "context": file_variables_hash,
+                          "output": hash_bytes(data)}
+        on_disk = hash_file(file_path)
+
+        if on_disk == new_record["output"]:
+            summary["unchanged"].append(output_filename)
+            new_files[output_filename] = new_record
+            continue
+
+        edited = on_disk is not None and (record is None or on_disk != record.get("output"))
+        if edited and not force:
+            logger.warning(f"Skipping '{output_filename}': it was modified since it was generated (use --force to overwrite).")
+            summary["conflicts"].append(output_filename)
+            # Forget the source hash so the conflict is reported again on the next update
+            new_files[output_filename] = {**(record or {"output": None}), "template": template_relative_path, "source": None}
+            continue
+
+        if not dry_run:
+            if static:
+                _atomic_copy(file_path, content_dir / template_relative_path)
+            else:
+                atomic_write(file_path, data)
+        summary["created" if on_disk is None else "updated"].append(output_filename)
+        new_files[output_filename] = new_record
+        if verbose:
+            logger.debug(f"{'Created' if on_disk is None else 'Updated'} file: {file_path}")
+
+    outputs = {output_filename for output_filename, _, _, _ in entries}
+    summary["removed"] = sorted(name for name in old_files if name not in outputs)
+    for output_filename in summary["removed"]:
+        logger.info(f"'{output_filename}' is no longer part of template '{template_name}'; left in place.")
+
+    prefix = "[Dry-run] Would update" if dry_run else "Updated"
+    logger.info(
+        f"{prefix} project '{project_path.name}': {len(summary['created'])} created, "
+        f"{len(summary['updated'])} updated, {len(summary['unchanged'])} unchanged, "
+        f"{len(summary['conflicts'])} conflict(s)"
+    )
+
+    manifest_changed = (
+        new_files != old_files
+        or context_hash != manifest.get("context_hash")
+        or variables != manifest.get("variables", {})
+    )
+    if manifest_changed and not dry_run:
+        write_manifest(project_path, template_name, variables, context_hash, new_files, template_directories(template_config), seed)
+    return summary
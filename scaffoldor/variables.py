@@ -0,0 +1,244 @@
+# scaffoldor/variables.py
+import json
+import random
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional
+
+from .exceptions import TemplateConfigError, VariableError
+from .reproducible import RNG_VARIABLE
+
+DECLARATION_KEYS = {"type", "default", "description", "derived"}
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("1", "true", "yes", "on"):
+        return True
+    if text in ("0", "false", "no", "off", ""):
+        return False
+    raise ValueError(f"'{value}' is not a boolean")
+
+
+def _parse_list(value) -> list:
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    text = str(value).strip()
+    if text.startswith("["):
+        parsed = json.loads(text)
+        if isinstance(parsed, list):
+            return parsed
+    # Comma-separated, as typed on the command line
+    return [item.strip() for item in text.split(",") if item.strip()]
+
+
+# Declared variable types and how a value (possibly a string from the command line) is converted to them
+VARIABLE_TYPES = {"str": str, "int": int, "float": float, "bool": _parse_bool, "list": _parse_list}
+
+
+def _coerce(name: str, value, type_name: Optional[str]):
+    if type_name is None:
+        return value
+    try:
+        return VARIABLE_TYPES[type_name](value)
+    except (TypeError, ValueError) as e:
+        raise VariableError(f"Variable '{name}' must be of type {type_name}, got {value!r}: {e}") from e
+
+
+def normalize_declaration(name: str, declaration) -> dict:
+    """
+    Validates one entry of a template's ``variables`` and returns it as a
+    dict. A bare value is shorthand for ``{"default": value}``; without an
+    explicit ``type`` it is inferred from the default. Raises ``ValueError``.
+    """
+    if not name.isidentifier() or name == "project_name":
+        raise ValueError(f"'{name}' is not a valid variable name.")
+    if not isinstance(declaration, dict):
+        declaration = {"default": declaration}
+    unknown = set(declaration) - DECLARATION_KEYS
+    if unknown:
+        raise ValueError(f"Variable '{name}' has unknown keys: {', '.join(sorted(unknown))}.")
+    declaration = dict(declaration)
+    if "derived" in declaration:
+        if not isinstance(declaration["derived"], str):
+            raise ValueError(f"The 'derived' expression of variable '{name}' must be a string.")
+        if "default" in declaration:
+            raise ValueError(f"Variable '{name}' is derived and cannot have a default.")
+    if "type" not in declaration and "default" in declaration:
+        inferred = type(declaration["default"]).__name__
+        declaration["type"] = inferred if inferred in VARIABLE_TYPES else None
+    if declaration.get("type") is not None and declaration["type"] not in VARIABLE_TYPES:
+        raise ValueError(f"Variable '{name}' has unknown type '{declaration['type']}' (expected one of {', '.join(VARIABLE_TYPES)}).")
+    if "default" in declaration:
+        try:
+            declaration["default"] = _coerce(name, declaration["default"], declaration.get("type"))
+        except VariableError as e:
+            raise ValueError(str(e)) from e
+    return declaration
+
+
+def validate_declarations(declarations) -> None:
+    """Raises ``ValueError`` if a template's ``variables`` are malformed."""
+    if not isinstance(declarations, dict):
+        raise ValueError("'variables' must be an object mapping variable names to declarations.")
+    for name, declaration in declarations.items():
+        normalize_declaration(name, declaration)
+
+
+class Derived(NamedTuple):
+    """A compiled derived-variable expression and the variables it reads."""
+
+    evaluate: Callable[[dict], Any]
+    depends_on: frozenset
+
+
+@lru_cache(maxsize=None)
+def compile_derived(expression: str) -> Derived:
+    """Compiles a derived-variable expression with the shared Jinja2 environment, once per process."""
+    from jinja2 import TemplateSyntaxError, meta, nodes
+
+    from .scaffold import get_environment
+
+    env = get_environment()
+    try:
+        ast = env.parse(f"{{{{ {expression} }}}}")
+        evaluate = env.compile_expression(expression)
+    except TemplateSyntaxError as e:
+        raise TemplateConfigError(f"Invalid derived variable expression '{expression}': {e}") from e
+    depends_on = set(meta.find_undeclared_variables(ast)) - env.globals.keys()
+    if any(node.name == "random" for node in ast.find_all(nodes.Filter)):
+        # Random values must differ between projects, so they are never shared
+        depends_on.add("project_name")
+    return Derived(evaluate, frozenset(depends_on))
+
+
+class TemplateVariables:
+    """
+    The variables a template declares under ``"variables"`` in its JSON config::
+
+        "variables": {
+            "package_name": {"derived": "project_name | lower | replace('-', '_')"},
+            "port": {"type": "int", "default": 8000, "description": "Backend port"}
+        }
+
+    Input values are converted to their declared type and missing ones take
+    their default. Derived variables are Jinja2 expressions over
+    ``project_name``, the inputs and earlier derived variables; each is
+    compiled once per process and evaluated once per project, instead of in
+    every template that needs it.
+
+    Values shared by many projects (``shared``, e.g. ``--var`` flags of a
+    batch run) form a layer that is computed once: per project, only the
+    derived variables depending on ``project_name`` or on that project's own
+    values are evaluated again. Undeclared values are passed to the templates
+    unchanged.
+    """
+
+    def __init__(self, declarations: Optional[dict] = None, shared: Optional[dict] = None,
+                 compiler: Callable[[str], Derived] = compile_derived):
+        try:
+            self.declarations = {name: normalize_declaration(name, d) for name, d in (declarations or {}).items()}
+        except ValueError as e:
+            raise TemplateConfigError(f"Invalid template variables: {e}") from e
+        self.shared = dict(shared or {})
+        self._compile = compiler
+        self._derived = None
+        self._layer = None
+
+    @classmethod
+    def from_config(cls, template_config: dict, shared: Optional[dict] = None) -> "TemplateVariables":
+        return cls(template_config.get("variables"), shared)
+
+    def coerce(self, values: dict) -> dict:
+        """Returns ``values`` converted to their declared types."""
+        coerced = dict(values)
+        for name, value in values.items():
+            declaration = self.declarations.get(name)
+            if declaration is None:
+                continue
+            if "derived" in declaration:
+                raise VariableError(f"Variable '{name}' is derived from other variables and cannot be set.")
+            coerced[name] = _coerce(name, value, declaration.get("type"))
+        return coerced
+
+    def _derived_variables(self) -> dict:
+        if self._derived is None:
+            derived_variables = {}
+            for name, declaration in self.declarations.items():
+                if "derived" not in declaration:
+                    continue
+                derived = self._compile(declaration["derived"])
+                # Reading another derived variable means depending on whatever that one reads
+                depends_on = set(derived.depends_on)
+                for dependency in derived.depends_on & derived_variables.keys():
+                    depends_on |= derived_variables[dependency].depends_on
+                derived_variables[name] = derived._replace(depends_on=frozenset(depends_on))
+            self._derived = derived_variables
+        return self._derived
+
+    def _evaluate(self, context: dict, names: list) -> None:
+        derived_variables = self._derived_variables()
+        for name in names:
+            try:
+                value = derived_variables[name].evaluate(context)
+            except Exception as e:
+                raise VariableError(f"Could not compute variable '{name}': {e}") from e
+            context[name] = _coerce(name, value, self.declarations[name].get("type"))
+
+    def shared_context(self) -> dict:
+        """Returns the defaults, the shared values and every derived variable that only depends on them."""
+        if self._layer is None:
+            context = {name: d["default"] for name, d in self.declarations.items() if "default" in d}
+            context.update(self.coerce(self.shared))
+            derived_variables = self._derived_variables()
+            # Anything reading a value that only projects provide is left for resolve()
+            available = context.keys() | derived_variables.keys()
+            self._evaluate(context, [
+                name for name, derived in derived_variables.items()
+                if "project_name" not in derived.depends_on and derived.depends_on <= available
+            ])
+            self._layer = context
+        return self._layer
+
+    def resolve(self, project_name: str, values: Optional[dict] = None, rng: Optional[random.Random] = None) -> dict:
+        """Returns the complete render context of one project; ``rng`` seeds derived expressions using ``random``."""
+        values = self.coerce(values or {})
+        layer = self.shared_context()
+        context = {**layer, **values, "project_name": project_name}
+        missing = [
+            name for name, declaration in self.declarations.items()
+            if "derived" not in declaration and name not in context
+        ]
+        if missing:
+            raise VariableError(f"Missing value for variable(s): {', '.join(missing)}. Pass them with --var NAME=VALUE.")
+        changed = values.keys() | {"project_name"}
+        if rng is not None:
+            context[RNG_VARIABLE] = rng
+        self._evaluate(context, [
+            name for name, derived in self._derived_variables().items()
+            if name not in layer or derived.depends_on & changed
+        ])
+        context.pop(RNG_VARIABLE, None)
+        return context
+
+
+def parse_assignments(assignments: list[str]) -> dict:
+    """Parses ``NAME=VALUE`` command line assignments; values stay strings until coerced."""
+    values = {}
+    for assignment in assignments or []:
+        name, separator, value = assignment.partition("=")
+        if not separator or not name.strip():
+            raise ValueError(f"Expected NAME=VALUE, got '{assignment}'.")
+        values[name.strip()] = value
+    return values
+
+
+def load_vars_file(vars_path: Path) -> dict:
+    """Reads variable values from a JSON object file. Raises ``OSError`` or ``ValueError``."""
+    with vars_path.open(encoding="utf-8") as f:
+        values = json.load(f)
+    if not isinstance(values, dict):
+        raise ValueError("expected a JSON object mapping variable names to values")
+    return values
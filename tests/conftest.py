@@ -28,4 +28,21 @@ def tmp_project_dir(tmp_path: Path):
     Ensures a clean slate for each test by yielding a unique path.
     """
     yield tmp_path
-    # Cleanup is handled by tmp_path fixture itself
\ No newline at end of file
+    # Cleanup is handled by tmp_path fixture itself
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_cache_dir(tmp_path_factory):
+    """
+    Points scaffoldor's on-disk caches at a temporary directory so test runs
+    never read from or write to the real user cache.
+    """
+    import os
+
+    cache_dir = tmp_path_factory.mktemp("scaffoldor-cache")
+    previous = os.environ.get("SCAFFOLDOR_CACHE_DIR")
+    os.environ["SCAFFOLDOR_CACHE_DIR"] = str(cache_dir)
+    yield cache_dir
+    if previous is None:
+        os.environ.pop("SCAFFOLDOR_CACHE_DIR", None)
+    else:
+        os.environ["SCAFFOLDOR_CACHE_DIR"] = previous
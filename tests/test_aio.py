@@ -0,0 +1,111 @@
+# tests/test_aio.py
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from scaffoldor.aio import scaffold
+from scaffoldor.exceptions import GenerationError, ProjectExistsError, ScaffoldError, TemplateNotFoundError
+from scaffoldor.manifest import read_manifest
+from scaffoldor.scaffold import create_structure
+
+
+def test_scaffold_matches_sync_output(tmp_project_dir: Path):
+    """Concurrent async scaffolds write the same files and manifest records as create_structure."""
+    create_structure(tmp_project_dir / "sync-app")
+
+    async def provision():
+        limit = asyncio.Semaphore(2)
+        return await asyncio.gather(*(scaffold(tmp_project_dir / f"async-{i}", limit=limit) for i in range(3)))
+
+    results = asyncio.run(provision())
+
+    sync_manifest = read_manifest(tmp_project_dir / "sync-app")
+    for i, records in enumerate(results):
+        project_path = tmp_project_dir / f"async-{i}"
+        for name, record in records.items():
+            assert record["source"] == sync_manifest["files"][name]["source"]
+            if name == ".env.example":
+                continue  # Contains a random secret
+            expected = (tmp_project_dir / "sync-app" / name).read_text().replace("sync-app", "{name}").replace("sync_app", "{db}")
+            actual = (project_path / name).read_text().replace(f"async-{i}", "{name}").replace(f"async_{i}", "{db}")
+            assert actual == expected
+        assert read_manifest(project_path)["files"] == records
+        assert (project_path / "backend" / "app" / "api" / "v1").is_dir()
+
+
+def test_scaffold_raises_typed_errors(tmp_project_dir: Path):
+    """Errors surface as ScaffoldError subclasses instead of SystemExit."""
+    (tmp_project_dir / "taken").mkdir()
+    with pytest.raises(ProjectExistsError):
+        asyncio.run(scaffold(tmp_project_dir / "taken"))
+
+    with pytest.raises(TemplateNotFoundError) as excinfo:
+        asyncio.run(scaffold(tmp_project_dir / "nope", template_name="non_existent_template"))
+    assert "default" in excinfo.value.available
+
+    config = {"structure": {}, "content_files": {"README.md": "README.md.jinja", "missing.txt": "does-not-exist.jinja"}}
+    with pytest.raises(GenerationError) as excinfo:
+        asyncio.run(scaffold(tmp_project_dir / "broken", template_config=config))
+    assert list(excinfo.value.failures) == ["missing.txt"]
+    assert isinstance(excinfo.value, ScaffoldError)
+
+
+def test_scaffold_fans_out_content_files(tmp_project_dir: Path):
+    """for_each entries are expanded like create_structure does, one file per item."""
+    config = {
+        "structure": {},
+        "content_files": {"docs/{{ page }}.md": {"source": "README.md.jinja", "for_each": "pages", "as": "page"}},
+    }
+    records = asyncio.run(scaffold(tmp_project_dir / "app", context={"pages": ["intro", "usage"]}, template_config=config))
+
+    assert sorted(records) == ["docs/intro.md", "docs/usage.md"]
+    assert (tmp_project_dir / "app" / "docs" / "usage.md").read_text()
+
+
+def test_scaffold_pulls_fan_out_items_as_workers_free_up(tmp_project_dir: Path, monkeypatch):
+    """A long for_each list is never expanded far ahead of the files being written."""
+    from scaffoldor import aio
+    from scaffoldor.scaffold import PENDING_CALLS_PER_JOB
+
+    written = []
+    ahead = []
+    generate_file = aio._generate_file
+    expand = aio.expand_content_entries
+
+    async def counting_generate_file(*args):
+        record = await generate_file(*args)
+        written.append(record)
+        return record
+
+    def counting_expand(*args):
+        for produced, entry in enumerate(expand(*args), 1):
+            ahead.append(produced - len(written))
+            yield entry
+
+    monkeypatch.setattr(aio, "_generate_file", counting_generate_file)
+    monkeypatch.setattr(aio, "expand_content_entries", counting_expand)
+    config = {
+        "structure": {},
+        "content_files": {"docs/{{ page }}.md": {"source": "README.md.jinja", "for_each": "pages", "as": "page"}},
+    }
+    records = asyncio.run(scaffold(tmp_project_dir / "app", context={"pages": list(range(300))}, template_config=config,
+                                   concurrency=2))
+
+    assert len(records) == 300
+    assert max(ahead) <= 2 * PENDING_CALLS_PER_JOB + 2 * 2
+
+
+def test_scaffold_validates_caller_configs(tmp_project_dir: Path):
+    """A malformed template_config passed in is a TemplateConfigError, as it would be from the registry."""
+    from scaffoldor.exceptions import TemplateConfigError
+
+    for config in (
+        {"structure": {}, "content_files": {"x/{{ e }}": {"source": "x.jinja", "for_each": "items", "as": "not valid"}}},
+        {"structure": {}, "content_files": {"README.md": 42}},
+        {"structure": ["not", "a", "mapping"]},
+        {"structure": {}, "content_roots": "docs"},
+    ):
+        with pytest.raises(TemplateConfigError):
+            asyncio.run(scaffold(tmp_project_dir / "app", template_config=config))
+        assert not (tmp_project_dir / "app").exists()
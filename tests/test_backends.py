@@ -0,0 +1,104 @@
+# tests/test_backends.py
+import io
+import json
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from scaffoldor.backends import MemoryBackend, TarBackend, ZipBackend
+from scaffoldor.manifest import MANIFEST_NAME, hash_bytes
+from scaffoldor.scaffold import create_structure
+
+
+class _Unseekable(io.RawIOBase):
+    """A write-only stream like a pipe or stdout."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.data += b
+        return len(b)
+
+
+def test_memory_backend_receives_project(tmp_project_dir: Path):
+    """Nothing touches the file system; the manifest hashes match the in-memory files."""
+    backend = MemoryBackend()
+    create_structure(tmp_project_dir / "memory-app", backend=backend, jobs=2)
+
+    assert not (tmp_project_dir / "memory-app").exists()
+    assert "backend/app/api/v1" in backend.directories
+    assert backend.files["README.md"].startswith(b"# memory-app")
+    manifest = json.loads(backend.files[MANIFEST_NAME])
+    for name, record in manifest["files"].items():
+        assert record["output"] == hash_bytes(backend.files[name])
+
+
+def test_tar_backend_streams_to_unseekable_output(tmp_project_dir: Path):
+    """Tar members match a filesystem render, including streamed files spooled past the buffer size."""
+    create_structure(tmp_project_dir / "disk-app")
+    stream = _Unseekable()
+    with TarBackend(stream, prefix="disk-app", compression="gz") as backend:
+        create_structure(Path("disk-app"), backend=backend, stream=True, stream_buffer=64)
+
+    with tarfile.open(fileobj=io.BytesIO(bytes(stream.data)), mode="r:gz") as archive:
+        readme = archive.extractfile("disk-app/README.md").read()
+        assert archive.getmember("disk-app/backend/app").isdir()
+        assert archive.getmember("disk-app/README.md").mode == 0o644
+    assert readme == (tmp_project_dir / "disk-app" / "README.md").read_bytes()
+
+
+def test_zip_backend(tmp_path: Path):
+    """Zip archives hold directory entries and every rendered file under the project prefix."""
+    stream = _Unseekable()
+    with ZipBackend(stream, prefix="zip-app") as backend:
+        create_structure(Path("zip-app"), backend=backend, stream=True, jobs=3)
+
+    with zipfile.ZipFile(io.BytesIO(bytes(stream.data))) as archive:
+        names = archive.namelist()
+        assert "zip-app/backend/app/api/v1/" in names
+        assert archive.read("zip-app/README.md").startswith(b"# zip-app")
+        assert json.loads(archive.read(f"zip-app/{MANIFEST_NAME}"))["template"] == "default"
+
+
+def test_create_files_streaming_bounded_memory(tmp_project_dir: Path):
+    """Streaming writes the same bytes as a full render while keeping memory flat."""
+    import tracemalloc
+    from jinja2 import DictLoader, Environment
+    from scaffoldor.scaffold import create_files
+
+    env = Environment(loader=DictLoader({
+        "big.sql.jinja": "{% for i in range(rows) %}INSERT INTO t VALUES ({{ i }}, '{{ project_name }}');\n{% endfor %}",
+    }))
+    config = {"structure": {}, "content_files": {"seed.sql": "big.sql.jinja"}}
+    context = {"rows": 50_000}
+
+    tracemalloc.start()
+    create_files(tmp_project_dir, "stream-app", config, env=env, context=context, stream=True, stream_buffer=16 * 1024)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    output = (tmp_project_dir / "seed.sql").read_text()
+    assert output == env.get_template("big.sql.jinja").render(project_name="stream-app", **context)
+    assert len(output) > 2 * 1024 * 1024
+    assert peak < 1024 * 1024
+    assert [p.name for p in tmp_project_dir.iterdir()] == ["seed.sql"]
+
+
+def test_create_files_streaming_failure_leaves_no_partial_file(tmp_project_dir: Path):
+    """A render error while streaming removes the temporary file."""
+    from jinja2 import DictLoader, Environment
+    from scaffoldor.scaffold import create_files
+
+    env = Environment(loader=DictLoader({"bad.jinja": "start {{ 1 // 0 }}"}))
+    config = {"structure": {}, "content_files": {"bad.txt": "bad.jinja"}}
+
+    with pytest.raises(SystemExit):
+        create_files(tmp_project_dir, "broken", config, env=env, stream=True)
+
+    assert list(tmp_project_dir.iterdir()) == []
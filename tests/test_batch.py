@@ -0,0 +1,105 @@
+# tests/test_batch.py
+import json
+from pathlib import Path
+
+import pytest
+
+from scaffoldor.batch import create_many, load_manifest
+
+
+def test_load_manifest_json_jsonl_csv(tmp_path: Path):
+    """All manifest formats produce the same normalized entries."""
+    json_manifest = tmp_path / "projects.json"
+    json_manifest.write_text(json.dumps({"projects": [{"name": "alpha", "variables": {"team": "a"}}]}))
+    jsonl_manifest = tmp_path / "projects.jsonl"
+    jsonl_manifest.write_text('{"name": "alpha", "variables": {"team": "a"}}\n\n')
+    csv_manifest = tmp_path / "projects.csv"
+    csv_manifest.write_text("name,path,team\nalpha,,a\n")
+
+    expected = [{"name": "alpha", "path": None, "template": None, "variables": {"team": "a"}}]
+    assert load_manifest(json_manifest) == expected
+    assert load_manifest(jsonl_manifest) == expected
+    assert load_manifest(csv_manifest) == expected
+
+
+def test_load_manifest_missing_name(tmp_path: Path):
+    """Entries without a project name are rejected."""
+    manifest = tmp_path / "projects.jsonl"
+    manifest.write_text('{"path": "somewhere"}\n')
+
+    with pytest.raises(SystemExit) as excinfo:
+        load_manifest(manifest)
+    assert excinfo.value.code == 1
+
+
+def test_create_many(tmp_project_dir: Path):
+    """Every manifest entry is scaffolded and existing targets are reported as failures."""
+    (tmp_project_dir / "taken").mkdir()
+    entries = [
+        {"name": "tenant-a", "path": None, "template": None, "variables": {}},
+        {"name": "tenant-b", "path": "group", "template": "default", "variables": {}},
+        {"name": "taken", "path": None, "template": None, "variables": {}},
+    ]
+
+    summary = create_many(entries, base_path=tmp_project_dir)
+
+    assert summary["created"] == [tmp_project_dir / "tenant-a", tmp_project_dir / "group" / "tenant-b"]
+    assert summary["failed"] == [tmp_project_dir / "taken"]
+    assert "# tenant-a" in (tmp_project_dir / "tenant-a" / "README.md").read_text()
+    assert (tmp_project_dir / "group" / "tenant-b" / "backend" / "app" / "core").is_dir()
+    assert summary["projects_per_second"] > 0
+
+
+def test_create_many_keeps_going_past_bad_templates(tmp_project_dir: Path, monkeypatch):
+    """Projects of a missing or invalid template fail on their own; the template is only tried once."""
+    from scaffoldor import batch
+
+    loaded = []
+    load_template_config = batch.load_template_config
+
+    def counting_load(name):
+        loaded.append(name)
+        if name == "broken":
+            return {"structure": {}, "variables": {"x": {"type": "no-such-type"}}}
+        return load_template_config(name)
+
+    monkeypatch.setattr(batch, "load_template_config", counting_load)
+    entries = [
+        {"name": name, "path": None, "template": template, "variables": {}}
+        for name, template in (("a", "missing"), ("b", "broken"), ("c", None), ("d", "missing"), ("e", "broken"))
+    ]
+
+    summary = create_many(entries, base_path=tmp_project_dir)
+
+    assert summary["created"] == [tmp_project_dir / "c"]
+    assert summary["failed"] == [tmp_project_dir / name for name in "abde"]
+    assert sorted(loaded) == ["broken", "default", "missing"]
+
+
+def test_variable_independent_files_are_rendered_once(tmp_project_dir: Path):
+    """Outputs are shared when the variables a template reads match; per-project and random ones are not."""
+    from jinja2 import DictLoader, Environment
+    from scaffoldor.memo import RenderMemo, analyze_template
+    from scaffoldor.scaffold import create_structure
+
+    env = Environment(loader=DictLoader({
+        "LICENSE.jinja": "Copyright {{ author }}",
+        "README.md.jinja": "# {{ project_name }}",
+        "token.jinja": "{{ ['a', 'b'] | random }}",
+        "layout.jinja": "{% include 'LICENSE.jinja' %}",
+    }))
+    config = {"structure": {}, "content_files": {
+        "LICENSE": "LICENSE.jinja", "README.md": "README.md.jinja", "token.txt": "token.jinja",
+    }}
+    assert analyze_template(env, "LICENSE.jinja").variables == {"author"}
+    assert analyze_template(env, "layout.jinja") is None
+
+    memo = RenderMemo()
+    for name, author in (("a", "Ada"), ("b", "Ada"), ("c", "Ada"), ("d", "Grace")):
+        create_structure(tmp_project_dir / name, template_config=config, env=env, context={"author": author},
+                         durable=False, render_memo=memo)
+
+    assert (memo.hits, memo.misses) == (2, 2)  # LICENSE rendered once per distinct author
+    assert (tmp_project_dir / "c" / "LICENSE").read_text() == "Copyright Ada"
+    assert (tmp_project_dir / "d" / "LICENSE").read_text() == "Copyright Grace"
+    assert (tmp_project_dir / "c" / "README.md").read_text() == "# c"
@@ -0,0 +1,50 @@
+# tests/test_bundle.py
+from pathlib import Path
+
+import pytest
+
+from scaffoldor.backends import MemoryBackend
+from scaffoldor.bundle import Bundle, bundle_environment, write_bundle
+from scaffoldor.exceptions import TemplateConfigError
+from scaffoldor.scaffold import create_structure, make_environment
+
+
+def test_bundled_template_matches_the_source_tree(tmp_project_dir: Path):
+    """A bundle holds the config, every content file and the templates they include; static bytes pass through."""
+    from jinja2 import FileSystemLoader
+
+    content = tmp_project_dir / "content"
+    (content / "partials").mkdir(parents=True)
+    (content / "partials" / "header.jinja").write_text("# {{ project_name }}\n")
+    (content / "README.md.jinja").write_text("{% include 'partials/header.jinja' %}body")
+    (content / "logo.png").write_bytes(bytes(range(256)))
+    config = {
+        "structure": {"docs": []},
+        "content_files": {"README.md": "README.md.jinja", "docs/logo.png": {"source": "logo.png", "static": True}},
+    }
+    env = make_environment(FileSystemLoader(str(content)))
+    bundle_path = tmp_project_dir / "app.scfd"
+    header = write_bundle(bundle_path, "app", config, content, env)
+    assert sorted(header["files"]) == ["README.md.jinja", "logo.png", "partials/header.jinja"]
+
+    expected = MemoryBackend()
+    create_structure(Path("bundled"), template_config=config, env=env, backend=expected, seed="1")
+    # Sources now come only from the mapping
+    for path in content.rglob("*"):
+        if path.is_file():
+            path.unlink()
+    with Bundle(bundle_path) as bundle:
+        assert bundle.template_name == "app" and bundle.config == config
+        actual = MemoryBackend()
+        create_structure(Path("bundled"), template_config=bundle.config, env=bundle_environment(bundle), backend=actual,
+                         seed="1")
+    assert actual.files == expected.files
+    assert actual.files["docs/logo.png"] == bytes(range(256))
+
+
+def test_invalid_bundles_are_rejected(tmp_path: Path):
+    for data in (b"", b"not a bundle at all", b"SCFDBNDL\x01\x00\x00\x00\xff\x00\x00\x00\x00\x00\x00\x00{}"):
+        path = tmp_path / "broken.scfd"
+        path.write_bytes(data)
+        with pytest.raises(TemplateConfigError):
+            Bundle(path)
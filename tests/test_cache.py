@@ -0,0 +1,152 @@
+# tests/test_cache.py
+from pathlib import Path
+
+from jinja2 import DictLoader, Environment
+
+from scaffoldor.cache import CompiledTemplateCache
+
+
+def _environment(cache: CompiledTemplateCache, templates: dict) -> Environment:
+    return Environment(loader=DictLoader(templates), bytecode_cache=cache)
+
+
+def test_bytecode_cache_hit_across_environments(tmp_path: Path):
+    """A fresh environment reuses bytecode compiled by an earlier one."""
+    templates = {"hello.jinja": "Hello {{ project_name }}"}
+
+    first = CompiledTemplateCache(tmp_path)
+    assert _environment(first, templates).get_template("hello.jinja").render(project_name="a") == "Hello a"
+    assert first.counters["misses"] == 1 and first.counters["writes"] == 1
+
+    second = CompiledTemplateCache(tmp_path)
+    assert _environment(second, templates).get_template("hello.jinja").render(project_name="b") == "Hello b"
+    assert second.counters["hits"] == 1 and second.counters["misses"] == 0
+
+    # Changing the source must not serve the old bytecode
+    third = CompiledTemplateCache(tmp_path)
+    changed = _environment(third, {"hello.jinja": "Bye {{ project_name }}"})
+    assert changed.get_template("hello.jinja").render(project_name="c") == "Bye c"
+    assert third.counters["misses"] == 1
+
+
+def test_bytecode_cache_lru_eviction(tmp_path: Path):
+    """The cache never grows past its size limit."""
+    cache = CompiledTemplateCache(tmp_path, max_bytes=1)
+    env = _environment(cache, {f"t{i}.jinja": f"{{{{ project_name }}}} {i}" for i in range(3)})
+    for i in range(3):
+        env.get_template(f"t{i}.jinja")
+
+    assert cache.entries() == []
+    assert cache.counters["evictions"] == 3
+
+
+def test_bytecode_cache_stats_and_clear(tmp_path: Path):
+    """Counters persist across flushes and clearing resets everything."""
+    cache = CompiledTemplateCache(tmp_path)
+    _environment(cache, {"a.jinja": "a"}).get_template("a.jinja")
+    cache.flush_stats()
+    second = CompiledTemplateCache(tmp_path)
+    _environment(second, {"a.jinja": "a"}).get_template("a.jinja")
+    second.flush_stats()
+
+    reader = CompiledTemplateCache(tmp_path)
+    stats = reader.stats()
+    assert stats["entries"] == 1
+    assert stats["misses"] == 1 and stats["hits"] == 1
+    assert stats["hit_rate"] == 0.5
+
+    reader.clear()
+    assert reader.stats()["entries"] == 0
+    assert reader.stats()["misses"] == 0
+
+
+def test_output_cache_materializes_identical_project(tmp_path: Path, monkeypatch):
+    """The second seeded create is served from the cache, byte for byte, as files of its own."""
+    from scaffoldor import scaffold
+    from scaffoldor.cache import OutputCache
+
+    cache = OutputCache(tmp_path / "outputs")
+    monkeypatch.setattr(scaffold, "get_output_cache", lambda: cache)
+    # A hit must not render anything
+    scaffold.create_structure(tmp_path / "a" / "app", seed="1", durable=False)
+    monkeypatch.setattr(scaffold, "_write_project", None)
+    scaffold.create_structure(tmp_path / "b" / "app", seed="1", durable=False, cache_link="copy")
+
+    assert cache.counters == {"hits": 1, "misses": 1, "writes": 1, "evictions": 0}
+    for path in (tmp_path / "a" / "app").rglob("*"):
+        if path.is_file():
+            assert (tmp_path / "b" / "app" / path.relative_to(tmp_path / "a" / "app")).read_bytes() == path.read_bytes()
+    readme = tmp_path / "b" / "app" / "README.md"
+    assert readme.stat().st_mode & 0o777 == scaffold.FILE_MODE
+    readme.write_text("edited")
+    assert [path.read_text() != "edited" for path in cache.directory.glob("*/README.md")] == [True]
+
+
+def test_output_cache_misses_when_an_included_template_changes(tmp_path: Path, monkeypatch):
+    """The cache key covers templates the content files include, read through the environment's loader."""
+    from jinja2 import FileSystemLoader
+
+    from scaffoldor import scaffold
+    from scaffoldor.cache import OutputCache
+
+    cache = OutputCache(tmp_path / "outputs")
+    monkeypatch.setattr(scaffold, "get_output_cache", lambda: cache)
+    content = tmp_path / "content"
+    content.mkdir()
+    (content / "README.md.jinja").write_text("{% include '_header.jinja' %}")
+    (content / "_header.jinja").write_text("# {{ project_name }}")
+    config = {"structure": {}, "content_files": {"README.md": "README.md.jinja"}}
+
+    def create(destination: Path):
+        env = scaffold.make_environment(FileSystemLoader(str(content)))
+        scaffold.create_structure(destination / "app", template_config=config, env=env, seed="1", durable=False)
+
+    create(tmp_path / "a")
+    (content / "_header.jinja").write_text("## {{ project_name }}")
+    create(tmp_path / "b")
+
+    assert cache.counters["hits"] == 0 and cache.counters["misses"] == 2
+    assert (tmp_path / "b" / "app" / "README.md").read_text() == "## app"
+
+
+def test_output_cache_lru_eviction(tmp_path: Path):
+    from scaffoldor.cache import OutputCache
+
+    source = tmp_path / "project"
+    source.mkdir()
+    (source / "file.txt").write_bytes(b"x" * 100)
+    cache = OutputCache(tmp_path / "outputs", max_bytes=150)
+    cache.store("first", source)
+    cache.store("second", source)
+
+    assert cache.lookup("first") is None
+    assert cache.lookup("second") is not None
+    assert cache.counters["evictions"] == 1
+    assert not (tmp_path / "outputs" / "first").exists()
+
+
+def test_bytecode_cache_scans_once_per_process(tmp_path: Path, monkeypatch):
+    """Writes below the size limit update a running total instead of listing the cache directory."""
+    cache = CompiledTemplateCache(tmp_path)
+    scans = []
+    entries = cache.entries
+    monkeypatch.setattr(cache, "entries", lambda: scans.append(1) or entries())
+    env = _environment(cache, {f"t{i}.jinja": f"{{{{ project_name }}}} {i}" for i in range(50)})
+    for i in range(50):
+        env.get_template(f"t{i}.jinja")
+
+    assert cache.counters["writes"] == 50
+    assert len(scans) == 1
+
+
+def test_environment_keeps_every_compiled_template():
+    """Templates with more files than Jinja2's default cache size are still compiled once per process."""
+    from jinja2 import DictLoader
+
+    from scaffoldor.scaffold import make_environment
+
+    env = make_environment(DictLoader({f"t{i}.jinja": f"{i}" for i in range(500)}))
+    first = env.get_template("t0.jinja")
+    for i in range(1, 500):
+        env.get_template(f"t{i}.jinja")
+    assert env.get_template("t0.jinja") is first
@@ -1,6 +1,48 @@
 import subprocess
 import sys
 
+import pytest
+
+# Import budgets (microseconds of module import time, on top of a bare interpreter)
+# for commands that shell tooling calls thousands of times a day. Neither may load Jinja2.
+IMPORT_BUDGETS_US = {
+    "--version": 100_000,
+    "list-templates": 150_000,
+}
+FORBIDDEN_MODULES = ("jinja2", "markupsafe")
+
+
+def _import_times(*cli_args: str) -> dict:
+    """Runs the CLI under ``python -X importtime`` and returns {module: self time in us}."""
+    code = (
+        "import sys\n"
+        f"sys.argv = ['scaffoldor', *{list(cli_args)!r}]\n"
+        "from scaffoldor.cli import main\n"
+        "try:\n    main()\nexcept SystemExit:\n    pass\n"
+    ) if cli_args else "pass"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            times[name.strip()] = int(self_us)
+    return times
+
+
 def test_version_flag():
     result = subprocess.run([sys.executable, "-m", "scaffoldor.cli", "--version"], capture_output=True, text=True)
     assert "scaffoldor version" in result.stdout
+
+
+@pytest.mark.parametrize("command", sorted(IMPORT_BUDGETS_US))
+def test_fast_commands_import_budget(command):
+    """Fast-path commands stay within their import budget and never import Jinja2."""
+    baseline = sum(_import_times().values())
+    times = _import_times(command)
+
+    heavy = sorted(name for name in times if name.split(".")[0] in FORBIDDEN_MODULES)
+    assert heavy == [], f"'{command}' imported {heavy}"
+    spent = sum(times.values()) - baseline
+    assert spent < IMPORT_BUDGETS_US[command], f"'{command}' spent {spent} us importing modules"
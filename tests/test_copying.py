@@ -0,0 +1,67 @@
+# tests/test_copying.py
+import errno
+import io
+import json
+import os
+import tarfile
+from pathlib import Path
+
+from scaffoldor import copying
+from scaffoldor.backends import TarBackend
+from scaffoldor.manifest import MANIFEST_NAME, hash_bytes
+from scaffoldor.scaffold import create_structure
+
+
+def test_static_files_are_copied_verbatim(tmp_project_dir: Path):
+    """Static entries skip Jinja2: binary and template-like bytes arrive unchanged, on disk and in archives."""
+    from jinja2 import Environment, FileSystemLoader
+
+    content = tmp_project_dir / "content"
+    (content / "assets").mkdir(parents=True)
+    logo = bytes(range(256)) * 64  # not valid UTF-8
+    lockfile = b"{{ not a template }}\r\n"
+    (content / "assets" / "logo.png").write_bytes(logo)
+    (content / "app.lock").write_bytes(lockfile)
+    (content / "README.md.jinja").write_text("# {{ project_name }}")
+    config = {
+        "structure": {"static": []},
+        "static_files": ["*.png"],
+        "content_files": {
+            "static/logo.png": "assets/logo.png",
+            "app.lock": {"source": "app.lock", "static": True},
+            "README.md": "README.md.jinja",
+        },
+    }
+    env = Environment(loader=FileSystemLoader(str(content)))
+
+    project_path = tmp_project_dir / "out" / "static-app"
+    create_structure(project_path, template_config=config, env=env, durable=False, static_link="hardlink")
+    assert (project_path / "static" / "logo.png").read_bytes() == logo
+    assert (project_path / "app.lock").read_bytes() == lockfile
+    assert (project_path / "app.lock").stat().st_ino == (content / "app.lock").stat().st_ino
+    assert (project_path / "README.md").read_text() == "# static-app"
+    manifest = json.loads((project_path / MANIFEST_NAME).read_text())
+    assert manifest["files"]["static/logo.png"]["output"] == hash_bytes(logo)
+
+    buffer = io.BytesIO()
+    with TarBackend(buffer, prefix="static-app") as backend:
+        create_structure(Path("static-app"), template_config=config, env=env, backend=backend)
+    with tarfile.open(fileobj=io.BytesIO(buffer.getvalue())) as archive:
+        assert archive.extractfile("static-app/static/logo.png").read() == logo
+
+
+def test_copy_bytes_falls_back_from_copy_file_range(tmp_path: Path, monkeypatch):
+    """Without copy_file_range (e.g. across file systems on old kernels) the copy still happens in the kernel."""
+    source = tmp_path / "asset.bin"
+    source.write_bytes(os.urandom(3 * 1024 * 1024 + 7))
+    monkeypatch.setattr(copying, "KERNEL_COPY_CHUNK", 1024 * 1024)
+    copying.copy_bytes(source, tmp_path / "range.bin")
+
+    def unsupported(*args):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "copy_file_range", unsupported, raising=False)
+    copying.copy_bytes(source, tmp_path / "sendfile.bin")
+
+    assert (tmp_path / "range.bin").read_bytes() == source.read_bytes()
+    assert (tmp_path / "sendfile.bin").read_bytes() == source.read_bytes()
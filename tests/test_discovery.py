@@ -0,0 +1,76 @@
+# tests/test_discovery.py
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from scaffoldor.discovery import ContentManifest, glob_regex, validate_content_roots
+
+
+def _age(content_dir: Path) -> None:
+    """Moves directory mtimes out of the racy window, so the manifest trusts them."""
+    old = time.time() - 60
+    for dirpath, _, _ in os.walk(content_dir):
+        os.utime(dirpath, (old, old))
+
+
+def test_content_roots_are_expanded_and_cached(tmp_path: Path):
+    content = tmp_path / "content"
+    (content / "fastapi" / "backend" / "app" / "api").mkdir(parents=True)
+    (content / "fastapi" / "backend" / "main.py.jinja").write_text("")
+    (content / "fastapi" / "backend" / "app" / "api" / "routes.py.jinja").write_text("")
+    (content / "fastapi" / "backend" / "app" / "notes.txt").write_text("")
+    (content / "fastapi" / "backend" / "app" / "skip.py.jinja").write_text("")
+    _age(content)
+    rules = [{"root": "fastapi/backend", "output": "backend", "include": "**/*.jinja", "exclude": ["**/skip*"]}]
+    manifest_path = tmp_path / "manifest.json"
+
+    manifest = ContentManifest(content, manifest_path)
+    expected = {
+        "backend/app/api/routes.py": "fastapi/backend/app/api/routes.py.jinja",
+        "backend/main.py": "fastapi/backend/main.py.jinja",
+    }
+    assert manifest.expand(rules) == expected and manifest.walked == 1
+
+    # Another process reads the stored expansion and only stats the directories
+    manifest = ContentManifest(content, manifest_path)
+    assert manifest.expand(rules) == expected and manifest.walked == 0
+
+    (content / "fastapi" / "backend" / "app" / "api" / "users.py.jinja").write_text("")
+    assert manifest.expand(rules)["backend/app/api/users.py"] == "fastapi/backend/app/api/users.py.jinja"
+    assert manifest.walked == 1
+
+    with pytest.raises(ValueError):
+        manifest.expand(rules + [{"root": "fastapi", "output": "", "include": "backend/main.py.jinja"}])
+
+
+def test_globs_and_rule_validation():
+    assert glob_regex("**/*.jinja").match("README.md.jinja")
+    assert glob_regex("**/*.jinja").match("a/b/c.jinja")
+    assert not glob_regex("*.jinja").match("a/b.jinja")
+    assert glob_regex("v[0-9]/*").match("v1/x") and not glob_regex("v[!0-9]/*").match("v1/x")
+    validate_content_roots([{"root": "backend", "include": ["*.py.jinja"], "static": False}])
+    for rules in ({"root": "backend"}, [{"root": "../outside"}], [{"root": "a", "glob": "*"}], [{"root": "a", "include": [1]}]):
+        with pytest.raises(ValueError):
+            validate_content_roots(rules)
+
+
+def test_create_structure_discovers_content_files(tmp_project_dir: Path):
+    from jinja2 import Environment, FileSystemLoader
+    from scaffoldor.scaffold import create_structure
+
+    content = tmp_project_dir / "content"
+    (content / "backend" / "app").mkdir(parents=True)
+    (content / "backend" / "app" / "main.py.jinja").write_text("# {{ project_name }}")
+    (content / "backend" / "logo.png").write_bytes(b"\x89PNG{{")
+    config = {
+        "structure": {},
+        "content_roots": [{"root": "backend"}],
+        "content_files": {"backend/logo.png": {"source": "backend/logo.png", "static": True}},
+    }
+
+    project = tmp_project_dir / "out" / "globbed"
+    create_structure(project, template_config=config, env=Environment(loader=FileSystemLoader(str(content))), durable=False)
+    assert (project / "backend" / "app" / "main.py").read_text() == "# globbed"
+    assert (project / "backend" / "logo.png").read_bytes() == b"\x89PNG{{"
@@ -0,0 +1,69 @@
+# tests/test_fan_out.py
+from pathlib import Path
+
+import pytest
+
+from scaffoldor.scaffold import create_structure
+
+
+def _fan_out_config() -> dict:
+    return {
+        "structure": {"app": ["models"]},
+        "content_files": {
+            "app/models/{{ entity.name }}.py": {"source": "model.py.jinja", "for_each": "entities", "as": "entity"},
+            "app/api/{{ version }}/{{ entity.name }}.py": {"source": "route.py.jinja", "for_each": "entities", "as": "entity"},
+            "README.md": "readme.jinja",
+        },
+    }
+
+
+def test_fan_out_renders_one_file_per_item(tmp_project_dir: Path):
+    """for_each entries render once per list item, in parallel or not, with the item in the context."""
+    from jinja2 import DictLoader, Environment
+
+    from scaffoldor.backends import MemoryBackend
+
+    env = Environment(loader=DictLoader({
+        "model.py.jinja": "class {{ entity.name | title }}:  # {{ project_name }}\n",
+        "route.py.jinja": "{{ entity.name }}s = {{ entity.fields }}\n",
+        "readme.jinja": "{{ entities | length }} entities",
+    }))
+    entities = [{"name": f"e{i}", "fields": [i]} for i in range(50)]
+    outputs = []
+    for jobs in (1, 4):
+        backend = MemoryBackend()
+        create_structure(Path("fanned"), template_config=_fan_out_config(), env=env, backend=backend, jobs=jobs,
+                         context={"entities": entities, "version": "v1"})
+        outputs.append(backend.files)
+    assert outputs[0] == outputs[1]
+    files = outputs[0]
+    assert sum(name.startswith("app/") for name in files) == 100
+    assert files["app/models/e7.py"] == b"class E7:  # fanned"
+    assert files["app/api/v1/e42.py"] == b"e42s = [42]"
+    assert files["README.md"] == b"50 entities"
+
+
+def test_fan_out_rejects_bad_lists_and_paths(tmp_project_dir: Path):
+    from jinja2 import Environment
+
+    from scaffoldor.exceptions import TemplateConfigError, VariableError
+    from scaffoldor.scaffold import expand_content_entries, validate_content_files
+
+    env = Environment()
+    config = _fan_out_config()
+    with pytest.raises(VariableError):
+        list(expand_content_entries(env, config, {"entities": "not a list", "version": "v1"}))
+    with pytest.raises(ValueError):
+        list(expand_content_entries(env, config, {"entities": [{"name": "a"}, {"name": "a"}], "version": "v1"}))
+    with pytest.raises(ValueError):
+        list(expand_content_entries(env, config, {"entities": [{"name": "../../etc"}], "version": "v1"}))
+    with pytest.raises(ValueError):
+        validate_content_files({"content_files": {"x/{{ e }}": {"source": "x.jinja", "for_each": "items", "as": "not valid"}}})
+
+    # Malformed Jinja2 is a config error, reported by create_structure like the others
+    for output, for_each in (("x/{{ e }}", "items |"), ("x/{{ e", "items")):
+        broken = {"structure": {}, "content_files": {output: {"source": "x.jinja", "for_each": for_each, "as": "e"}}}
+        with pytest.raises(TemplateConfigError):
+            list(expand_content_entries(env, broken, {"items": [1]}))
+        with pytest.raises(SystemExit):
+            create_structure(tmp_project_dir / "broken", template_config=broken, context={"items": [1]}, durable=False)
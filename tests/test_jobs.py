@@ -0,0 +1,42 @@
+# tests/test_jobs.py
+from pathlib import Path
+
+import pytest
+
+from scaffoldor.scaffold import create_structure
+
+
+def test_create_structure_parallel_jobs(tmp_project_dir: Path):
+    """Rendering with a worker pool produces the same files as the serial path."""
+    serial_path = tmp_project_dir / "serial-app"
+    parallel_path = tmp_project_dir / "parallel-app"
+
+    create_structure(serial_path, template_name="default")
+    create_structure(parallel_path, template_name="default", jobs=4)
+
+    for name in ("README.md", "docker-compose.yml"):
+        serial = (serial_path / name).read_text().replace("serial-app", "{name}").replace("serial_app", "{db}")
+        parallel = (parallel_path / name).read_text().replace("parallel-app", "{name}").replace("parallel_app", "{db}")
+        assert serial == parallel
+
+
+def test_create_files_collects_errors(tmp_project_dir: Path, caplog):
+    """Every failing template is reported once before exiting."""
+    from scaffoldor.scaffold import create_files
+
+    config = {
+        "structure": {},
+        "content_files": {
+            "README.md": "README.md.jinja",
+            "missing-one.txt": "does-not-exist-1.jinja",
+            "missing-two.txt": "does-not-exist-2.jinja",
+        },
+    }
+
+    with pytest.raises(SystemExit) as excinfo:
+        create_files(tmp_project_dir, "broken", config, jobs=3)
+
+    assert excinfo.value.code == 1
+    assert (tmp_project_dir / "README.md").exists()
+    assert "Failed to generate 2 file(s):" in caplog.text
+    assert caplog.text.index("does-not-exist-1.jinja") < caplog.text.index("does-not-exist-2.jinja")
@@ -0,0 +1,139 @@
+# tests/test_plan.py
+from pathlib import Path
+
+import pytest
+from jinja2 import Environment
+
+from scaffoldor.plan import UnsupportedTemplate, compile_plan, compile_segments, execute_plan, render_segments
+from scaffoldor.scaffold import create_structure
+
+
+def test_compiled_plan_matches_jinja_output(tmp_project_dir: Path):
+    """A project created from a plan is identical to one rendered with Jinja2."""
+    plan = compile_plan("default")
+    assert all("segments" in entry for entry in plan["files"])
+    assert "backend/app/api/v1" in plan["directories"]
+
+    execute_plan(plan, tmp_project_dir / "plan" / "my-app")
+    create_structure(tmp_project_dir / "jinja" / "my-app")
+
+    for relative in ("README.md", "docker-compose.yml", ".env.example", "backend/app/core"):
+        planned, rendered = tmp_project_dir / "plan" / "my-app" / relative, tmp_project_dir / "jinja" / "my-app" / relative
+        assert planned.exists()
+        if planned.is_file() and relative != ".env.example":
+            assert planned.read_text() == rendered.read_text()
+
+    # Only the random secret differs
+    planned_env = (tmp_project_dir / "plan" / "my-app" / ".env.example").read_text().splitlines()
+    rendered_env = (tmp_project_dir / "jinja" / "my-app" / ".env.example").read_text().splitlines()
+    assert planned_env[:-1] == rendered_env[:-1]
+
+
+def test_compile_segments_expressions():
+    env = Environment()
+    segments = compile_segments(env, "db={{ name | lower | replace('-', '_') ~ '_db' }} {{ missing | default('x') }}")
+    assert render_segments(segments, {"name": "My-App"}) == "db=my_app_db x"
+
+
+def test_filter_arguments_match_jinja_or_fall_back():
+    """Filters compile only with arguments the plan can evaluate, and then render like Jinja2."""
+    env = Environment()
+    source = "{{ users | join(', ', 'name') }}"
+    users = [{"name": "ada"}, {"name": "grace"}]
+    assert render_segments(compile_segments(env, source), {"users": users}) == env.from_string(source).render(users=users)
+    for source in ("{{ name | lower(1) }}", "{{ users | join(',', attribute='name') }}"):
+        with pytest.raises(UnsupportedTemplate):
+            compile_segments(env, source)
+
+
+def test_unsupported_templates_fall_back_to_jinja(tmp_project_dir: Path):
+    env = Environment()
+    with pytest.raises(UnsupportedTemplate):
+        compile_segments(env, "{% for i in range(3) %}{{ i }}{% endfor %}")
+
+    plan = {
+        "template": "custom",
+        "directories": ["docs"],
+        "files": [{"path": "docs/list.txt", "template": "list.jinja", "source_hash": "x",
+                   "jinja_source": "{% for i in range(3) %}{{ i }}{% endfor %}"}],
+    }
+    execute_plan(plan, tmp_project_dir / "loop-app")
+    assert (tmp_project_dir / "loop-app" / "docs" / "list.txt").read_text() == "012"
+
+
+def test_plans_embed_loaded_templates_and_static_files(tmp_project_dir: Path, monkeypatch):
+    """Included templates and static bytes travel inside the plan, so executing it needs no template files."""
+    from jinja2 import FileSystemLoader
+
+    from scaffoldor import plan as plan_module
+    from scaffoldor.scaffold import make_environment
+
+    content = tmp_project_dir / "templates" / "content"
+    content.mkdir(parents=True)
+    (content / "_header.jinja").write_text("# {{ project_name }}\n")
+    (content / "README.md.jinja").write_text("{% include '_header.jinja' %}{% for i in range(2) %}{{ i }}{% endfor %}")
+    (content / "logo.png").write_bytes(bytes(range(256)))
+    config = {"structure": {}, "content_files": {"README.md": "README.md.jinja",
+                                                  "logo.png": {"source": "logo.png", "static": True}}}
+    monkeypatch.setattr(plan_module, "load_template_config", lambda name: config)
+    monkeypatch.setattr(plan_module, "get_environment", lambda: make_environment(FileSystemLoader(str(content))))
+    monkeypatch.setattr(plan_module, "default_templates_dir", lambda: content.parent)
+
+    plan = compile_plan("partials")
+    assert plan["templates"] == {"_header.jinja": "# {{ project_name }}\n"}
+    for path in content.iterdir():
+        path.unlink()
+    execute_plan(plan, tmp_project_dir / "out" / "app", durable=False)
+    assert (tmp_project_dir / "out" / "app" / "README.md").read_text() == "# app01"
+    assert (tmp_project_dir / "out" / "app" / "logo.png").read_bytes() == bytes(range(256))
+
+    (content / "README.md.jinja").write_text("{% include name ~ '.jinja' %}")
+    with pytest.raises(SystemExit):
+        compile_plan("partials")
+
+
+def test_fan_out_paths_needing_jinja_compile_once(monkeypatch):
+    """A fan-out path left as Jinja2 source is compiled once per entry, not once per item."""
+    from scaffoldor.plan import _plan_files
+
+    env = Environment()
+    compiled = []
+    from_string = env.from_string
+    monkeypatch.setattr(env, "from_string", lambda source: compiled.append(source) or from_string(source))
+    plan = {"files": [{"path": "docs/{{ page | title }}.md", "for_each": "pages", "as": "page"}]}
+
+    paths = [path for path, _, _ in _plan_files(plan, {"pages": [f"p{i}" for i in range(100)]}, lambda: env)]
+    assert paths[:2] == ["docs/P0.md", "docs/P1.md"] and len(paths) == 100
+    assert [source for source in compiled if isinstance(source, str)] == ["docs/{{ page | title }}.md"]
+
+
+def test_fallback_files_compile_once_per_plan(tmp_project_dir: Path, monkeypatch):
+    """A fallback template fanned out to many files is compiled once, not once per file."""
+    import jinja2
+
+    compiled = []
+    compile_source = jinja2.Environment.compile
+    monkeypatch.setattr(jinja2.Environment, "compile",
+                        lambda self, source, *args, **kwargs: compiled.append(source) or compile_source(self, source, *args, **kwargs))
+    plan = {
+        "template": "custom",
+        "directories": [],
+        "files": [{"path": "{{ i }}.txt", "template": "list.jinja", "source_hash": "x", "for_each": "range(20)",
+                   "as": "i", "jinja_source": "{% for j in range(i) %}{{ j }}{% endfor %}"}],
+    }
+    execute_plan(plan, tmp_project_dir / "app", durable=False)
+
+    assert (tmp_project_dir / "app" / "4.txt").read_text() == "0123"
+    assert len([source for source in compiled if source == plan["files"][0]["jinja_source"]]) <= 1
+
+
+def test_plan_manifest_matches_create(tmp_project_dir: Path):
+    """A seeded project created from a plan records the same files as one created directly."""
+    from scaffoldor.manifest import read_manifest
+
+    create_structure(tmp_project_dir / "direct" / "app", seed="7", durable=False, output_cache=False)
+    execute_plan(compile_plan("default"), tmp_project_dir / "planned" / "app", durable=False, seed="7")
+
+    direct = read_manifest(tmp_project_dir / "direct" / "app")
+    planned = read_manifest(tmp_project_dir / "planned" / "app")
+    assert planned["files"] == direct["files"]
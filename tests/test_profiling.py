@@ -0,0 +1,44 @@
+# tests/test_profiling.py
+import json
+from pathlib import Path
+
+from scaffoldor.profiling import Profiler, add_hook, remove_hook, span
+from scaffoldor.scaffold import create_structure
+
+
+def test_profiler_records_pipeline_phases(tmp_project_dir: Path):
+    """Creating a project reports config, mkdir, compile, render, write and manifest spans with counts."""
+    with Profiler() as profiler:
+        create_structure(tmp_project_dir / "profiled", jobs=2)
+
+    phases = profiler.phases()
+    for phase in ("config_load", "mkdir", "compile", "render", "write", "manifest"):
+        assert phase in phases
+    assert phases["write"]["files"] == phases["render"]["count"]
+    assert phases["write"]["bytes"] == phases["render"]["bytes"] > 0
+    assert "README.md.jinja" in dict(profiler.templates())
+    assert "render" in profiler.table()
+
+    trace_path = tmp_project_dir / "trace.json"
+    profiler.write(trace_path)
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    assert {event["cat"] for event in events} >= {"render", "write"}
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+
+
+def test_hooks_receive_finished_spans():
+    """Hooks see every span once it ends; spans are no-ops when nobody listens."""
+    seen = []
+    add_hook(seen.append)
+    try:
+        with span("render", template="a.jinja") as timing:
+            timing.bytes = 42
+    finally:
+        remove_hook(seen.append)
+
+    assert [(s.name, s.attrs, s.bytes) for s in seen] == [("render", {"template": "a.jinja"}, 42)]
+    assert seen[0].duration_ns >= 0
+
+    with span("render") as timing:
+        timing.files += 1  # Accepted and ignored without hooks
+    assert len(seen) == 1
@@ -0,0 +1,121 @@
+# tests/test_registry.py
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from scaffoldor.registry import TemplateRegistry
+
+
+def _write_template(templates_dir: Path, name: str, **config) -> Path:
+    path = templates_dir / f"{name}.json"
+    path.write_text(json.dumps({"structure": {}, **config}))
+    return path
+
+
+def test_registry_indexes_templates(tmp_path: Path):
+    """Template metadata is served from the index and filtered by keyword."""
+    _write_template(tmp_path, "api", description="API only", keywords=["Backend"], content_files={"README.md": "r"})
+    _write_template(tmp_path, "web", description="Web only", keywords=["frontend"])
+    (tmp_path / "broken.json").write_text("{not json")
+
+    registry = TemplateRegistry(tmp_path, index_path=tmp_path / "index" / "registry.json")
+
+    assert registry.names() == ["api", "broken", "web"]
+    assert registry.names("backend") == ["api"]
+    assert registry.get("api")["content_files"] == ["README.md"]
+    assert registry.get("api")["description"] == "API only"
+    assert "error" in registry.get("broken")
+    assert registry.get("missing") is None
+
+
+def test_registry_rejects_malformed_keywords(tmp_path: Path, monkeypatch):
+    """Keywords that are not a list of strings make the template unusable instead of breaking keyword search."""
+    from scaffoldor import scaffold
+    from scaffoldor.exceptions import TemplateConfigError
+
+    _write_template(tmp_path, "api", keywords="api")
+    _write_template(tmp_path, "web", keywords=["web", 3])
+    _write_template(tmp_path, "cli", keywords=["Tools"])
+    registry = TemplateRegistry(tmp_path, index_path=tmp_path / "index" / "registry.json")
+    monkeypatch.setattr(scaffold, "get_registry", lambda: registry)
+
+    assert registry.names("tools") == ["cli"]
+    assert registry.names("a") == []
+    for name in ("api", "web"):
+        with pytest.raises(TemplateConfigError, match="keywords"):
+            scaffold.resolve_template_config(name)
+
+
+def test_registry_refreshes_incrementally(tmp_path: Path):
+    """Only templates whose files changed are parsed again, including across processes."""
+    api = _write_template(tmp_path, "api", description="v1")
+    _write_template(tmp_path, "web")
+    index_path = tmp_path / "index" / "registry.json"
+
+    first = TemplateRegistry(tmp_path, index_path=index_path)
+    first.refresh()
+    assert first.parsed == 2
+
+    # A new registry (e.g. the next CLI invocation) starts from the stored index
+    second = TemplateRegistry(tmp_path, index_path=index_path)
+    second.refresh()
+    assert second.parsed == 0
+
+    api.write_text(json.dumps({"structure": {}, "description": "version two"}))
+    os.utime(api, ns=(0, 1))
+    assert second.get("api")["description"] == "version two"
+    assert second.parsed == 1
+
+    (tmp_path / "web.json").unlink()
+    assert second.names() == ["api"]
+
+
+def test_registry_resolves_inheritance(tmp_path: Path):
+    """Child templates are layered over their parents, and the flattened result is cached."""
+    _write_template(
+        tmp_path, "base",
+        structure={"backend": ["app"], "docs": []},
+        content_files={"README.md": "README.md.jinja", ".env.example": ".env.example.jinja"},
+        description="base",
+    )
+    _write_template(tmp_path, "api", extends="base", structure={"frontend": None}, content_files={".env.example": None})
+    mid = _write_template(
+        tmp_path, "mid", extends="base", structure={"docs": ["adr"]}, content_files={"Makefile": "mid/Makefile.jinja"}
+    )
+    _write_template(tmp_path, "leaf", extends="mid", description="leaf")
+    index_path = tmp_path / "index" / "registry.json"
+
+    registry = TemplateRegistry(tmp_path, index_path=index_path)
+    leaf = registry.resolve("leaf")
+    assert "extends" not in leaf
+    assert leaf["description"] == "leaf"
+    assert leaf["structure"] == {"backend": ["app"], "docs": ["adr"]}
+    assert leaf["content_files"] == {
+        "README.md": "README.md.jinja", ".env.example": ".env.example.jinja", "Makefile": "mid/Makefile.jinja",
+    }
+    assert registry.resolve("api")["content_files"] == {"README.md": "README.md.jinja"}
+
+    # A later run reuses the flattened chain from the index ...
+    again = TemplateRegistry(tmp_path, index_path=index_path)
+    assert again.resolve("leaf") == leaf
+    assert again.resolved == 0
+
+    # ... until a template in the chain changes
+    mid.write_text(json.dumps({"extends": "base", "structure": {"docs": ["rfc"]}}))
+    os.utime(mid, ns=(0, 1))
+    assert again.resolve("leaf")["structure"]["docs"] == ["rfc"]
+    assert again.resolved == 2
+
+
+def test_registry_rejects_inheritance_cycles(tmp_path: Path):
+    _write_template(tmp_path, "a", extends="b")
+    _write_template(tmp_path, "b", extends="a")
+    _write_template(tmp_path, "orphan", extends="missing")
+    registry = TemplateRegistry(tmp_path, index_path=tmp_path / "index" / "registry.json")
+
+    with pytest.raises(ValueError, match="cycle"):
+        registry.resolve("a")
+    with pytest.raises(ValueError, match="unknown template 'missing'"):
+        registry.resolve("orphan")
@@ -0,0 +1,46 @@
+# tests/test_reproducible.py
+import asyncio
+import io
+import json
+from pathlib import Path
+
+from scaffoldor.aio import scaffold
+from scaffoldor.backends import archive_backend
+from scaffoldor.manifest import MANIFEST_NAME
+from scaffoldor.reproducible import normalize_chunks
+from scaffoldor.scaffold import create_structure
+
+
+def _tree(root: Path) -> dict:
+    return {p.relative_to(root).as_posix(): (p.read_bytes(), p.stat().st_mode) for p in sorted(root.rglob("*")) if p.is_file()}
+
+
+def test_seeded_projects_are_byte_identical(tmp_project_dir: Path):
+    """Same seed and name: same bytes and modes, whether rendered serially, threaded, streamed or async."""
+    options = {"seed": "42", "durable": False, "output_cache": False}
+    create_structure(tmp_project_dir / "a" / "app", **options)
+    create_structure(tmp_project_dir / "b" / "app", jobs=4, stream=True, stream_buffer=16, **options)
+    asyncio.run(scaffold(tmp_project_dir / "c" / "app", seed="42", durable=False))
+    create_structure(tmp_project_dir / "d" / "app", **{**options, "seed": "43"})
+
+    reference = _tree(tmp_project_dir / "a" / "app")
+    assert _tree(tmp_project_dir / "b" / "app") == reference
+    assert _tree(tmp_project_dir / "c" / "app") == reference
+    manifest = json.loads(reference[MANIFEST_NAME][0])
+    assert manifest["seed"] == "42" and len(manifest["tree_hash"]) == 64
+    # A different seed draws different secrets
+    assert _tree(tmp_project_dir / "d" / "app")[".env.example"] != reference[".env.example"]
+
+
+def test_seeded_archives_are_byte_identical():
+    outputs = []
+    for jobs in (1, 4):
+        buffer = io.BytesIO()
+        with archive_backend("tar.gz", buffer, prefix="app", mtime=315532800) as backend:
+            create_structure(Path("app"), backend=backend, seed="7", jobs=jobs)
+        outputs.append(buffer.getvalue())
+    assert outputs[0] == outputs[1]
+
+
+def test_normalize_chunks_handles_split_crlf():
+    assert "".join(normalize_chunks(["a\r", "\nb\r\n", "c\r"])) == "a\nb\nc\r"
@@ -113,6 +113,7 @@ def test_init_template_command(tmp_path):
 
         # Now, patch sys.path so that scaffoldor.cli and scaffoldor.scaffold can find these mock templates
         with patch.object(sys, 'argv', ['scaffoldor', 'init', new_template_name]), \
+             patch('scaffoldor.cli.__file__', str(mock_scaffoldor_root / "scaffoldor" / "cli.py")), \
              patch('scaffoldor.cli.Path', wraps=Path) as mock_cli_path_obj, \
              patch('scaffoldor.scaffold.Path', wraps=Path) as mock_scaffold_path_obj:
 
@@ -159,15 +160,15 @@ def test_init_template_command(tmp_path):
         assert config["description"] == f"A custom template for {new_template_name}"
         assert "structure" in config
         assert "content_files" in config
-        assert config["content_files"]["README.md"] == f"{new_template_name}_example/README.md.jinja"
+        # Structure and content files are inherited from the default template instead of copied
+        assert config["extends"] == "default"
+        assert config["content_files"] == {}
 
 
-    # Verify the new content directory and files exist
+    # Verify the new content directory exists and nothing was copied into it
     new_template_content_dir = mock_template_dir / "content" / f"{new_template_name}_example"
     assert new_template_content_dir.exists()
-    assert (new_template_content_dir / "README.md.jinja").exists()
-    assert (new_template_content_dir / ".env.example.jinja").exists()
-    assert (new_template_content_dir / "docker-compose.yml.jinja").exists()
+    assert list(new_template_content_dir.iterdir()) == []
 
 
 # --- Scaffolding Logic Tests ---
@@ -355,4 +356,4 @@ def test_dynamic_env_and_docker_compose_content(tmp_project_dir: Path):
 
     docker_content = docker_path.read_text()
     assert f"POSTGRES_DB: {expected_db_name}" in docker_content
-    assert f"KC_DB_URL: jdbc:postgresql://db:5432/{expected_db_name}" in docker_content
\ No newline at end of file
+    assert f"KC_DB_URL: jdbc:postgresql://db:5432/{expected_db_name}" in docker_content
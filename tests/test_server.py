@@ -0,0 +1,108 @@
+# tests/test_server.py
+import io
+import tarfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from scaffoldor.client import ServerError, request, server_create, server_status
+from scaffoldor.server import make_server
+
+
+@pytest.fixture
+def daemon(tmp_path: Path):
+    """Runs a scaffold daemon on a local TCP port for the duration of a test."""
+    server = make_server(port=0, roots=[tmp_path])
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_server_creates_projects(daemon: str, tmp_project_dir: Path):
+    """Create requests write the project and reuse the warm template config."""
+    result = server_create(tmp_project_dir / "served-app", address=daemon)
+
+    assert result["files"] == 3
+    assert "# served-app" in (tmp_project_dir / "served-app" / "README.md").read_text()
+    server_create(tmp_project_dir / "second-app", address=daemon)
+    assert server_status(address=daemon)["cached_configs"] == 1
+
+
+def test_server_reports_errors(daemon: str, tmp_project_dir: Path):
+    """Failures come back as ServerError with the pipeline's message; the daemon keeps running."""
+    (tmp_project_dir / "taken").mkdir()
+    with pytest.raises(ServerError, match="already exists"):
+        server_create(tmp_project_dir / "taken", address=daemon)
+    with pytest.raises(ServerError) as excinfo:
+        server_create(tmp_project_dir / "other", template_name="non_existent_template", address=daemon)
+    assert excinfo.value.error_type == "TemplateNotFoundError"
+    assert server_status(address=daemon) is not None
+
+
+def test_server_returns_archives(daemon: str):
+    """Archive requests return a tar of the rendered project without touching the target tree."""
+    content_type, data = request("POST", "/archive", {"project_name": "packed"}, address=daemon)
+
+    assert content_type == "application/x-tar"
+    names = tarfile.open(fileobj=io.BytesIO(data)).getnames()
+    assert "packed/README.md" in names
+    assert "packed/backend/app" in names
+
+
+def test_client_without_daemon(tmp_path: Path):
+    """With no daemon listening the client fails fast so 'create' can fall back to local scaffolding."""
+    with pytest.raises(OSError):
+        server_create(tmp_path / "app", address=f"unix:{tmp_path / 'missing.sock'}")
+    assert server_status(address=f"unix:{tmp_path / 'missing.sock'}") is None
+
+
+def test_tcp_requests_are_authenticated_and_confined(daemon: str, tmp_path: Path):
+    """TCP clients need the daemon's token and JSON requests, and projects stay below the daemon's roots."""
+    import http.client
+
+    host_port = daemon.split("://", 1)[1]
+    for headers in ({"Content-Type": "application/json"},
+                    {"Content-Type": "text/plain", "Authorization": f"Bearer {_token(daemon)}"},
+                    {"Content-Type": "application/json", "Authorization": f"Bearer {_token(daemon)}", "Host": "evil.example"}):
+        connection = http.client.HTTPConnection(host_port, timeout=5)
+        connection.request("POST", "/create", body=b'{"project_path": "%s"}' % str(tmp_path / "x").encode(), headers=headers)
+        assert connection.getresponse().status in (401, 403, 415)
+        connection.close()
+    assert not (tmp_path / "x").exists()
+
+    with pytest.raises(ServerError) as excinfo:
+        server_create(Path("/etc/scaffoldor-app"), address=daemon)
+    assert excinfo.value.error_type == "Forbidden"
+
+
+def _token(address: str) -> str:
+    from scaffoldor.client import server_token_path
+
+    return server_token_path(int(address.rsplit(":", 1)[1])).read_text()
+
+
+def test_client_falls_back_only_when_nothing_listens(tmp_path: Path):
+    """A refused connection means no daemon; a stalled one does not, as the request may be in progress."""
+    import socket
+
+    from scaffoldor.client import ServerUnavailable
+
+    stale = tmp_path / "stale.sock"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(stale))
+    listener.close()  # Leaves the socket file behind with nobody listening
+    with pytest.raises(ServerUnavailable):
+        request("GET", "/health", address=f"unix:{stale}")
+
+    silent = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    silent.bind(("127.0.0.1", 0))
+    silent.listen()
+    try:
+        with pytest.raises(OSError) as excinfo:
+            request("GET", "/health", address=f"http://127.0.0.1:{silent.getsockname()[1]}", timeout=0.2)
+        assert not isinstance(excinfo.value, ServerUnavailable)
+    finally:
+        silent.close()
@@ -0,0 +1,106 @@
+# tests/test_store.py
+import json
+from pathlib import Path
+
+from scaffoldor.store import compact_templates
+
+
+def _make_tree(templates_dir: Path) -> None:
+    content = templates_dir / "content"
+    (content / "custom_example" / "default_example").mkdir(parents=True)
+    (content / "README.md.jinja").write_text("# {{ project_name }}")
+    (content / "custom_example" / "README.md.jinja").write_text("# {{ project_name }}")
+    (content / "custom_example" / "extra.txt.jinja").write_text("custom only")
+    # Leftover from an old recursive copy that nothing references
+    (content / "custom_example" / "default_example" / "README.md.jinja").write_text("# {{ project_name }}")
+
+    (templates_dir / "default.json").write_text(json.dumps(
+        {"structure": {}, "content_files": {"README.md": "README.md.jinja"}}
+    ))
+    (templates_dir / "custom.json").write_text(json.dumps({"structure": {}, "content_files": {
+        "README.md": "custom_example/README.md.jinja",
+        "extra.txt": "custom_example/extra.txt.jinja",
+    }}))
+
+
+def test_compact_dry_run_changes_nothing(tmp_path: Path):
+    _make_tree(tmp_path)
+
+    result = compact_templates(tmp_path, dry_run=True)
+
+    assert result["removed"] == [
+        "custom_example/README.md.jinja",
+        "custom_example/default_example/README.md.jinja",
+    ]
+    assert result["rewritten"] == ["custom.json"]
+    assert (tmp_path / "content" / "custom_example" / "default_example" / "README.md.jinja").exists()
+
+
+def test_compact_deduplicates_and_collects_garbage(tmp_path: Path):
+    _make_tree(tmp_path)
+
+    result = compact_templates(tmp_path)
+
+    custom = json.loads((tmp_path / "custom.json").read_text())
+    assert custom["content_files"] == {"README.md": "README.md.jinja", "extra.txt": "custom_example/extra.txt.jinja"}
+    assert result["bytes_reclaimed"] == 2 * len("# {{ project_name }}")
+    remaining = sorted(p.relative_to(tmp_path / "content").as_posix() for p in (tmp_path / "content").rglob("*"))
+    assert remaining == ["README.md.jinja", "custom_example", "custom_example/extra.txt.jinja"]
+
+
+def test_compact_keeps_static_entries(tmp_path: Path):
+    """Static entries reference content by their "source" and keep their options when rewritten."""
+    _make_tree(tmp_path)
+    (tmp_path / "content" / "logo.png").write_bytes(b"\x89PNG")
+    (tmp_path / "content" / "custom_example" / "logo.png").write_bytes(b"\x89PNG")
+    (tmp_path / "static.json").write_text(json.dumps({"structure": {}, "content_files": {
+        "logo.png": {"source": "custom_example/logo.png", "static": True},
+        "icon.png": {"source": "logo.png", "static": True},
+    }}))
+
+    result = compact_templates(tmp_path)
+
+    static = json.loads((tmp_path / "static.json").read_text())
+    assert static["content_files"]["logo.png"] == {"source": "logo.png", "static": True}
+    assert "custom_example/logo.png" in result["removed"]
+    assert (tmp_path / "content" / "logo.png").exists()
+
+
+def test_compact_keeps_files_found_by_content_roots(tmp_path: Path):
+    """Globbed files cannot be rewritten to another path, so they are kept and become the shared copy."""
+    _make_tree(tmp_path)
+    (tmp_path / "globbed.json").write_text(json.dumps(
+        {"structure": {}, "content_roots": [{"root": "custom_example", "include": "*.jinja"}]}
+    ))
+
+    result = compact_templates(tmp_path)
+
+    assert result["removed"] == ["README.md.jinja", "custom_example/default_example/README.md.jinja"]
+    assert json.loads((tmp_path / "default.json").read_text())["content_files"] == {
+        "README.md": "custom_example/README.md.jinja"
+    }
+
+
+def test_compact_keeps_templates_loaded_by_other_templates(tmp_path: Path):
+    """Partials reached only through include, import or extends are referenced, and their paths are never rewritten."""
+    _make_tree(tmp_path)
+    content = tmp_path / "content"
+    (content / "_partial.jinja").write_text("{% import '_macros.jinja' as m %}{{ m.title() }}")
+    (content / "_macros.jinja").write_text("{% macro title() %}# {{ project_name }}{% endmacro %}")
+    (content / "custom_example" / "_partial.jinja").write_text("{% import '_macros.jinja' as m %}{{ m.title() }}")
+    (content / "custom_example" / "extra.txt.jinja").write_text("{% include 'custom_example/_partial.jinja' %}")
+
+    result = compact_templates(tmp_path)
+
+    assert "_macros.jinja" not in result["removed"]
+    assert "custom_example/_partial.jinja" not in result["removed"]
+    # Nothing references the top-level copy
+    assert "_partial.jinja" in result["removed"]
+
+
+def test_compact_refuses_templates_loading_unknown_files(tmp_path: Path):
+    _make_tree(tmp_path)
+    (tmp_path / "content" / "custom_example" / "extra.txt.jinja").write_text("{% include partial_name %}")
+
+    assert compact_templates(tmp_path) == {"removed": [], "rewritten": [], "bytes_reclaimed": 0}
+    assert (tmp_path / "content" / "custom_example" / "default_example" / "README.md.jinja").exists()
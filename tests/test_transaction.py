@@ -0,0 +1,73 @@
+# tests/test_transaction.py
+from pathlib import Path
+
+import pytest
+
+from scaffoldor.exceptions import ProjectExistsError
+from scaffoldor.scaffold import create_structure
+from scaffoldor.transaction import staged_project
+
+
+def test_failed_render_leaves_nothing_behind(tmp_project_dir: Path):
+    """A template error aborts the project without a partial directory or staging leftovers."""
+    config = {
+        "structure": {"src": []},
+        "content_files": {"README.md": "README.md.jinja", "broken.txt": "does-not-exist.jinja"},
+    }
+    with pytest.raises(SystemExit):
+        create_structure(tmp_project_dir / "broken-app", template_config=config, durable=False)
+
+    assert list(tmp_project_dir.iterdir()) == []
+
+
+def test_successful_create_has_no_staging_leftovers(tmp_project_dir: Path):
+    create_structure(tmp_project_dir / "my-app", durable=False)
+
+    assert [p.name for p in tmp_project_dir.iterdir()] == ["my-app"]
+    assert (tmp_project_dir / "my-app" / "README.md").exists()
+
+
+def test_commit_refuses_to_replace_a_concurrent_project(tmp_project_dir: Path):
+    """If another process creates the target while we stage, ours is discarded and theirs kept."""
+    project_path = tmp_project_dir / "race-app"
+    with pytest.raises(ProjectExistsError):
+        with staged_project(project_path, durable=False) as staging:
+            (staging / "ours.txt").write_text("ours")
+            project_path.mkdir()
+            (project_path / "theirs.txt").write_text("theirs")
+
+    assert [p.name for p in tmp_project_dir.iterdir()] == ["race-app"]
+    assert [p.name for p in project_path.iterdir()] == ["theirs.txt"]
+
+
+def test_commit_never_replaces_an_empty_directory(tmp_project_dir: Path):
+    """POSIX rename would silently replace an empty directory created after staging began."""
+    project_path = tmp_project_dir / "empty-race"
+    with pytest.raises(ProjectExistsError):
+        with staged_project(project_path, durable=False) as staging:
+            (staging / "ours.txt").write_text("ours")
+            project_path.mkdir()
+
+    assert [p.name for p in tmp_project_dir.iterdir()] == ["empty-race"]
+    assert list(project_path.iterdir()) == []
+
+
+def test_durable_create_flushes_only_the_project(tmp_project_dir: Path, monkeypatch):
+    import os
+
+    from scaffoldor import transaction
+
+    def refuse():
+        raise AssertionError("flushed the whole system")
+
+    monkeypatch.setattr(os, "sync", refuse, raising=False)
+    flushed = []
+    fsync = transaction._fsync
+    monkeypatch.setattr(transaction, "_fsync", lambda path: flushed.append(Path(path)) or fsync(path))
+    create_structure(tmp_project_dir / "durable-app")
+
+    assert (tmp_project_dir / "durable-app" / "README.md").exists()
+    assert tmp_project_dir in flushed
+    # Everything else was flushed while still staged
+    assert all(path == tmp_project_dir or path.name.endswith(".staging") or ".staging" in str(path) for path in flushed)
+    assert any(path.name == "README.md" for path in flushed)
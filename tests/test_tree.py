@@ -0,0 +1,59 @@
+# tests/test_tree.py
+import os
+from pathlib import Path
+
+import pytest
+
+from scaffoldor.tree import make_tree, plan_tree, structure_paths
+
+
+def test_nested_structure_is_planned_parents_first():
+    structure = {
+        "backend": {"app": {"api": ["v1", "v2"], "core": None}},
+        "frontend": ["src/components", "src/pages"],
+        "docs": [],
+    }
+
+    assert structure_paths(structure) == [
+        "backend", "backend/app", "backend/app/api", "backend/app/api/v1", "backend/app/api/v2", "backend/app/core",
+        "frontend", "frontend/src/components", "frontend/src/pages", "docs",
+    ]
+    assert plan_tree(["frontend/src/pages", "a-b", "a/b", "frontend/src/components", "a"]) == [
+        "a", "a/b", "a-b", "frontend", "frontend/src", "frontend/src/components", "frontend/src/pages",
+    ]
+    with pytest.raises(ValueError):
+        structure_paths({"backend": ["../outside"]})
+    with pytest.raises(ValueError):
+        structure_paths({"backend": "app"})
+
+
+@pytest.mark.parametrize("dir_fd", [False, True])
+def test_make_tree_issues_one_mkdir_per_directory(tmp_path: Path, monkeypatch, dir_fd: bool):
+    tree = plan_tree([f"pkg/level{i}/" + "/".join(f"d{j}" for j in range(6)) for i in range(3)])
+    calls = []
+    mkdir = os.mkdir
+    monkeypatch.setattr(os, "mkdir", lambda *args, **kwargs: calls.append(args[0]) or mkdir(*args, **kwargs))
+
+    assert make_tree(tmp_path, tree, mode=0o750, dir_fd=dir_fd) == len(tree) == 22
+    assert len(calls) == len(tree)
+    assert sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*")) == sorted(tree)
+    assert all((p.stat().st_mode & 0o777) == 0o750 for p in tmp_path.rglob("*"))
+
+    assert make_tree(tmp_path, tree + ["pkg/extra"], exist_ok=True, dir_fd=dir_fd) == 1
+    with pytest.raises(FileExistsError):
+        make_tree(tmp_path, tree, dir_fd=dir_fd)
+
+
+def test_create_structure_with_nested_structure(tmp_project_dir: Path):
+    from scaffoldor.scaffold import create_structure
+
+    config = {
+        "structure": {"services": {"api": {"handlers": [], "models": ["v1"]}}, "docs": None},
+        "content_files": {"services/api/handlers/README.md": "README.md.jinja", "infra/k8s/README.md": "README.md.jinja"},
+    }
+    create_structure(tmp_project_dir / "nested", template_config=config, durable=False)
+
+    project = tmp_project_dir / "nested"
+    assert (project / "services" / "api" / "models" / "v1").is_dir()
+    assert (project / "docs").is_dir()
+    assert (project / "infra" / "k8s" / "README.md").read_text().startswith("# nested")
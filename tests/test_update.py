@@ -0,0 +1,101 @@
+# tests/test_update.py
+import json
+from pathlib import Path
+
+import pytest
+from jinja2 import DictLoader, Environment
+
+from scaffoldor.manifest import MANIFEST_NAME
+from scaffoldor.scaffold import create_structure, get_environment
+from scaffoldor.update import update_project
+
+
+def _packaged_sources(**overrides) -> Environment:
+    """An environment serving the default template's sources, with some replaced."""
+    packaged = get_environment()
+    sources = {
+        name: packaged.loader.get_source(packaged, name)[0]
+        for name in ("README.md.jinja", ".env.example.jinja", "docker-compose.yml.jinja")
+    }
+    sources.update(overrides)
+    return Environment(loader=DictLoader(sources), trim_blocks=True, lstrip_blocks=True)
+
+
+def test_create_writes_manifest(tmp_project_dir: Path):
+    """Generated projects record their template and the hash of every file."""
+    project_path = tmp_project_dir / "manifest-app"
+    create_structure(project_path, context={"owner": "team-a"})
+
+    manifest = json.loads((project_path / MANIFEST_NAME).read_text())
+    assert manifest["template"] == "default"
+    assert manifest["variables"] == {"owner": "team-a"}
+    assert set(manifest["files"]) == {"README.md", ".env.example", "docker-compose.yml"}
+
+
+def test_update_without_changes_touches_nothing(tmp_project_dir: Path):
+    """An update against an unchanged template renders and writes nothing."""
+    project_path = tmp_project_dir / "steady-app"
+    create_structure(project_path)
+    before = {p.name: p.stat().st_mtime_ns for p in project_path.iterdir() if p.is_file()}
+
+    summary = update_project(project_path)
+
+    assert sorted(summary["unchanged"]) == [".env.example", "README.md", "docker-compose.yml"]
+    assert summary["created"] == summary["updated"] == summary["conflicts"] == []
+    assert before == {p.name: p.stat().st_mtime_ns for p in project_path.iterdir() if p.is_file()}
+
+
+def test_update_rewrites_changed_files_and_keeps_user_edits(tmp_project_dir: Path):
+    """Changed templates are re-rendered, but files edited by hand are not overwritten."""
+    project_path = tmp_project_dir / "rolling-app"
+    create_structure(project_path)
+    compose = project_path / "docker-compose.yml"
+    compose.write_text("# customised by hand\n")
+
+    env = _packaged_sources(**{
+        "README.md.jinja": "# {{ project_name }} v2\n",
+        "docker-compose.yml.jinja": "version: '3.9'\n",
+    })
+    summary = update_project(project_path, env=env)
+
+    assert summary["updated"] == ["README.md"]
+    assert summary["conflicts"] == ["docker-compose.yml"]
+    assert (project_path / "README.md").read_text() == "# rolling-app v2"
+    assert compose.read_text() == "# customised by hand\n"
+
+    # The conflict is reported again until it is resolved, and --force resolves it
+    assert update_project(project_path, env=env)["conflicts"] == ["docker-compose.yml"]
+    assert update_project(project_path, env=env, force=True)["updated"] == ["docker-compose.yml"]
+    assert compose.read_text() == "version: '3.9'"
+
+
+def test_update_requires_manifest(tmp_project_dir: Path):
+    """Directories not generated by scaffoldor are rejected."""
+    with pytest.raises(SystemExit) as excinfo:
+        update_project(tmp_project_dir)
+    assert excinfo.value.code == 1
+
+
+def test_update_follows_included_templates_and_read_variables(tmp_project_dir: Path, monkeypatch):
+    """Files are rendered again when a template they include changes, or a variable they read; the rest is skipped."""
+    project_path = tmp_project_dir / "partial-app"
+    env = _packaged_sources(**{
+        "README.md.jinja": "{% include '_header.jinja' %}\n",
+        "_header.jinja": "# {{ project_name }}",
+        "docker-compose.yml.jinja": "port: {{ port | default(80) }}\n",
+    })
+    create_structure(project_path, env=env)
+
+    env.loader.mapping["_header.jinja"] = "# {{ project_name }} (new header)"
+    rendered = []
+    get_template = env.get_template
+    monkeypatch.setattr(env, "get_template", lambda name, *args: rendered.append(name) or get_template(name, *args))
+    summary = update_project(project_path, env=env)
+    assert summary["updated"] == ["README.md"]
+    assert (project_path / "README.md").read_text() == "# partial-app (new header)"
+    assert set(rendered) == {"README.md.jinja", "_header.jinja"}
+
+    rendered.clear()
+    summary = update_project(project_path, env=env, context={"port": 8080})
+    assert summary["updated"] == ["docker-compose.yml"]
+    assert rendered == ["docker-compose.yml.jinja"]
@@ -0,0 +1,68 @@
+# tests/test_variables.py
+from pathlib import Path
+
+import pytest
+
+from scaffoldor.exceptions import TemplateConfigError, VariableError
+from scaffoldor.variables import TemplateVariables, compile_derived, parse_assignments
+
+
+DECLARATIONS = {
+    "org": {"type": "str", "default": "acme"},
+    "port": {"type": "int", "default": 8000},
+    "debug": False,
+    "org_slug": {"derived": "org | upper"},
+    "package_name": {"derived": "project_name | lower | replace('-', '_')"},
+    "db_name": {"derived": "package_name ~ '_' ~ org"},
+}
+
+
+def test_values_are_typed_and_derived_variables_computed():
+    variables = TemplateVariables(DECLARATIONS)
+    context = variables.resolve("My-App", parse_assignments(["port=9000", "debug=yes", "extra=1"]))
+
+    assert context["port"] == 9000 and context["debug"] is True
+    assert context["extra"] == "1"  # undeclared values are passed through unchanged
+    assert context["org_slug"] == "ACME"
+    assert context["db_name"] == "my_app_acme"
+
+    with pytest.raises(VariableError):
+        variables.resolve("My-App", {"port": "eighty"})
+    with pytest.raises(VariableError):
+        variables.resolve("My-App", {"db_name": "x"})
+    with pytest.raises(VariableError):
+        TemplateVariables({"token": {"type": "str"}}).resolve("My-App")
+    with pytest.raises(TemplateConfigError):
+        TemplateVariables({"port": {"type": "uint"}})
+
+
+def test_shared_layer_is_computed_once_per_batch():
+    """Derived values that only read shared inputs are evaluated once, not once per project."""
+    calls = {}
+
+    def counting_compiler(expression):
+        derived = compile_derived(expression)
+
+        def evaluate(context):
+            calls[expression] = calls.get(expression, 0) + 1
+            return derived.evaluate(context)
+
+        return derived._replace(evaluate=evaluate)
+
+    variables = TemplateVariables(DECLARATIONS, shared={"org": "initech"}, compiler=counting_compiler)
+    contexts = [variables.resolve(name) for name in ("a", "b", "c")]
+    own = variables.resolve("d", {"org": "hooli"})
+
+    assert calls["org | upper"] == 2  # once for the shared layer, once for the project overriding 'org'
+    assert calls["project_name | lower | replace('-', '_')"] == 4
+    assert [c["db_name"] for c in contexts] == ["a_initech", "b_initech", "c_initech"]
+    assert own["org_slug"] == "HOOLI" and own["db_name"] == "d_hooli"
+
+
+def test_create_uses_declared_variables(tmp_project_dir: Path):
+    from scaffoldor.scaffold import create_structure
+
+    create_structure(tmp_project_dir / "Var-App", context={"author": "Ada"}, durable=False)
+
+    assert "Ada" in (tmp_project_dir / "Var-App" / "README.md").read_text()
+    assert "POSTGRES_DB: var_app_db" in (tmp_project_dir / "Var-App" / "docker-compose.yml").read_text()